@@ -9,7 +9,21 @@ import os
 import json
 import logging
 import requests
+import contextvars
 import datetime
+import hashlib
+import itertools
+import time
+import uuid
+
+from http_session import PooledSession
+from mcp_transport import MCPTransportError, create_transport
+from llm_cache import LLMOutputCache
+from form_templates import TemplateMatcher
+from llm_pool import ChatAgentPool
+from structured_logging import LazyJSON, configure_logging, parse_sample_rates
+from metrics import observe_call, registry as metrics_registry
+from tracing import Tracer, configure_tracing, current_span
 
 # REMOVE: Import our mock CamelAI implementation
 # from camelai import create_agent
@@ -17,49 +31,238 @@ import datetime
 # Load environment variables
 # load_dotenv()
 
+# Logging: level, 'json' lines or 'text', and per-logger sampling of records below
+# WARNING, e.g. LOG_SAMPLE_RATES="agent_integration=0.1"
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()
+LOG_SAMPLE_RATES = os.getenv('LOG_SAMPLE_RATES', '')
+
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+configure_logging(
+    level=LOG_LEVEL,
+    json_format=LOG_FORMAT == 'json',
+    sample_rates=parse_sample_rates(LOG_SAMPLE_RATES)
 )
 logger = logging.getLogger("agent_integration")
 
+# Request tracing: spans of each request, its phases and the MCP server's work are
+# appended to this JSON-lines file (off when empty). The MCP server continues the
+# agent's traces through the traceparent header of every packet it receives.
+TRACE_EXPORT_PATH = os.getenv('TRACE_EXPORT_PATH', '')
+TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', 1.0))
+configure_tracing(TRACE_EXPORT_PATH, TRACE_SAMPLE_RATE)
+tracer = Tracer("form-agent")
+
 # Configuration
 MCP_SERVER_URL = os.getenv('MCP_SERVER_URL', 'http://mcp-server:5000/api/process')
 AGENT_API_KEY = os.getenv('AGENT_API_KEY', 'demo_key') # Might be used for a real LLM API key
 
-# Import Camel AI components (assuming structure)
-from camel.agents import ChatAgent
-from camel.messages import BaseMessage
-from camel.types import ModelPlatformType, ModelType, RoleType # Added RoleType
-from camel.models import ModelFactory
+# Keep-alive connection pool and timeouts for packets sent to the MCP server
+MCP_POOL_SIZE = int(os.getenv('MCP_POOL_SIZE', 10))
+MCP_CONNECT_TIMEOUT_SECONDS = float(os.getenv('MCP_CONNECT_TIMEOUT_SECONDS', 5))
+MCP_READ_TIMEOUT_SECONDS = float(os.getenv('MCP_READ_TIMEOUT_SECONDS', 30))
+
+# Question types the MCP server's add_question/add_questions tools accept
+SUPPORTED_QUESTION_TYPES = ('text', 'paragraph', 'multiple_choice', 'checkbox')
+
+# Shared by every FormAgent so packets reuse open connections to the MCP server
+mcp_session = PooledSession(
+    pool_size=MCP_POOL_SIZE,
+    connect_timeout=MCP_CONNECT_TIMEOUT_SECONDS,
+    read_timeout=MCP_READ_TIMEOUT_SECONDS
+)
+
+# Cache of parsed LLM output, keyed by normalized request text and prompt version.
+# LLM_CACHE_PATH enables a SQLite tier shared across restarts and workers.
+LLM_CACHE_SIZE = int(os.getenv('LLM_CACHE_SIZE', 256))
+LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', 86400))
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH') or None
+llm_cache = LLMOutputCache(
+    max_entries=LLM_CACHE_SIZE,
+    ttl_seconds=LLM_CACHE_TTL_SECONDS,
+    disk_path=LLM_CACHE_PATH
+)
+
+# Requests that closely match a library template (RSVP, contact form, ...) skip the LLM.
+# TEMPLATE_MATCH_THRESHOLD is the minimum similarity score (0-1); above 1 disables matching.
+TEMPLATE_MATCH_THRESHOLD = float(os.getenv('TEMPLATE_MATCH_THRESHOLD', 0.45))
+template_matcher = TemplateMatcher(threshold=TEMPLATE_MATCH_THRESHOLD)
+
+# Gemini model behind every ChatAgent; part of the LLM cache's prompt fingerprint
+LLM_MODEL_NAME = "gemini-1.5-flash"
+
+# ChatAgents (and their model clients) are built once, warmed at startup and reused
+LLM_POOL_SIZE = int(os.getenv('LLM_POOL_SIZE', 4))
+LLM_POOL_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv('LLM_POOL_ACQUIRE_TIMEOUT_SECONDS', 60))
+
+# Per-phase metrics served on the agent's /metrics: the whole request, template
+# matching, the LLM cache, the LLM call and MCP hops
+PHASE_DURATION = metrics_registry.histogram("agent_phase_duration_seconds", "Duration of agent request phases", ["phase"])
+PHASES_IN_FLIGHT = metrics_registry.gauge("agent_phases_in_flight", "Agent request phases in progress", ["phase"])
+PHASE_ERRORS = metrics_registry.counter(
+    "agent_errors_total", "Failed agent phases by exception class or outcome", ["phase", "error"]
+)
+
+
+class _observe_phase:
+    """Record a phase's duration, in-flight count and exceptions, and trace it as a span."""
+
+    __slots__ = ("metrics", "span")
+
+    def __init__(self, phase):
+        self.metrics = observe_call(PHASE_DURATION, PHASES_IN_FLIGHT, PHASE_ERRORS, phase)
+        self.span = tracer.start_span(f"agent.{phase}")
+
+    def __enter__(self):
+        self.metrics.__enter__()
+        return self.span.__enter__()
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.span.__exit__(exc_type, exc, traceback)
+        return self.metrics.__exit__(exc_type, exc, traceback)
+
+
+def _create_chat_agent():
+    """
+    Build one ChatAgent with its own Gemini model client.
+    
+    Camel AI is imported here rather than at module import, so importing this
+    module stays cheap and the import cost is paid during pool warm-up.
+    """
+    # Check for the API key first (using the name Camel AI expects)
+    if not os.getenv('GOOGLE_API_KEY'):
+        raise RuntimeError("GOOGLE_API_KEY is not set in the environment.")
+    
+    from camel.agents import ChatAgent
+    from camel.messages import BaseMessage
+    from camel.types import ModelPlatformType, ModelType, RoleType
+    from camel.models import ModelFactory
+    
+    # Create the required config dict - make it empty and rely on env var GOOGLE_API_KEY
+    llm_model = ModelFactory.create(
+        model_platform=ModelPlatformType.GEMINI,
+        model_type=ModelType.GEMINI_1_5_FLASH,
+        model_config_dict={}
+    )
+    logger.info("Camel AI Model configured using: %s", ModelType.GEMINI_1_5_FLASH)
+    
+    # The system message holds only the request-independent instructions, so
+    # reset() between requests returns the agent to a clean, reusable state
+    system_message = BaseMessage(
+        role_name="System",
+        role_type=RoleType.ASSISTANT,
+        meta_dict=None,
+        content=FormAgent._build_system_prompt()
+    )
+    return ChatAgent(system_message=system_message, model=llm_model)
+
+
+llm_pool = ChatAgentPool(
+    _create_chat_agent,
+    size=LLM_POOL_SIZE,
+    acquire_timeout=LLM_POOL_ACQUIRE_TIMEOUT_SECONDS
+)
+
+class RequestContext:
+    """
+    State of one request handled by FormAgent.
+    
+    FormAgent itself only holds resources shared by all requests (transport,
+    LLM pool and cache); everything specific to a request lives here, so
+    concurrent requests never see each other's logs or IDs.
+    """
+    
+    def __init__(self, on_step=None):
+        """
+        Initialize the context.
+        
+        Args:
+            on_step: Optional callback called with each log entry as it is recorded
+        """
+        self.request_id = uuid.uuid4().hex[:12]
+        self.log_entries = []
+        self.on_step = on_step
+        self.started = time.perf_counter()
+        self._packet_counter = itertools.count(1)
+    
+    def add_step(self, step_type, data):
+        """Record a log entry and pass it to the step listener."""
+        entry = {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "elapsed_ms": self.elapsed_ms(),
+            "step_type": step_type,
+            "data": data
+        }
+        self.log_entries.append(entry)
+        if self.on_step is not None:
+            try:
+                self.on_step(entry)
+            except Exception as e:
+                logger.warning("Step listener failed: %s", e)
+        return entry
+    
+    def next_transaction_id(self):
+        """Transaction ID for the next MCP packet of this request."""
+        return f"{self.request_id}-{next(self._packet_counter)}"
+    
+    def elapsed_ms(self):
+        """Milliseconds since the request started."""
+        return round((time.perf_counter() - self.started) * 1000, 2)
+
+
+# Context of the request being processed on the current thread
+_current_context = contextvars.ContextVar('form_agent_request', default=None)
+
 
 class FormAgent:
     """
     Agent for handling natural language form creation requests.
     Uses NLP (simulated via _call_llm_agent) to process natural language
     and convert it to MCP tool calls.
+    
+    One instance can serve concurrent requests: per-request state lives in
+    a RequestContext bound to the calling thread by process_request.
     """
     
-    def __init__(self):
-        """Initialize the agent."""
+    # Set by the first _prompt_version call
+    _cached_prompt_version = None
+    
+    def __init__(self, transport=None):
+        """
+        Initialize the agent.
+        
+        Args:
+            transport: How MCP packets reach the server; defaults to the
+                transport selected by MCP_TRANSPORT (HTTP unless configured)
+        """
         self.logger = logger
-        self.log_entries = [] # Initialize log storage
+        self.transport = transport or create_transport(url=MCP_SERVER_URL, session=mcp_session)
         # REMOVE: self.camel_agent = create_agent("FormAgent", ...)
-        self.logger.info("FormAgent initialized (using simulated LLM)")
+        self.logger.info("FormAgent initialized (using simulated LLM, %s MCP transport)", self.transport.name)
+
+    @property
+    def log_entries(self):
+        """Log entries of the request being processed on the calling thread."""
+        context = _current_context.get()
+        return context.log_entries if context is not None else []
 
     def _log_step(self, step_type, data):
-        """Adds a structured log entry for the frontend."""
-        entry = {
-            "timestamp": datetime.datetime.now().isoformat(),
-            "step_type": step_type, 
-            "data": data
-        }
-        self.log_entries.append(entry)
+        """Adds a structured log entry for the frontend to the current request's log."""
+        context = _current_context.get()
+        if context is None:
+            self.logger.info("AGENT LOG STEP (no request): %s", step_type)
+            self.logger.debug("AGENT LOG STEP data: %s", LazyJSON(data))
+            return
+        context.add_step(step_type, data)
+        fields = {"request_id": context.request_id, "step": step_type}
+        span = current_span()
+        if span is not None:
+            fields["trace_id"] = span.trace_id
         # Also log to server console for debugging
-        self.logger.info(f"AGENT LOG STEP: {step_type} - {data}") 
+        self.logger.info("AGENT LOG STEP [%s]: %s", context.request_id, step_type, extra={"fields": fields})
+        self.logger.debug("AGENT LOG STEP [%s] data: %s", context.request_id, LazyJSON(data))
     
-    def process_request(self, request_text):
+    def process_request(self, request_text, on_step=None):
         """
         Processes a natural language request using a simulated LLM call.
         1. Calls a simulated LLM to parse the request into structured JSON.
@@ -67,15 +270,37 @@ class FormAgent:
         3. Executes the tool calls by sending requests to the MCP server.
         4. Orchestrates multi-step processes.
         5. Returns the final result or error.
+        
+        Args:
+            request_text: The natural language request
+            on_step: Optional callback called with each log entry the moment
+                it is recorded, used to stream progress
         """
-        self.log_entries = [] # Clear log for new request
+        context = RequestContext(on_step=on_step)
+        token = _current_context.set(context)
+        try:
+            with _observe_phase("request") as span:
+                span.set_attribute("request_id", context.request_id)
+                response = self._process_request(request_text)
+        finally:
+            _current_context.reset(token)
+        if response.get("status") != "success":
+            PHASE_ERRORS.inc("request", "ErrorResponse")
+        response.setdefault("request_id", context.request_id)
+        if span.sampled:
+            response.setdefault("trace_id", span.trace_id)
+        response.setdefault("duration_ms", context.elapsed_ms())
+        return response
+
+    def _process_request(self, request_text):
+        """Runs process_request inside the request's context."""
         self._log_step("Request Received", {"text": request_text})
         
         try:
             # 1. Analyze request using simulated LLM call
             self._log_step("NLP Analysis Start", {})
             structured_form_data = self._call_llm_agent(request_text)
-            self.logger.info(f"Simulated LLM Structured Output: {json.dumps(structured_form_data, indent=2)}")
+            self.logger.debug("Simulated LLM Structured Output: %s", LazyJSON(structured_form_data, indent=2))
             self._log_step("NLP Analysis Complete", {"structured_data": structured_form_data})
             
             # Basic validation of LLM output
@@ -104,7 +329,7 @@ class FormAgent:
             
             # Pass the extracted questions to the creation flow
             form_params['questions'] = all_questions
-            # Execute the flow, which will populate self.log_entries further
+            # Execute the flow, which will populate the request's log entries further
             final_response = self._execute_create_form_flow(form_params)
 
             # Add the collected logs to the final response if successful
@@ -114,7 +339,7 @@ class FormAgent:
             return final_response
         
         except Exception as e:
-            self.logger.error(f"Error in FormAgent process_request: {str(e)}", exc_info=True)
+            self.logger.error("Error in FormAgent process_request: %s", e, exc_info=True)
             self._log_step("Agent Error", {"error": str(e)})
             # Include logs gathered so far in the error response too
             return {
@@ -124,67 +349,88 @@ class FormAgent:
             }
 
     def _call_llm_agent(self, request_text):
+        """
+        Returns structured form data for a request, from a template or the cache when possible.
+        
+        A close match in the template library is used as is. Otherwise, on a
+        cache miss the LLM is queried and a successful parse is cached under
+        the normalized request text and prompt version. Falls back to a basic
+        structure (never cached) if the LLM call fails.
+        """
+        with _observe_phase("template_match"):
+            template_id, structured_data, score = template_matcher.match(request_text)
+        if structured_data is not None:
+            self._log_step("Template Match", {"template": template_id, "score": score, "stats": template_matcher.stats()})
+            return structured_data
+        self._log_step("Template Miss", {"closest_template": template_id, "score": score})
+        
+        cache_key = LLMOutputCache.make_key(request_text, self._prompt_version())
+        with _observe_phase("llm_cache"):
+            structured_data = llm_cache.get(cache_key)
+        if structured_data is not None:
+            self._log_step("LLM Cache Hit", llm_cache.stats())
+            return structured_data
+        self._log_step("LLM Cache Miss", llm_cache.stats())
+        
+        with _observe_phase("llm"):
+            structured_data = self._query_llm(request_text)
+        if structured_data is None:
+            PHASE_ERRORS.inc("llm", "Fallback")
+            return self._get_fallback_structure(request_text)
+        try:
+            llm_cache.put(cache_key, structured_data)
+        except Exception as e:
+            # The parse is good; a cache write (e.g. a locked SQLite file) must not fail the request
+            PHASE_ERRORS.inc("llm_cache", type(e).__name__)
+            self.logger.warning("Could not cache LLM output: %s", e)
+        return structured_data
+
+    def _prompt_version(self):
+        """Fingerprint of the prompt template and model, so prompt changes invalidate the cache."""
+        # The template does not change while the process runs, so it is hashed once
+        if FormAgent._cached_prompt_version is None:
+            template = self._build_llm_prompt("")
+            FormAgent._cached_prompt_version = hashlib.sha256(f"{LLM_MODEL_NAME}\n{template}".encode()).hexdigest()[:16]
+        return FormAgent._cached_prompt_version
+
+    def _query_llm(self, request_text):
         """
         Uses Camel AI's ChatAgent to process the request and extract structured data.
-        Falls back to a basic structure if the LLM call fails.
+        Returns None if the LLM call or parsing fails.
         """
         # Check for the API key first (using the name Camel AI expects)
         api_key = os.getenv('GOOGLE_API_KEY') 
         if not api_key:
             self.logger.error("GOOGLE_API_KEY is not set in the environment.") # Updated log message
-            return self._get_fallback_structure(request_text)
+            return None
 
         try:
-            # 1. Setup Model
-            # Assuming ModelFactory can find the key from env or we pass it
-            # Adjust ModelType enum based on actual Camel AI definition if needed
-            # Using a placeholder like ModelType.GEMINI_1_5_FLASH - this will likely need correction
-            model_name_str = "gemini-1.5-flash-latest" # Keep the string name
-            # Attempt to create model instance via factory
-            # Create the required config dict - make it empty and rely on env var GOOGLE_API_KEY
-            model_config_dict = { 
-                 # No API key here - expecting library to read GOOGLE_API_KEY from env
-            }
-            # REVERT: Go back to GEMINI platform type
-            llm_model = ModelFactory.create(
-                model_platform=ModelPlatformType.GEMINI, 
-                model_type=ModelType.GEMINI_1_5_FLASH, 
-                model_config_dict=model_config_dict 
-            )
-            self.logger.info(f"Camel AI Model configured using: {ModelType.GEMINI_1_5_FLASH}")
-
-            # 2. Prepare messages for the ChatAgent
-            system_prompt = self._build_llm_prompt(request_text)
-            system_message = BaseMessage(
-                role_name="System", 
-                role_type=RoleType.ASSISTANT,
-                meta_dict=None, 
-                content=system_prompt
-            )
+            from camel.messages import BaseMessage
+            from camel.types import RoleType
+
+            # 1. Prepare the request message; the instructions are the pooled agent's system message
             user_message = BaseMessage(
                 role_name="User",
                 role_type=RoleType.USER,
                 meta_dict=None,
-                content=request_text # Or maybe just a trigger like "Process the request"? Let's try request_text
+                content=self._build_user_prompt(request_text)
             )
 
-            # 3. Initialize and run the ChatAgent
-            agent = ChatAgent(system_message=system_message, model=llm_model)
-            agent.reset() # Ensure clean state
-
-            self.logger.info("Calling Camel AI ChatAgent...")
-            response = agent.step(user_message)
+            # 2. Run a prebuilt ChatAgent from the pool; it is reset when returned
+            with llm_pool.checkout() as agent:
+                self.logger.info("Calling Camel AI ChatAgent...")
+                response = agent.step(user_message)
             
             if not response or not response.msgs:
                 self.logger.error("Camel AI agent did not return a valid response.")
-                return self._get_fallback_structure(request_text)
+                return None
 
-            # 4. Extract JSON content from the last message
+            # 3. Extract JSON content from the last message
             # Assuming the response structure contains a list of messages `msgs`
             # and the agent's reply is the last one.
             agent_reply_message = response.msgs[-1]
             content = agent_reply_message.content
-            self.logger.debug(f"Raw Camel AI agent response content: {content}") 
+            self.logger.debug("Raw Camel AI agent response content: %s", content)
 
             # --- Robust JSON Extraction --- 
             try:
@@ -199,24 +445,32 @@ class FormAgent:
                     return structured_data
                 else:
                     # Fallback if JSON bounds couldn't be found
-                    self.logger.error(f"Could not find valid JSON object boundaries in response. Content: {content}")
-                    return self._get_fallback_structure(request_text)
+                    self.logger.error("Could not find valid JSON object boundaries in response. Content: %s", content)
+                    return None
 
             except json.JSONDecodeError as e:
-                 self.logger.error(f"Failed to parse JSON content from Camel AI agent: {e}. Extracted content attempt: {json_string if 'json_string' in locals() else 'N/A'}")
-                 return self._get_fallback_structure(request_text)
+                 self.logger.error("Failed to parse JSON content from Camel AI agent: %s. Extracted content attempt: %s", e, json_string if 'json_string' in locals() else 'N/A')
+                 return None
 
         except ImportError as e:
-             self.logger.error(f"Failed to import Camel AI components. Is 'camel-ai' installed correctly? Error: {e}")
-             return self._get_fallback_structure(request_text)
+             self.logger.error("Failed to import Camel AI components. Is 'camel-ai' installed correctly? Error: %s", e)
+             return None
         except Exception as e:
             # Catch potential errors during Camel AI model init or agent step
-            self.logger.error(f"Error during Camel AI processing: {str(e)}", exc_info=True)
-            return self._get_fallback_structure(request_text)
+            self.logger.error("Error during Camel AI processing: %s", e, exc_info=True)
+            return None
 
     def _build_llm_prompt(self, request_text):
         """
-        Constructs the detailed prompt for the LLM.
+        Constructs the detailed prompt for the LLM: the system instructions
+        followed by the user request.
+        """
+        return self._build_system_prompt() + self._build_user_prompt(request_text)
+
+    @staticmethod
+    def _build_system_prompt():
+        """
+        Constructs the request-independent instructions for the LLM.
         
         Crucial for getting reliable JSON output.
         Needs careful tuning based on the LLM used.
@@ -273,7 +527,12 @@ RULES:
 - Pay close attention to required fields in the schema description.
 - If the request seems too simple or doesn't clearly describe a form, create a basic form structure with a title based on the request and a few generic questions (like Name, Email, Comments).
 
-USER REQUEST:
+"""
+        return prompt
+
+    def _build_user_prompt(self, request_text):
+        """Constructs the user message carrying the request for the LLM."""
+        prompt = f"""USER REQUEST:
 ```
 {request_text}
 ```
@@ -284,7 +543,7 @@ JSON OUTPUT:
 
     def _get_fallback_structure(self, request_text):
          """Returns a basic structure if LLM call fails or parsing fails."""
-         self.logger.warning(f"Gemini call/parsing failed. Falling back to basic structure for: {request_text}")
+         self.logger.warning("Gemini call/parsing failed. Falling back to basic structure for: %s", request_text)
          return {
              "formTitle": self._generate_title(request_text), 
              "formDescription": request_text,
@@ -304,18 +563,50 @@ JSON OUTPUT:
         """
         Handles the complete flow for creating a form and adding its questions.
         """
-        self.logger.info(f"Executing create form flow with params: {params}")
+        self.logger.debug("Executing create form flow with params: %s", params)
         
         # Extract potential questions from NLP parameters
         questions_to_add = params.pop('questions', []) # Remove questions from main params
         
-        # A. Create the form first
-        self._log_step("Create Form Start", {"params": params})
-        create_form_response = self._handle_create_form(params)
+        # A. Validate the questions identified by NLP before anything is sent
+        batch = []
+        for question_index, question_data in enumerate(questions_to_add):
+            question_params = {
+                "question_type": question_data.get('type'),
+                "title": question_data.get('title'),
+                "options": question_data.get('options', []),
+                "required": question_data.get('required', False)
+            }
+            
+            # Validate basic question params before sending
+            if not question_params['question_type'] or not question_params['title']:
+                self.logger.warning("Skipping invalid question data: %s", question_data)
+                continue
+            
+            # The server validates the whole batch at once, so drop types it cannot build
+            if question_params['question_type'] not in SUPPORTED_QUESTION_TYPES:
+                self.logger.warning("Question '%s' skipped: Type '%s' likely not supported by backend API yet.", question_params['title'], question_params['question_type'])
+                self._log_step("Add Question Skipped", {"question_index": question_index, "params": question_params})
+                continue
+            
+            if question_params['question_type'] in ('multiple_choice', 'checkbox') and (
+                    not isinstance(question_params['options'], list) or not question_params['options']):
+                self.logger.warning("Skipping question with missing or malformed options: %s", question_data)
+                continue
+            
+            batch.append(question_params)
+        
+        # B. Create the form and add its questions in a single round trip
+        self._log_step("Create Form Start", {"params": params, "question_count": len(batch)})
+        if batch:
+            create_form_response, add_q_response = self._handle_create_form_with_questions(params, batch)
+        else:
+            self.logger.info("No questions identified by NLP to add to the form")
+            create_form_response, add_q_response = self._handle_create_form(params), None
         self._log_step("Create Form End", {"response": create_form_response})
         
         if create_form_response.get("status") != "success":
-            self.logger.error(f"Form creation failed: {create_form_response.get('message')}")
+            self.logger.error("Form creation failed: %s", create_form_response.get('message') or create_form_response.get('error'))
             return create_form_response # Return the error from create_form
             
         # Get the form_id from the successful response
@@ -326,48 +617,16 @@ JSON OUTPUT:
             self.logger.error("Form creation succeeded but no form_id returned.")
             return { "status": "error", "message": "Form created, but form_id missing in response." }
             
-        self.logger.info(f"Form created successfully: {form_id}")
+        self.logger.info("Form created successfully: %s", form_id)
         
-        # B. Add questions if any were identified by NLP
-        question_results = []
-        if questions_to_add:
-            self._log_step("Add Questions Start", {"count": len(questions_to_add)})
-            self.logger.info(f"Adding {len(questions_to_add)} questions to form {form_id}")
-            for question_data in questions_to_add:
-                question_params = {
-                    "form_id": form_id,
-                    # Ensure structure matches _handle_add_question needs
-                    "type": question_data.get('type'), 
-                    "title": question_data.get('title'),
-                    "options": question_data.get('options', []), 
-                    "required": question_data.get('required', False)
-                }
-                
-                # Validate basic question params before sending
-                if not question_params['type'] or not question_params['title']:
-                     self.logger.warning(f"Skipping invalid question data: {question_data}")
-                     continue
-                     
-                self._log_step("Add Question Start", {"question_index": questions_to_add.index(question_data), "params": question_params})
-                add_q_response = self._handle_add_question(question_params)
-                self._log_step("Add Question End", {"question_index": questions_to_add.index(question_data), "response": add_q_response})
-                question_results.append(add_q_response)
-                
-                # Log if the question type wasn't supported by the backend
-                if add_q_response.get("status") == "error" and "Invalid question_type" in add_q_response.get("message", ""):
-                     self.logger.warning(f"Question '{question_params['title']}' failed: Type '{question_params['type']}' likely not supported by backend API yet.")
-                elif add_q_response.get("status") != "success":
-                    self.logger.error(f"Failed to add question '{question_params['title']}': {add_q_response.get('message')}")
-                
-                # Optional: Check if question adding failed and decide whether to stop
-                if add_q_response.get("status") != "success":
-                    self.logger.error(f"Failed to add question '{question_params['title']}': {add_q_response.get('message')}")
-                    # Decide: continue adding others, or return error immediately?
-                    # For now, let's continue but log the error.
-            self._log_step("Add Questions End", {})
+        if add_q_response is not None:
+            question_error = add_q_response.get('result', {}).get('question_error')
+            if add_q_response.get("status") != "success" or question_error:
+                self.logger.error("Failed to add questions to form %s: %s", form_id, question_error or add_q_response.get('message') or add_q_response.get('error'))
+                self._log_step("Add Questions Failed", {"form_id": form_id, "error": question_error})
+            self._log_step("Add Questions End", {"count": len(batch)})
         else:
-             self.logger.info(f"No questions identified by NLP to add to form {form_id}")
-             self._log_step("Add Questions Skipped", {})
+            self._log_step("Add Questions Skipped", {})
 
         # 5. Return the final result (details of the created form)
         # We can optionally include the results of adding questions if needed
@@ -401,7 +660,7 @@ JSON OUTPUT:
         Returns:
             dict: Result of the form creation
         """
-        self.logger.info(f"Creating form with params: {params}")
+        self.logger.info("Creating form '%s'", params.get("title"))
         
         # Prepare MCP packet
         mcp_packet = {
@@ -419,36 +678,38 @@ JSON OUTPUT:
         self._log_step("MCP Response (create_form)", response)
         return response
     
-    def _handle_add_question(self, params):
+    def _handle_create_form_with_questions(self, params, questions):
         """
-        Handle adding a question to a form by sending MCP packet.
+        Create a form with its questions in one MCP request.
+        
+        The server copies a form it has already built with the same title
+        pattern and questions when it can, so repeated shapes cost the same
+        few upstream calls however many questions they have.
         
         Args:
-            params: Parameters for question addition
+            params: Parameters for form creation
+            questions: Validated add_questions entries
             
         Returns:
-            dict: Result of the question addition
+            tuple: (create_form response, add_questions response); a single
+                create_form_with_questions response covers both
         """
-        self.logger.info(f"Adding question with params: {params}")
+        self.logger.info("Creating form '%s' with %s questions", params.get("title"), len(questions))
         
-        # Prepare MCP packet
         mcp_packet = {
-            "tool_name": "add_question",
+            "tool_name": "create_form_with_questions",
             "parameters": {
-                "form_id": params.get("form_id"),
-                "question_type": params.get("type", "text"),
-                "title": params.get("title", "Question"),
-                "options": params.get("options", []),
-                "required": params.get("required", False)
+                "title": params.get("title", "Form from NL Request"),
+                "description": params.get("description", ""),
+                "questions": questions
             }
         }
         
-        # Log *before* sending
-        self._log_step("MCP Request (add_question)", mcp_packet)
+        self._log_step("MCP Request (create_form_with_questions)", mcp_packet)
         response = self._send_to_mcp_server(mcp_packet)
-        # Log *after* receiving
-        self._log_step("MCP Response (add_question)", response)
-        return response
+        self._log_step("MCP Response (create_form_with_questions)", response)
+        
+        return response, response
     
     def _handle_get_responses(self, params):
         """
@@ -460,7 +721,7 @@ JSON OUTPUT:
         Returns:
             dict: Form responses
         """
-        self.logger.info(f"Getting responses with params: {params}")
+        self.logger.info("Getting responses for form %s", params.get("form_id"))
         
         # Prepare MCP packet
         mcp_packet = {
@@ -479,36 +740,39 @@ JSON OUTPUT:
     
     def _send_to_mcp_server(self, mcp_packet):
         """
-        Sends an MCP packet to the MCP server URL.
+        Sends an MCP packet, or a batch of packets, through the agent's MCP transport.
         
         Args:
-            mcp_packet: The MCP packet (dict) to send.
+            mcp_packet: The MCP packet (dict) or list of packets to send.
             
         Returns:
-            dict: The response JSON from the MCP server.
+            dict: The response JSON from the MCP server (a list for a batch).
         """
-        self.logger.info(f"Sending MCP packet: {json.dumps(mcp_packet)}")
+        packets = mcp_packet if isinstance(mcp_packet, list) else [mcp_packet]
+        context = _current_context.get()
+        if context is not None:
+            # Tag packets with the request they belong to, for tracing across logs
+            for packet in packets:
+                packet.setdefault("transaction_id", context.next_transaction_id())
+        self.logger.info("Sending MCP packet to %s transport", self.transport.name)
+        self.logger.debug("MCP packet: %s", LazyJSON(mcp_packet))
         
         try:
-            response = requests.post(
-                MCP_SERVER_URL,
-                json=mcp_packet,
-                headers={'Content-Type': 'application/json'},
-                timeout=30  # Add a timeout (e.g., 30 seconds)
-            )
-            
-            # Raise an exception for bad status codes (4xx or 5xx)
-            response.raise_for_status()
-            
-            response_data = response.json()
-            self.logger.info(f"Received MCP response: {json.dumps(response_data)}")
+            # Raises for bad status codes (4xx or 5xx) or a rejected in-process request
+            with _observe_phase("mcp") as span:
+                span.set_attribute("transaction_ids", [packet.get("transaction_id") for packet in packets])
+                response_data = self.transport.send(mcp_packet)
+            for packet_response in (response_data if isinstance(response_data, list) else [response_data]):
+                if isinstance(packet_response, dict) and packet_response.get("status") == "error":
+                    PHASE_ERRORS.inc("mcp", "ErrorResponse")
+            self.logger.debug("Received MCP response: %s", LazyJSON(response_data))
             return response_data
             
         except requests.exceptions.Timeout:
-            self.logger.error(f"Timeout sending MCP packet to {MCP_SERVER_URL}")
+            self.logger.error("Timeout sending MCP packet to %s", MCP_SERVER_URL)
             return {"status": "error", "message": "MCP server request timed out"}
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"Error sending MCP packet to {MCP_SERVER_URL}: {str(e)}")
+            self.logger.error("Error sending MCP packet to %s: %s", MCP_SERVER_URL, e)
             # Try to get error details from response body if possible
             error_detail = str(e)
             try:
@@ -516,11 +780,14 @@ JSON OUTPUT:
             except Exception:
                 pass # Ignore errors parsing the error response itself
             return {"status": "error", "message": f"MCP server communication error: {error_detail}"}
+        except MCPTransportError as e:
+            self.logger.error("MCP server rejected packet in process: %s", e)
+            return {"status": "error", "message": f"MCP server communication error: {str(e)}"}
         except json.JSONDecodeError as e:
-             self.logger.error(f"Error decoding MCP response JSON: {str(e)}")
+             self.logger.error("Error decoding MCP response JSON: %s", e)
              return {"status": "error", "message": "Invalid JSON response from MCP server"}
         except Exception as e:
-            self.logger.error(f"Unexpected error in _send_to_mcp_server: {str(e)}", exc_info=True)
+            self.logger.error("Unexpected error in _send_to_mcp_server: %s", e, exc_info=True)
             return {"status": "error", "message": f"Unexpected agent error sending MCP packet: {str(e)}"}
 
 
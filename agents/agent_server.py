@@ -5,41 +5,79 @@ This module provides a Flask-based REST API that accepts natural language reques
 processes them through the FormAgent, and returns the results.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import json
+import math
 import os
 import logging
+import queue
+import threading
 
-from agent_integration import FormAgent
+from agent_integration import FormAgent, llm_pool, template_matcher
+from job_queue import JobQueue, QueueFull
+from metrics import CONTENT_TYPE, registry as metrics_registry
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured by agent_integration (queued JSON lines, see LOG_* settings)
 logger = logging.getLogger("agent_server")
 
 # Create Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Initialize form agent
+# Initialize form agent and start building the LLM agents in the background.
+# The agent is shared by all request threads; per-request state is kept apart.
 form_agent = FormAgent()
+llm_pool.warm()
 
 # Configuration
 PORT = int(os.getenv('PORT', 5001))
 DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+# Seconds between SSE keep-alive comments while the agent is busy
+STREAM_KEEPALIVE_SECONDS = float(os.getenv('STREAM_KEEPALIVE_SECONDS', 15))
+# Job API: worker threads, queue capacity, how long results are kept and the longest long-poll
+AGENT_JOB_WORKERS = int(os.getenv('AGENT_JOB_WORKERS', 4))
+AGENT_JOB_QUEUE_SIZE = int(os.getenv('AGENT_JOB_QUEUE_SIZE', 32))
+AGENT_JOB_RESULT_TTL_SECONDS = int(os.getenv('AGENT_JOB_RESULT_TTL_SECONDS', 600))
+AGENT_JOB_MAX_WAIT_SECONDS = float(os.getenv('AGENT_JOB_MAX_WAIT_SECONDS', 30))
+
+# Background workers for the job API
+job_queue = JobQueue(
+    lambda request_text, on_step: form_agent.process_request(request_text, on_step=on_step),
+    workers=AGENT_JOB_WORKERS,
+    max_queued=AGENT_JOB_QUEUE_SIZE,
+    result_ttl=AGENT_JOB_RESULT_TTL_SECONDS
+)
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint."""
+    """Liveness endpoint: the server is up, whether or not the LLM agents are warm."""
     return jsonify({
         "status": "ok",
         "service": "CamelAIOrg Agent Server",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "ready": llm_pool.ready(),
+        "llm_pool": llm_pool.stats(),
+        "jobs": job_queue.stats(),
+        "templates": template_matcher.stats(),
+        "mcp_transport": form_agent.transport.name,
+        "mcp_http": form_agent.transport.stats()
     })
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics: agent phase latencies, errors and in-flight phases."""
+    return Response(metrics_registry.render(), content_type=CONTENT_TYPE)
+
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness endpoint: 503 until the LLM agent pool has been warmed."""
+    ready = llm_pool.ready()
+    return jsonify({
+        "status": "ready" if ready else "warming",
+        "llm_pool": llm_pool.stats()
+    }), 200 if ready else 503
+
 @app.route('/process', methods=['POST'])
 def process_request():
     """
@@ -78,7 +116,7 @@ def process_request():
             }), 400
         
         request_text = data['request_text']
-        logger.info(f"Agent server received request: {request_text}")
+        logger.info("Agent server received request: %s", request_text)
         
         # Process the request through the FormAgent
         # The FormAgent's process_request method will handle NLP,
@@ -89,12 +127,146 @@ def process_request():
         return jsonify(result)
     
     except Exception as e:
-        logger.error(f"Error processing agent request: {str(e)}", exc_info=True)
+        logger.error("Error processing agent request: %s", e, exc_info=True)
         return jsonify({
             "status": "error",
             "message": f"Internal Agent Server Error: {str(e)}"
         }), 500
 
+@app.route('/process/stream', methods=['POST'])
+def process_request_stream():
+    """
+    Process a natural language request, streaming progress as Server-Sent Events.
+    
+    Takes the same body as /process. Each agent log step is sent as a 'step'
+    event the moment it is recorded, and the final /process response body is
+    sent as a 'result' event before the stream closes. Comment lines are sent
+    while the agent is busy to keep proxies from timing out.
+    """
+    if not request.is_json:
+        return jsonify({
+            "status": "error",
+            "message": "Request must be JSON"
+        }), 400
+    
+    data = request.get_json()
+    if 'request_text' not in data:
+        return jsonify({
+            "status": "error",
+            "message": "Missing required parameter 'request_text'"
+        }), 400
+    
+    request_text = data['request_text']
+    logger.info("Agent server received streaming request: %s", request_text)
+    events = queue.Queue()
+    
+    def run_agent():
+        try:
+            result = form_agent.process_request(request_text, on_step=lambda entry: events.put(("step", entry)))
+        except Exception as e:
+            logger.error("Error processing agent request: %s", e, exc_info=True)
+            result = {
+                "status": "error",
+                "message": f"Internal Agent Server Error: {str(e)}"
+            }
+        events.put(("result", result))
+    
+    threading.Thread(target=run_agent, name="agent-stream", daemon=True).start()
+    
+    def generate():
+        while True:
+            try:
+                event, payload = events.get(timeout=STREAM_KEEPALIVE_SECONDS)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+            if event == "result":
+                return
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue a natural language request and return at once with a job ID.
+    
+    Takes the same body as /process. Responds 202 with the job and its status
+    URL, or 503 with a Retry-After header when the queue is full.
+    """
+    if not request.is_json:
+        return jsonify({
+            "status": "error",
+            "message": "Request must be JSON"
+        }), 400
+    
+    data = request.get_json()
+    if 'request_text' not in data:
+        return jsonify({
+            "status": "error",
+            "message": "Missing required parameter 'request_text'"
+        }), 400
+    
+    try:
+        job = job_queue.submit(data['request_text'])
+    except QueueFull as e:
+        logger.warning("Rejecting agent job: %s", e)
+        response = jsonify({
+            "status": "error",
+            "message": "Agent is at capacity, retry later",
+            "retry_after": e.retry_after
+        })
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 503
+    
+    logger.info("Queued agent job %s: %s", job["job_id"], data["request_text"])
+    status_url = f"/jobs/{job['job_id']}"
+    response = jsonify({
+        "status": "accepted",
+        "job": job,
+        "status_url": status_url
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Return a job's state, log entries so far and, once completed, its result.
+    
+    Query parameters:
+        wait: Seconds to long-poll for completion (capped by AGENT_JOB_MAX_WAIT_SECONDS)
+        since: Log entries already seen; with wait, also return as soon as a new one arrives
+    """
+    try:
+        wait = float(request.args.get('wait', 0))
+        since = request.args.get('since')
+        since = int(since) if since is not None else None
+        if not math.isfinite(wait) or wait < 0 or (since is not None and since < 0):
+            raise ValueError
+    except ValueError:
+        return jsonify({
+            "status": "error",
+            "message": "Parameters 'wait' and 'since' must be non-negative numbers"
+        }), 400
+    wait = min(wait, AGENT_JOB_MAX_WAIT_SECONDS)
+    
+    job = job_queue.get(job_id, wait=wait, since_step=since)
+    if job is None:
+        return jsonify({
+            "status": "error",
+            "message": f"Unknown or expired job '{job_id}'"
+        }), 404
+    
+    return jsonify({
+        "status": "success",
+        "job": job
+    })
+
 @app.route('/schema', methods=['GET'])
 def get_schema():
     """Return the agent capabilities schema."""
@@ -129,7 +301,8 @@ def get_schema():
 
 # Run the Flask app
 if __name__ == '__main__':
-    logger.info(f"Starting CamelAIOrg Agent Server on port {PORT}")
-    logger.info(f"Debug mode: {DEBUG}")
+    logger.info("Starting CamelAIOrg Agent Server on port %s", PORT)
+    logger.info("Debug mode: %s", DEBUG)
     
-    app.run(host='0.0.0.0', port=PORT, debug=DEBUG) 
\ No newline at end of file
+    # FormAgent is safe to share, so serve requests concurrently
+    app.run(host='0.0.0.0', port=PORT, debug=DEBUG, threaded=True) 
\ No newline at end of file
@@ -0,0 +1,270 @@
+"""
+Library of common form shapes and a fuzzy matcher that maps requests onto them.
+
+A request that clearly asks for one of these forms ("Set up an RSVP form for
+my party") is answered from the library without calling the LLM. Requests
+that add their own details score lower and still go to the LLM.
+"""
+
+import copy
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+
+# Words that say nothing about which form is wanted
+STOPWORDS = frozenset("""
+a an the and or of for to in on at by with about from my our your me we us i
+please can could would you create make build generate set up need want new
+form forms google survey questionnaire simple quick basic some
+""".split())
+
+# Weights of the feature kinds; character trigrams make matching typo tolerant
+WORD_WEIGHT = 1.0
+BIGRAM_WEIGHT = 1.5
+TRIGRAM_WEIGHT = 0.3
+
+FORM_TEMPLATES = [
+    {
+        "id": "rsvp",
+        "examples": [
+            "rsvp form", "party rsvp", "wedding rsvp", "event rsvp",
+            "invitation response", "rsvp for my event", "attendance confirmation"
+        ],
+        "form": {
+            "formTitle": "RSVP",
+            "formDescription": "Please let us know if you can make it.",
+            "sections": [{"questions": [
+                {"title": "Name", "type": "text", "required": True},
+                {"title": "Will you attend?", "type": "multiple_choice", "required": True,
+                 "options": ["Yes, I'll be there", "Sorry, I can't make it", "Maybe"]},
+                {"title": "Number of guests (including you)", "type": "multiple_choice", "required": False,
+                 "options": ["1", "2", "3", "4", "5 or more"]},
+                {"title": "Dietary restrictions", "type": "checkbox", "required": False,
+                 "options": ["Vegetarian", "Vegan", "Gluten-free", "Nut allergy", "None"]},
+                {"title": "Message for the host", "type": "paragraph", "required": False}
+            ]}]
+        }
+    },
+    {
+        "id": "customer_feedback",
+        "examples": [
+            "customer feedback", "customer feedback form with rating questions",
+            "customer satisfaction", "product feedback", "service feedback",
+            "feedback form", "customer satisfaction rating"
+        ],
+        "form": {
+            "formTitle": "Customer Feedback",
+            "formDescription": "Thank you for taking a moment to tell us about your experience.",
+            "sections": [{"questions": [
+                {"title": "How satisfied are you overall?", "type": "multiple_choice", "required": True,
+                 "options": ["Very satisfied", "Satisfied", "Neutral", "Dissatisfied", "Very dissatisfied"]},
+                {"title": "How likely are you to recommend us to a friend?", "type": "multiple_choice", "required": True,
+                 "options": ["Very likely", "Likely", "Not sure", "Unlikely", "Very unlikely"]},
+                {"title": "What did you like most?", "type": "paragraph", "required": False},
+                {"title": "What could we improve?", "type": "paragraph", "required": False},
+                {"title": "Email (if you would like a reply)", "type": "text", "required": False}
+            ]}]
+        }
+    },
+    {
+        "id": "contact",
+        "examples": [
+            "contact form", "contact us", "contact information", "get in touch",
+            "website contact form", "inquiry form", "contact details"
+        ],
+        "form": {
+            "formTitle": "Contact Us",
+            "formDescription": "Send us a message and we will get back to you.",
+            "sections": [{"questions": [
+                {"title": "Name", "type": "text", "required": True},
+                {"title": "Email", "type": "text", "required": True},
+                {"title": "Phone", "type": "text", "required": False},
+                {"title": "Subject", "type": "multiple_choice", "required": True,
+                 "options": ["General question", "Support", "Sales", "Other"]},
+                {"title": "Message", "type": "paragraph", "required": True}
+            ]}]
+        }
+    },
+    {
+        "id": "event_registration",
+        "examples": [
+            "event registration", "registration form", "register for event",
+            "conference registration", "workshop registration", "event signup",
+            "sign up sheet for event", "webinar registration"
+        ],
+        "form": {
+            "formTitle": "Event Registration",
+            "formDescription": "Register to reserve your place.",
+            "sections": [{"questions": [
+                {"title": "Full name", "type": "text", "required": True},
+                {"title": "Email", "type": "text", "required": True},
+                {"title": "Organization", "type": "text", "required": False},
+                {"title": "Which sessions will you attend?", "type": "checkbox", "required": False,
+                 "options": ["Morning session", "Afternoon session", "Evening networking"]},
+                {"title": "How did you hear about this event?", "type": "multiple_choice", "required": False,
+                 "options": ["Email", "Social media", "Friend or colleague", "Other"]},
+                {"title": "Accessibility needs or questions", "type": "paragraph", "required": False}
+            ]}]
+        }
+    },
+    {
+        "id": "job_application",
+        "examples": [
+            "job application", "job application form", "employment application",
+            "applicant form", "hiring form", "apply for a job", "candidate application"
+        ],
+        "form": {
+            "formTitle": "Job Application",
+            "formDescription": "Tell us about yourself and the role you are applying for.",
+            "sections": [{"questions": [
+                {"title": "Full name", "type": "text", "required": True},
+                {"title": "Email", "type": "text", "required": True},
+                {"title": "Phone", "type": "text", "required": False},
+                {"title": "Position applied for", "type": "text", "required": True},
+                {"title": "Years of relevant experience", "type": "multiple_choice", "required": True,
+                 "options": ["Less than 1", "1-3", "3-5", "5-10", "More than 10"]},
+                {"title": "Link to resume or portfolio", "type": "text", "required": False},
+                {"title": "Why do you want this role?", "type": "paragraph", "required": False}
+            ]}]
+        }
+    },
+    {
+        "id": "course_evaluation",
+        "examples": [
+            "course evaluation", "course feedback", "class evaluation",
+            "training evaluation", "teacher evaluation", "workshop feedback",
+            "student course survey"
+        ],
+        "form": {
+            "formTitle": "Course Evaluation",
+            "formDescription": "Your feedback helps us improve this course.",
+            "sections": [{"questions": [
+                {"title": "How would you rate the course overall?", "type": "multiple_choice", "required": True,
+                 "options": ["Excellent", "Good", "Average", "Poor"]},
+                {"title": "How would you rate the instructor?", "type": "multiple_choice", "required": True,
+                 "options": ["Excellent", "Good", "Average", "Poor"]},
+                {"title": "Which parts were most useful?", "type": "checkbox", "required": False,
+                 "options": ["Lectures", "Exercises", "Materials", "Discussions"]},
+                {"title": "What should be changed?", "type": "paragraph", "required": False}
+            ]}]
+        }
+    }
+]
+
+
+def _tokens(text):
+    words = re.findall(r"[a-z0-9]+", (text or "").lower())
+    # Light stemming so 'registrations' matches 'registration'
+    return [word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+            for word in words if word not in STOPWORDS]
+
+
+def _features(text):
+    """Weighted word, word-bigram and character-trigram features of a text."""
+    tokens = _tokens(text)
+    features = defaultdict(float)
+    for token in tokens:
+        features["w:" + token] += WORD_WEIGHT
+        padded = f"^{token}$"
+        for index in range(len(padded) - 2):
+            features["c:" + padded[index:index + 3]] += TRIGRAM_WEIGHT
+    for first, second in zip(tokens, tokens[1:]):
+        features[f"b:{first} {second}"] += BIGRAM_WEIGHT
+    return features
+
+
+class TemplateMatcher:
+    """
+    Fuzzy matcher from request text to form templates.
+
+    Each template's example phrases are turned into an IDF-weighted feature
+    vector once, at construction, and indexed by feature. A request is scored
+    against only the templates sharing a feature with it, using cosine
+    similarity; features never seen in the library count against the match at
+    the highest IDF, so requests with extra specifics fall below the threshold
+    and go to the LLM.
+    """
+
+    def __init__(self, templates=None, threshold=0.45):
+        """
+        Build the index.
+
+        Args:
+            templates: Template dicts with 'id', 'examples' and 'form'; defaults to FORM_TEMPLATES
+            threshold: Minimum cosine score for a match
+        """
+        self.templates = {template["id"]: template for template in (templates or FORM_TEMPLATES)}
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "hits": 0, "total_match_us": 0.0}
+
+        template_features = {}
+        document_frequency = defaultdict(int)
+        for template_id, template in self.templates.items():
+            features = defaultdict(float)
+            for example in template["examples"]:
+                for feature, weight in _features(example).items():
+                    features[feature] += weight
+            template_features[template_id] = features
+            for feature in features:
+                document_frequency[feature] += 1
+
+        count = len(self.templates)
+        self._idf = {feature: math.log(1 + count / frequency) for feature, frequency in document_frequency.items()}
+        self._unknown_idf = math.log(1 + count)
+        self._index = defaultdict(list)
+        self._norms = {}
+        for template_id, features in template_features.items():
+            vector = {feature: weight * self._idf[feature] for feature, weight in features.items()}
+            self._norms[template_id] = math.sqrt(sum(value * value for value in vector.values()))
+            for feature, value in vector.items():
+                self._index[feature].append((template_id, value))
+
+    def match(self, request_text):
+        """
+        Find the template that best fits a request.
+
+        Returns:
+            tuple: (template_id, form structure copy, score) for a match at or above
+                the threshold, otherwise (best_template_id or None, None, best score)
+        """
+        started = time.perf_counter()
+        features = _features(request_text)
+        scores = defaultdict(float)
+        norm = 0.0
+        for feature, weight in features.items():
+            value = weight * self._idf.get(feature, self._unknown_idf)
+            norm += value * value
+            for template_id, template_value in self._index.get(feature, ()):
+                scores[template_id] += value * template_value
+
+        best_id, best_score = None, 0.0
+        if norm:
+            norm = math.sqrt(norm)
+            for template_id, dot in scores.items():
+                score = dot / (norm * self._norms[template_id])
+                if score > best_score:
+                    best_id, best_score = template_id, score
+
+        hit = best_id is not None and best_score >= self.threshold
+        with self._lock:
+            self._stats["lookups"] += 1
+            self._stats["hits"] += int(hit)
+            self._stats["total_match_us"] += (time.perf_counter() - started) * 1e6
+        best_score = round(best_score, 3)
+        if hit:
+            return best_id, copy.deepcopy(self.templates[best_id]["form"]), best_score
+        return best_id, None, best_score
+
+    def stats(self):
+        """Return lookups, hits, hit rate and average match time in microseconds."""
+        with self._lock:
+            stats = dict(self._stats)
+        total_us = stats.pop("total_match_us")
+        stats["hit_rate"] = round(stats["hits"] / stats["lookups"], 3) if stats["lookups"] else None
+        stats["avg_match_us"] = round(total_us / stats["lookups"], 1) if stats["lookups"] else None
+        stats["templates"] = len(self.templates)
+        stats["threshold"] = self.threshold
+        return stats
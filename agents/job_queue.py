@@ -0,0 +1,214 @@
+"""
+Bounded job queue for natural-language form requests.
+"""
+
+import logging
+import math
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+logger = logging.getLogger("agent_jobs")
+
+
+class QueueFull(Exception):
+    """The job queue is at capacity; retry after retry_after seconds."""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f"Job queue is full, retry after {retry_after}s")
+
+
+class JobQueue:
+    """
+    Background queue of agent jobs processed by a fixed pool of worker threads.
+
+    Submitting only puts the job on a bounded queue, so the HTTP request
+    returns at once with a job ID. When the queue is full, submit raises
+    QueueFull with a Retry-After estimate derived from recent job durations.
+    Each job keeps its log entries as they are recorded, and callers can
+    long-poll for completion or new steps. Finished jobs are kept for
+    result_ttl seconds.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+    def __init__(self, handler, workers=4, max_queued=32, result_ttl=600, job_limit=1000):
+        """
+        Initialize the queue. Worker threads are started on the first submit.
+
+        Args:
+            handler: Callable(request_text, on_step) returning the job's result dict
+            workers: Number of worker threads, and so jobs running at once
+            max_queued: Maximum number of jobs waiting for a worker
+            result_ttl: Seconds a finished job's result is kept
+            job_limit: Maximum number of jobs kept in memory
+        """
+        self._handler = handler
+        self._workers = workers
+        self._result_ttl = result_ttl
+        self._job_limit = job_limit
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._jobs = OrderedDict()
+        self._changed = threading.Condition()
+        self._threads = []
+        self._durations = []
+        self._stats = {"submitted": 0, "rejected": 0, "completed": 0}
+
+    def submit(self, request_text):
+        """
+        Queue a request without blocking.
+
+        Returns:
+            dict: Snapshot of the new job
+
+        Raises:
+            QueueFull: If no more jobs can be queued
+        """
+        self._ensure_workers()
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "state": self.QUEUED,
+            "request_text": request_text,
+            "submitted_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "log_entries": [],
+            "result": None
+        }
+        with self._changed:
+            self._purge()
+            self._jobs[job_id] = job
+            try:
+                self._queue.put_nowait(job_id)
+            except queue.Full:
+                del self._jobs[job_id]
+                self._stats["rejected"] += 1
+                raise QueueFull(self._retry_after())
+            self._stats["submitted"] += 1
+            return self._snapshot(job)
+
+    def get(self, job_id, wait=0, since_step=None):
+        """
+        Return a snapshot of a job, optionally long-polling for progress.
+
+        Args:
+            job_id: ID returned by submit
+            wait: Seconds to wait for the job to complete, or for new log entries
+                when since_step is given
+            since_step: Number of log entries the caller has already seen
+
+        Returns:
+            dict: Job snapshot, or None if the job is unknown or expired
+        """
+        deadline = time.monotonic() + max(wait, 0)
+        with self._changed:
+            while True:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return None
+                if job["state"] == self.COMPLETED:
+                    break
+                if since_step is not None and len(job["log_entries"]) > since_step:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            return self._snapshot(job)
+
+    def stats(self):
+        """Return queue depth, running jobs and counters."""
+        with self._changed:
+            stats = dict(self._stats)
+            stats["running"] = sum(1 for job in self._jobs.values() if job["state"] == self.RUNNING)
+            stats["avg_job_seconds"] = round(self._average_duration(), 2) if self._durations else None
+        stats["queued"] = self._queue.qsize()
+        stats["max_queued"] = self._queue.maxsize
+        stats["workers"] = self._workers
+        return stats
+
+    def _snapshot(self, job):
+        snapshot = {key: value for key, value in job.items() if not key.startswith("_")}
+        snapshot["log_entries"] = list(job["log_entries"])
+        return snapshot
+
+    def _retry_after(self):
+        """Seconds until a queue slot is likely to free up."""
+        per_job = self._average_duration() if self._durations else 5
+        return max(1, math.ceil(per_job * self._queue.qsize() / self._workers))
+
+    def _average_duration(self):
+        return sum(self._durations) / len(self._durations)
+
+    def _purge(self):
+        """Drop expired finished jobs, and the oldest finished jobs beyond job_limit."""
+        now = time.monotonic()
+        for job_id in list(self._jobs):
+            job = self._jobs[job_id]
+            finished = job.get("_finished")
+            if finished is not None and (now - finished > self._result_ttl or len(self._jobs) > self._job_limit):
+                del self._jobs[job_id]
+
+    def _ensure_workers(self):
+        if self._threads:
+            return
+        with self._changed:
+            if self._threads:
+                return
+            for index in range(self._workers):
+                thread = threading.Thread(
+                    target=self._run_worker,
+                    name=f"agent-job-{index}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _run_worker(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._process(job_id)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, job_id):
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job["state"] = self.RUNNING
+            job["started_at"] = datetime.now().isoformat()
+            self._changed.notify_all()
+        started = time.monotonic()
+
+        def on_step(entry):
+            with self._changed:
+                job["log_entries"].append(entry)
+                self._changed.notify_all()
+
+        try:
+            result = self._handler(job["request_text"], on_step)
+        except Exception as e:
+            logger.error("Agent job %s failed: %s", job_id, e, exc_info=True)
+            result = {
+                "status": "error",
+                "message": f"Internal Agent Server Error: {str(e)}"
+            }
+
+        with self._changed:
+            duration = time.monotonic() - started
+            self._durations = (self._durations + [duration])[-50:]
+            job["state"] = self.COMPLETED
+            job["finished_at"] = datetime.now().isoformat()
+            job["_finished"] = time.monotonic()
+            job["result"] = result
+            self._stats["completed"] += 1
+            self._changed.notify_all()
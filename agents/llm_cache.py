@@ -0,0 +1,149 @@
+"""
+Cache of structured form data parsed from LLM replies.
+
+Entries are keyed by the normalized request text and a prompt version, so a
+repeated request skips the LLM entirely while a change to the prompt never
+serves output produced for the old one.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_request_text(request_text):
+    """Lower-case a request and collapse whitespace and trailing punctuation."""
+    text = re.sub(r'\s+', ' ', request_text or '').strip().lower()
+    return text.rstrip('.!?').strip()
+
+
+class LLMOutputCache:
+    """
+    Two-tier LRU cache with TTL eviction.
+
+    The in-memory tier holds up to max_entries items in least-recently-used
+    order. When disk_path is set, entries are also written to a SQLite file so
+    they survive restarts and are shared by agent workers on the same host;
+    disk hits are promoted back into memory. Values are deep-copied in and
+    out so callers can modify what they get.
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=86400, disk_path=None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Size of the in-memory tier; 0 disables caching
+            ttl_seconds: How long an entry stays valid
+            disk_path: Optional SQLite file for the disk tier
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._connection = None
+        self._disk_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(request_text, prompt_version):
+        """Build the cache key for a request under a prompt version."""
+        normalized = normalize_request_text(request_text)
+        return hashlib.sha256(f"{prompt_version}\n{normalized}".encode()).hexdigest()
+
+    def get(self, key):
+        """Return a copy of the cached value, or None on a miss or expired entry."""
+        if not self.max_entries:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+                self._stats["evictions"] += 1
+
+        value, expires_at = self._disk_get(key, now)
+        with self._lock:
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._store(key, value, expires_at)
+        return copy.deepcopy(value)
+
+    def put(self, key, value):
+        """Cache a value in memory and, if configured, on disk."""
+        if not self.max_entries:
+            return
+        value = copy.deepcopy(value)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store(key, value, expires_at)
+        if self.disk_path:
+            with self._disk_lock:
+                connection = self._connect()
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO llm_output (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), expires_at)
+                    )
+
+    def stats(self):
+        """Return hit/miss counters and the in-memory size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        return stats
+
+    def _store(self, key, value, expires_at):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _disk_get(self, key, now):
+        if not self.disk_path:
+            return None, None
+        with self._disk_lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT value, expires_at FROM llm_output WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, None
+            if row[1] <= now:
+                with connection:
+                    connection.execute("DELETE FROM llm_output WHERE key = ?", (key,))
+                return None, None
+        return json.loads(row[0]), row[1]
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.disk_path, check_same_thread=False, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS llm_output (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )"""
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
@@ -0,0 +1,152 @@
+"""
+Pool of prebuilt LLM chat agents shared by concurrent FormAgent requests.
+"""
+
+import contextlib
+import queue
+import threading
+import time
+
+
+class ChatAgentPool:
+    """
+    Fixed-size pool of chat agents built once and reused across requests.
+
+    warm() builds every agent on a background thread, so the model client
+    setup happens at startup instead of inside a request. checkout() hands an
+    idle agent to one request at a time and resets its conversation memory
+    before returning it to the pool; an agent whose call raised is discarded
+    and rebuilt on demand. If a request arrives before warm-up has produced an
+    agent, one is built inline, never exceeding the pool size.
+    """
+
+    def __init__(self, factory, size=4, acquire_timeout=30):
+        """
+        Initialize the pool. Nothing is built until warm() or checkout().
+
+        Args:
+            factory: Callable returning a new chat agent with its model client
+            size: Maximum number of agents, and so concurrent LLM calls
+            acquire_timeout: Seconds to wait for an idle agent before failing
+        """
+        self.factory = factory
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._warm_thread = None
+        self._warmed = threading.Event()
+        self._stats = {
+            "checkouts": 0,
+            "built_inline": 0,
+            "discarded": 0,
+            "total_build_ms": 0.0,
+            "warm_up_ms": None,
+            "last_error": None
+        }
+
+    def warm(self):
+        """Build the agents on a background thread; safe to call more than once."""
+        with self._lock:
+            if self._warm_thread is not None:
+                return
+            self._warm_thread = threading.Thread(target=self._warm_up, name="llm-pool-warm", daemon=True)
+        self._warm_thread.start()
+
+    def ready(self):
+        """True once warm-up has finished with at least one agent available."""
+        with self._lock:
+            return self._warmed.is_set() and self._created > 0
+
+    @contextlib.contextmanager
+    def checkout(self):
+        """Lend an agent to the caller, resetting and returning it afterwards."""
+        agent = self._acquire()
+        try:
+            yield agent
+        except Exception:
+            self._discard()
+            raise
+        try:
+            agent.reset()
+        except Exception as e:
+            self._record_error(e)
+            self._discard()
+            return
+        self._idle.put(agent)
+
+    def stats(self):
+        """Return pool size, idle and built agents, and build timings."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["created"] = self._created
+        total_ms = stats.pop("total_build_ms")
+        stats["avg_build_ms"] = round(total_ms / stats["created"], 2) if stats["created"] else None
+        stats["idle"] = self._idle.qsize()
+        stats["size"] = self.size
+        stats["warmed"] = self._warmed.is_set()
+        return stats
+
+    def _warm_up(self):
+        started = time.perf_counter()
+        try:
+            while True:
+                with self._lock:
+                    if self._created >= self.size:
+                        break
+                    self._created += 1
+                try:
+                    self._idle.put(self._build())
+                except Exception as e:
+                    with self._lock:
+                        self._created -= 1
+                    self._record_error(e)
+                    break
+        finally:
+            with self._lock:
+                self._stats["warm_up_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            self._warmed.set()
+
+    def _acquire(self):
+        try:
+            agent = self._idle.get_nowait()
+        except queue.Empty:
+            agent = None
+            with self._lock:
+                build = self._created < self.size
+                if build:
+                    self._created += 1
+                    self._stats["built_inline"] += 1
+            if build:
+                try:
+                    agent = self._build()
+                except Exception as e:
+                    with self._lock:
+                        self._created -= 1
+                    self._record_error(e)
+                    raise
+            else:
+                try:
+                    agent = self._idle.get(timeout=self.acquire_timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No idle LLM agent after {self.acquire_timeout}s (pool size {self.size})")
+        with self._lock:
+            self._stats["checkouts"] += 1
+        return agent
+
+    def _build(self):
+        started = time.perf_counter()
+        agent = self.factory()
+        with self._lock:
+            self._stats["total_build_ms"] += (time.perf_counter() - started) * 1000
+        return agent
+
+    def _discard(self):
+        with self._lock:
+            self._created -= 1
+            self._stats["discarded"] += 1
+
+    def _record_error(self, error):
+        with self._lock:
+            self._stats["last_error"] = str(error)
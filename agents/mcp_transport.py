@@ -0,0 +1,142 @@
+"""
+Transports that deliver MCP packets from the FormAgent to the MCP server.
+
+HttpTransport posts packets to the server's /api/process endpoint and is the
+default. InProcessTransport hands them straight to an MCPHandler living in
+the same process, skipping JSON encoding, HTTP and Flask routing, for
+single-node deployments where the agent and server run together.
+"""
+
+import os
+
+from http_session import PooledSession
+from tracing import TRACEPARENT_HEADER, current_traceparent
+
+# Which transport FormAgent uses: 'http' (default) or 'inprocess'
+MCP_TRANSPORT = os.getenv('MCP_TRANSPORT', 'http')
+
+
+class MCPTransportError(Exception):
+    """The MCP server rejected a request before any packet was processed."""
+
+
+class HttpTransport:
+    """Send MCP packets to a remote MCP server over pooled keep-alive HTTP."""
+
+    name = 'http'
+
+    def __init__(self, url, session=None):
+        """
+        Initialize the transport.
+
+        Args:
+            url: The MCP server's /api/process URL
+            session: PooledSession to send with
+        """
+        self.url = url
+        self.session = session or PooledSession()
+
+    def send(self, mcp_packet):
+        """
+        Send one packet or a batch of packets.
+
+        Returns:
+            dict or list: The MCP response packet(s)
+
+        Raises:
+            requests.exceptions.RequestException: On connection errors or error statuses
+        """
+        headers = {'Content-Type': 'application/json'}
+        # Let the server continue the current trace
+        traceparent = current_traceparent()
+        if traceparent:
+            headers[TRACEPARENT_HEADER] = traceparent
+        response = self.session.post(self.url, json=mcp_packet, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self):
+        """Return connection reuse counters."""
+        return self.session.stats()
+
+
+class InProcessTransport:
+    """
+    Call an MCPHandler in the same process, as /api/process would.
+
+    The handler runs in the agent's thread, so its spans join the agent's
+    trace without a header.
+
+    Requires the server package on the import path (e.g. PYTHONPATH=server)
+    and the server's Google credentials in the environment.
+    """
+
+    name = 'inprocess'
+
+    def __init__(self, handler=None):
+        """
+        Initialize the transport.
+
+        Args:
+            handler: MCPHandler to call; one is created if not given
+        """
+        from mcp_handler import MCPHandler
+        from utils.logger import log_mcp_request, log_mcp_response
+        self.handler = handler or MCPHandler()
+        self._log_request = log_mcp_request
+        self._log_response = log_mcp_response
+
+    def send(self, mcp_packet):
+        """
+        Process one packet or a batch of packets with the server's logging.
+
+        Returns:
+            dict or list: The MCP response packet(s)
+
+        Raises:
+            MCPTransportError: Where /api/process would answer with an error status
+        """
+        try:
+            if isinstance(mcp_packet, list):
+                batch_error = self.handler.validate_batch(mcp_packet)
+                if batch_error:
+                    raise MCPTransportError(batch_error)
+                for packet in mcp_packet:
+                    if isinstance(packet, dict):
+                        self._log_request(packet)
+                responses = self.handler.process_batch(mcp_packet)
+                for response in responses:
+                    self._log_response(response)
+                return responses
+
+            if not isinstance(mcp_packet, dict):
+                raise MCPTransportError("Request must be JSON")
+            self._log_request(mcp_packet)
+            response = self.handler.process_request(mcp_packet)
+            self._log_response(response)
+            return response
+        except MCPTransportError:
+            raise
+        except Exception as e:
+            raise MCPTransportError(str(e)) from e
+
+    def stats(self):
+        """In-process calls open no connections."""
+        return None
+
+
+def create_transport(name=None, url=None, session=None):
+    """
+    Create the transport selected by name or the MCP_TRANSPORT setting.
+
+    Args:
+        name: 'http' or 'inprocess'
+        url: MCP server URL for the HTTP transport
+        session: PooledSession for the HTTP transport
+    """
+    name = name or MCP_TRANSPORT
+    if name == 'inprocess':
+        return InProcessTransport()
+    if name == 'http':
+        return HttpTransport(url, session=session)
+    raise ValueError(f"Unknown MCP transport '{name}'. Use 'http' or 'inprocess'")
@@ -0,0 +1,283 @@
+"""
+Micro-benchmarks of MCPHandler and GoogleFormsAPI against the in-memory fake.
+
+No Google credentials or network are needed: the fake Forms/Drive backend
+(fake_google.py) sits under PooledHttp, so packet validation, the service
+objects, the pool, metrics and tracing all run as in production. Each case
+reports latency percentiles, upstream round trips per operation and the
+memory allocated while it runs, measured in a separate pass under
+tracemalloc so tracing does not skew the timings.
+
+    python benchmarks/bench_mcp.py                          # run every case
+    python benchmarks/bench_mcp.py --cases get_responses_1k --latency-ms 20
+    python benchmarks/bench_mcp.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_mcp.py --baseline benchmarks/baseline.json
+
+With --baseline the run exits with status 1 if a case got slower or
+allocates more than --tolerance allows, or makes more upstream calls.
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.join(ROOT_DIR, "common"))
+sys.path.insert(0, os.path.join(ROOT_DIR, "server"))
+
+# The server reads its settings at import time; keep its stores out of the tree,
+# publish inline so each operation's upstream calls are counted, and keep logging
+# and tracing from timing the benchmark's own output
+_STATE_DIR = tempfile.mkdtemp(prefix="mcp-bench-")
+os.environ.setdefault("RESPONSE_STORE_PATH", os.path.join(_STATE_DIR, "responses.db"))
+os.environ.setdefault("FORM_REGISTRY_PATH", os.path.join(_STATE_DIR, "form_registry.db"))
+os.environ.setdefault("TOKEN_CACHE_PATH", os.path.join(_STATE_DIR, "token_cache.json"))
+os.environ.setdefault("ASYNC_PUBLISH", "False")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ["TRACE_EXPORT_PATH"] = ""
+
+from google.oauth2.credentials import Credentials  # noqa: E402
+
+from fake_google import FakeGoogleBackend  # noqa: E402
+from forms_api import GoogleFormsAPI  # noqa: E402
+from mcp_handler import MCPHandler  # noqa: E402
+from services import ServiceRegistry  # noqa: E402
+
+# Minimum change in milliseconds treated as a regression, below timer noise
+NOISE_FLOOR_MS = 0.05
+
+SAMPLE_QUESTIONS = [
+    {"question_type": "text", "title": "Your name", "required": True},
+    {"question_type": "paragraph", "title": "Any comments?"},
+    {"question_type": "multiple_choice", "title": "How did you hear about us?",
+     "options": ["Friend", "Search", "Social media", "Other"]},
+    {"question_type": "checkbox", "title": "Which sessions will you attend?",
+     "options": ["Morning", "Afternoon", "Evening"]}
+]
+
+
+class BenchmarkCase:
+    """
+    One benchmarked operation.
+
+    Args:
+        name: Case name used in reports and baselines
+        run: Callable performing one operation
+        iterations: Timed operations at the default scale
+        setup: Optional callable run once before warm-up
+    """
+
+    def __init__(self, name, run, iterations, setup=None):
+        self.name = name
+        self.run = run
+        self.iterations = iterations
+        self.setup = setup
+
+
+def build_handler(backend):
+    """Create an MCPHandler whose Google calls all go to the fake backend."""
+    registry = ServiceRegistry(credentials=Credentials(token="fake-token"), http_factory=backend.http)
+    return MCPHandler(forms_api=GoogleFormsAPI(registry=registry))
+
+
+def build_cases(handler, backend):
+    """Return the benchmark cases, in report order."""
+    def packet(tool_name, **parameters):
+        return {"transaction_id": "bench", "tool_name": tool_name, "parameters": parameters}
+
+    def checked(request):
+        def run():
+            response = handler.process_request(request)
+            if response["status"] != "success":
+                raise RuntimeError(f"{request['tool_name']} failed: {response['error']['message']}")
+        return run
+
+    def on_seeded_form(name, tool_name, iterations, response_count=0, **parameters):
+        """Case calling a tool on a form that is seeded when the case starts."""
+        request = packet(tool_name, **parameters)
+
+        def setup():
+            request["parameters"]["form_id"] = backend.seed_form(name, SAMPLE_QUESTIONS, response_count=response_count)
+
+        return BenchmarkCase(name, checked(request), iterations, setup=setup)
+
+    return [
+        BenchmarkCase("schema", handler.get_tools_schema, iterations=2000),
+        BenchmarkCase("create_form", checked(packet("create_form", title="Benchmark form",
+                                                    description="Created by bench_mcp.py")), iterations=200),
+        on_seeded_form("add_question", "add_question", 300, question_type="multiple_choice",
+                       title="Pick one", options=["A", "B", "C"], required=True),
+        on_seeded_form("get_responses_10", "get_responses", 300, response_count=10),
+        on_seeded_form("get_responses_1k", "get_responses", 30, response_count=1000),
+        on_seeded_form("get_responses_100k", "get_responses", 3, response_count=100000)
+    ]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def measure(case, backend, scale=1.0, alloc_iterations=3):
+    """
+    Time a case, count its upstream calls and measure its allocations.
+
+    Args:
+        case: BenchmarkCase to run
+        backend: FakeGoogleBackend the case calls
+        scale: Multiplier of the case's iteration count
+        alloc_iterations: Operations run under tracemalloc
+
+    Returns:
+        dict: Latency percentiles in ms, upstream calls per operation and allocations in KiB
+    """
+    if case.setup:
+        case.setup()
+    iterations = max(1, int(case.iterations * scale))
+    # Warm up service objects, caches and the connection pool
+    for _ in range(min(3, iterations)):
+        case.run()
+
+    gc.collect()
+    calls_before = backend.calls.copy()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        case.run()
+        timings.append((time.perf_counter() - started) * 1000)
+    calls = backend.calls - calls_before
+
+    gc.collect()
+    tracemalloc.start()
+    peak_kib = []
+    retained_kib = []
+    for _ in range(alloc_iterations):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        case.run()
+        peak = tracemalloc.get_traced_memory()[1]
+        # Reference cycles of the discovery-built request objects are garbage, not growth
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+        peak_kib.append((peak - before) / 1024)
+        retained_kib.append((after - before) / 1024)
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "min_ms": round(timings[0], 4),
+        "p50_ms": round(percentile(timings, 0.50), 4),
+        "p90_ms": round(percentile(timings, 0.90), 4),
+        "p99_ms": round(percentile(timings, 0.99), 4),
+        "max_ms": round(timings[-1], 4),
+        "upstream_calls": round(sum(calls.values()) / iterations, 2),
+        "upstream_by_method": {method: round(count / iterations, 2) for method, count in sorted(calls.items())},
+        "alloc_peak_kib": round(statistics.median(peak_kib), 1),
+        "alloc_retained_kib": round(statistics.median(retained_kib), 1)
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results with a saved baseline.
+
+    Returns:
+        list: One message per regression
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        if result["p50_ms"] > base["p50_ms"] * (1 + tolerance) and result["p50_ms"] - base["p50_ms"] > NOISE_FLOOR_MS:
+            regressions.append(f"{name}: p50 {base['p50_ms']} ms -> {result['p50_ms']} ms")
+        if result["upstream_calls"] > base["upstream_calls"]:
+            regressions.append(f"{name}: upstream calls {base['upstream_calls']} -> {result['upstream_calls']}")
+        if result["alloc_peak_kib"] > base["alloc_peak_kib"] * (1 + tolerance) + 1:
+            regressions.append(f"{name}: peak allocation {base['alloc_peak_kib']} KiB -> {result['alloc_peak_kib']} KiB")
+    return regressions
+
+
+def format_report(results, baseline=None):
+    """Render results as a fixed-width table, with p50 change against the baseline if given."""
+    header = (f"{'case':<18} {'iters':>6} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} "
+              f"{'calls/op':>9} {'peak KiB':>10} {'kept KiB':>9}")
+    if baseline:
+        header += f" {'p50 vs base':>12}"
+    lines = [header, "-" * len(header)]
+    for name, result in results.items():
+        line = (f"{name:<18} {result['iterations']:>6} {result['p50_ms']:>10.3f} {result['p90_ms']:>10.3f} "
+                f"{result['p99_ms']:>10.3f} {result['upstream_calls']:>9} {result['alloc_peak_kib']:>10.1f} "
+                f"{result['alloc_retained_kib']:>9.1f}")
+        base = (baseline or {}).get("results", {}).get(name)
+        if base:
+            line += f" {(result['p50_ms'] / base['p50_ms'] - 1) * 100 if base['p50_ms'] else 0:>+11.1f}%"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", nargs="*", help="Case names to run (default: all)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier of every case's iteration count")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fake latency of every upstream call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency, up to this much")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake's IDs, answers and jitter")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--save-baseline", help="Save the results as a baseline to this file")
+    parser.add_argument("--baseline", help="Compare with this baseline and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown or growth, as a fraction")
+    args = parser.parse_args(argv)
+
+    backend = FakeGoogleBackend(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, seed=args.seed)
+    handler = build_handler(backend)
+    cases = build_cases(handler, backend)
+    unknown = set(args.cases or []) - {case.name for case in cases}
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}; choose from {', '.join(case.name for case in cases)}")
+
+    results = {}
+    for case in cases:
+        if args.cases and case.name not in args.cases:
+            continue
+        results[case.name] = measure(case, backend, scale=args.scale)
+
+    report = {
+        "settings": {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "seed": args.seed, "scale": args.scale},
+        "environment": {"python": platform.python_version(), "machine": platform.machine(), "platform": platform.platform()},
+        "results": results
+    }
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("settings") != report["settings"]:
+            print(f"Warning: baseline was recorded with {baseline.get('settings')}", file=sys.stderr)
+
+    print(format_report(results, baseline))
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w") as output:
+                json.dump(report, output, indent=2)
+                output.write("\n")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
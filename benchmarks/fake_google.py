@@ -0,0 +1,391 @@
+"""
+Deterministic in-memory fake of the Google Forms and Drive REST APIs.
+
+FakeGoogleBackend keeps forms, their items and responses in memory and
+answers the requests GoogleFormsAPI makes: forms create/get/batchUpdate,
+responses.list, Drive permissions, revisions, copy and delete, and Drive
+HTTP batches. FakeHttp stands in for httplib2.Http, so the fake is injected
+below the googleapiclient service objects, PooledHttp and the credentials,
+and everything above it runs exactly as in production. Tests can edit forms
+behind the client's back and make chosen API methods fail.
+"""
+
+import email.parser
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from collections import Counter
+
+import httplib2
+
+from http_pool import google_api_method
+
+_FORMS = re.compile(r"/v1/forms(?:/(?P<form_id>[^/:]+))?(?P<rest>:batchUpdate|/responses)?$")
+_DRIVE = re.compile(r"/drive/v3/files/(?P<file_id>[^/]+)(?P<rest>/permissions|/revisions/[^/]+|/copy)?$")
+_FILTER = re.compile(r"timestamp\s*>=\s*(\S+)")
+
+
+class FakeGoogleBackend:
+    """
+    In-memory Forms and Drive state shared by every FakeHttp connection.
+
+    IDs, answers and latency jitter come from one seeded random generator,
+    so a run with the same seed and operations sees the same data.
+    """
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, method_latency_ms=None, seed=0):
+        """
+        Initialize an empty backend.
+
+        Args:
+            latency_ms: Delay added to every HTTP round trip
+            jitter_ms: Upper bound of a uniform random delay added on top
+            method_latency_ms: Optional {api method: delay} overriding latency_ms,
+                e.g. {"forms.responses.list": 250}
+            seed: Seed of the ID, answer and jitter generator
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.method_latency_ms = dict(method_latency_ms or {})
+        self.calls = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._forms = {}
+        self._responses = {}
+        self._page_cache = {}
+        self._failures = {}
+
+    def http(self):
+        """Return a new connection to this backend; pass as PooledHttp's http_factory."""
+        return FakeHttp(self)
+
+    def call_count(self):
+        """Total HTTP round trips served so far."""
+        return sum(self.calls.values())
+
+    # Seeding
+
+    def seed_form(self, title, questions, response_count=0):
+        """
+        Create a form with questions and generated responses without counting calls.
+
+        Args:
+            title: Form title
+            questions: List of dicts with question_type, title and options
+            response_count: Number of responses to generate
+
+        Returns:
+            str: The form ID
+        """
+        with self._lock:
+            form = self._new_form(title)
+            for question in questions:
+                form["items"].append(self._new_item(_item_from_question(question)))
+            self._responses[form["formId"]] = [
+                self._new_response(form["items"], index) for index in range(response_count)
+            ]
+        return form["formId"]
+
+    # Inspection and edits made outside the API, as by another client
+
+    def get_form(self, form_id):
+        """Return a copy of a form resource, or None if it does not exist."""
+        with self._lock:
+            form = self._forms.get(form_id)
+            return json.loads(json.dumps(form)) if form is not None else None
+
+    def form_ids(self):
+        """IDs of every existing form."""
+        with self._lock:
+            return set(self._forms)
+
+    def item_titles(self, form_id):
+        """Titles of a form's items, in order."""
+        with self._lock:
+            return [item.get("title", "") for item in self._forms[form_id]["items"]]
+
+    def add_responses(self, form_id, count):
+        """Submit generated responses to a form, each a minute after the form's last one."""
+        with self._lock:
+            form = self._forms[form_id]
+            responses = self._responses[form_id]
+            start = len(responses)
+            responses.extend(self._new_response(form["items"], index) for index in range(start, start + count))
+
+    def add_item(self, form_id, question):
+        """Append a question to a form as another editor would, moving its revision on."""
+        with self._lock:
+            form = self._forms[form_id]
+            form["items"].append(self._new_item(_item_from_question(question)))
+            self._bump_revision(form)
+
+    def remove_item(self, form_id, index=-1):
+        """Delete an item from a form as another editor would, moving its revision on."""
+        with self._lock:
+            form = self._forms[form_id]
+            del form["items"][index]
+            self._bump_revision(form)
+
+    def bump_revision(self, form_id):
+        """Move a form's revision on without changing it, as an edit that was undone would."""
+        with self._lock:
+            self._bump_revision(self._forms[form_id])
+
+    def delete_form(self, form_id):
+        """Delete a form and its responses as if it was removed in Drive."""
+        with self._lock:
+            del self._forms[form_id]
+            del self._responses[form_id]
+
+    def fail_next(self, api_method, status, reason=None, count=1):
+        """
+        Make the next calls of an API method fail.
+
+        Args:
+            api_method: Method as counted in calls, e.g. "files.copy" or "forms.batchUpdate"
+            status: HTTP status to return
+            reason: Optional error reason, e.g. "rateLimitExceeded"
+            count: Number of calls that fail
+        """
+        with self._lock:
+            self._failures[api_method] = [(status, reason)] * count
+
+    def _new_id(self, length=16):
+        return "".join(self._random.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(length))
+
+    def _new_form(self, title):
+        form_id = "fake" + self._new_id(28)
+        form = {
+            "formId": form_id,
+            "info": {"title": title, "documentTitle": title},
+            "settings": {},
+            "items": [],
+            "revisionId": "00000001",
+            "responderUri": f"https://docs.google.com/forms/d/e/{form_id}/viewform"
+        }
+        self._forms[form_id] = form
+        self._responses[form_id] = []
+        return form
+
+    def _new_item(self, item):
+        item = json.loads(json.dumps(item))
+        item["itemId"] = self._new_id(8)
+        question = item.get("questionItem", {}).get("question")
+        if question is not None:
+            question["questionId"] = self._new_id(8)
+        return item
+
+    def _new_response(self, items, index):
+        answers = {}
+        for item in items:
+            question = item.get("questionItem", {}).get("question")
+            if question is None:
+                continue
+            choices = question.get("choiceQuestion", {}).get("options")
+            if choices:
+                picked = [self._random.choice(choices)["value"]]
+                answers[question["questionId"]] = {
+                    "questionId": question["questionId"],
+                    "textAnswers": {"answers": [{"value": value} for value in picked]}
+                }
+            else:
+                answers[question["questionId"]] = {
+                    "questionId": question["questionId"],
+                    "textAnswers": {"answers": [{"value": f"Answer {index} {self._new_id(6)}"}]}
+                }
+        seconds = 1700000000 + index * 60
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)) + ".000Z"
+        return {
+            "responseId": f"resp{index:08d}",
+            "createTime": timestamp,
+            "lastSubmittedTime": timestamp,
+            "answers": answers
+        }
+
+    # Request handling
+
+    def handle(self, uri, method, body, headers=None):
+        """
+        Answer one HTTP request.
+
+        Returns:
+            tuple: (status, content type, body bytes)
+        """
+        api, api_method = google_api_method(method, uri)
+        self.calls[f"{api}.{api_method}" if api_method == "batch" else api_method] += 1
+        delay_ms = self.method_latency_ms.get(api_method, self.latency_ms)
+        if self.jitter_ms:
+            with self._lock:
+                delay_ms += self._random.uniform(0, self.jitter_ms)
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+
+        with self._lock:
+            failures = self._failures.get(api_method)
+            failure = failures.pop(0) if failures else None
+        if failure is not None:
+            status, payload = _error(failure[0], f"Injected failure of {api_method}", reason=failure[1])
+            return status, "application/json; charset=UTF-8", json.dumps(payload).encode()
+
+        parts = urllib.parse.urlsplit(uri)
+        if parts.path.startswith("/batch/"):
+            return self._handle_batch(body, (headers or {}).get("content-type", ""))
+        status, content = self._dispatch(method, parts.path, urllib.parse.parse_qs(parts.query), body)
+        return status, "application/json; charset=UTF-8", content
+
+    def _dispatch(self, method, path, query, body):
+        """Route one request; returns (status, encoded body)."""
+        request = json.loads(body) if body else {}
+        with self._lock:
+            forms_match = _FORMS.match(path)
+            drive_match = _DRIVE.match(path)
+            if forms_match:
+                status, payload = self._handle_forms(method, forms_match["form_id"], forms_match["rest"], query, request)
+            elif drive_match:
+                status, payload = self._handle_drive(method, drive_match["file_id"], drive_match["rest"] or "", request)
+            else:
+                status, payload = _error(404, f"No fake for {method} {path}")
+            return status, payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+
+    def _handle_forms(self, method, form_id, rest, query, request):
+        if form_id is None:
+            if method != "POST":
+                return _error(405, "Method not allowed")
+            return 200, self._new_form(request.get("info", {}).get("title", ""))
+        form = self._forms.get(form_id)
+        if form is None:
+            return _error(404, f"Requested entity was not found: {form_id}")
+        if rest == ":batchUpdate":
+            return self._batch_update(form, request)
+        if rest == "/responses":
+            return 200, self._responses_page(form_id, query)
+        return 200, form
+
+    def _batch_update(self, form, request):
+        required = request.get("writeControl", {}).get("requiredRevisionId")
+        if required and required != form["revisionId"]:
+            return _error(400, "FAILED_PRECONDITION: The revision does not match", status_name="FAILED_PRECONDITION")
+        replies = []
+        for update in request.get("requests", []):
+            if "createItem" in update:
+                item = self._new_item(update["createItem"]["item"])
+                index = update["createItem"].get("location", {}).get("index", len(form["items"]))
+                form["items"].insert(index, item)
+                question = item.get("questionItem", {}).get("question")
+                reply = {"itemId": item["itemId"]}
+                if question is not None:
+                    reply["questionId"] = [question["questionId"]]
+                replies.append({"createItem": reply})
+            elif "updateFormInfo" in update:
+                for field in update["updateFormInfo"]["updateMask"].split(","):
+                    form["info"][field] = update["updateFormInfo"]["info"].get(field, "")
+                replies.append({})
+            else:
+                replies.append({})
+        self._bump_revision(form)
+        result = {"replies": replies, "writeControl": {"requiredRevisionId": form["revisionId"]}}
+        if request.get("includeFormInResponse"):
+            result["form"] = form
+        return 200, result
+
+    @staticmethod
+    def _bump_revision(form):
+        form["revisionId"] = f"{int(form['revisionId']) + 1:08d}"
+
+    def _responses_page(self, form_id, query):
+        page_size = int(query.get("pageSize", ["5000"])[0])
+        start = int(query.get("pageToken", ["0"])[0])
+        submitted_since = _FILTER.search(query.get("filter", [""])[0])
+        key = (form_id, len(self._responses[form_id]), page_size, start, submitted_since and submitted_since.group(1))
+        page = self._page_cache.get(key)
+        if page is None:
+            responses = self._responses[form_id]
+            if submitted_since:
+                responses = [response for response in responses
+                             if response["lastSubmittedTime"] >= submitted_since.group(1)]
+            result = {}
+            if responses[start:start + page_size]:
+                result["responses"] = responses[start:start + page_size]
+            if start + page_size < len(responses):
+                result["nextPageToken"] = str(start + page_size)
+            # Pages are encoded once, so repeated reads measure the client side only
+            page = self._page_cache[key] = json.dumps(result).encode()
+        return page
+
+    def _handle_drive(self, method, file_id, rest, request):
+        if file_id not in self._forms:
+            return _error(404, f"File not found: {file_id}")
+        if rest == "/permissions" and method == "POST":
+            return 200, {"id": "anyoneWithLink"}
+        if rest.startswith("/revisions/") and method == "PATCH":
+            return 200, {"id": rest.rsplit("/", 1)[1], "published": True}
+        if rest == "/copy" and method == "POST":
+            source = self._forms[file_id]
+            copy = self._new_form(request.get("name", source["info"]["title"]))
+            copy["items"] = [self._new_item(item) for item in source["items"]]
+            return 200, {"id": copy["formId"], "name": copy["info"]["title"]}
+        if rest == "" and method == "DELETE":
+            del self._forms[file_id]
+            del self._responses[file_id]
+            return 204, b""
+        return _error(405, f"Method not allowed: {method} files{rest}")
+
+    def _handle_batch(self, body, content_type):
+        """Answer a multipart/mixed Drive batch, each part in application/http format."""
+        body = body if isinstance(body, str) else body.decode()
+        message = email.parser.Parser().parsestr(f"content-type: {content_type}\r\n\r\n{body}")
+        boundary = "batch_fake_boundary"
+        chunks = []
+        for part in message.get_payload():
+            request_line, _, rest = part.get_payload().partition("\n")
+            method, target, _ = request_line.split(" ", 2)
+            part_body = rest.split("\r\n\r\n", 1)[1] if "\r\n\r\n" in rest else rest.split("\n\n", 1)[-1]
+            target = urllib.parse.urlsplit(target)
+            status, content = self._dispatch(method, target.path, urllib.parse.parse_qs(target.query), part_body.strip())
+            chunks.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{part['Content-ID'][1:-1]}>\r\n\r\n"
+                f"HTTP/1.1 {status} OK\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{content.decode()}\r\n"
+            )
+        chunks.append(f"--{boundary}--\r\n")
+        return 200, f"multipart/mixed; boundary={boundary}", "".join(chunks).encode()
+
+
+class FakeHttp:
+    """httplib2.Http stand-in that sends every request to a FakeGoogleBackend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None):
+        status, content_type, content = self.backend.handle(uri, method, body, headers)
+        return httplib2.Response({"status": status, "content-type": content_type}), content
+
+    def close(self):
+        pass
+
+
+def _item_from_question(question):
+    """Build a Forms API item for a question dict like the MCP tools take."""
+    body = {"required": bool(question.get("required", False))}
+    if question["question_type"] in ("multiple_choice", "checkbox"):
+        body["choiceQuestion"] = {
+            "type": "RADIO" if question["question_type"] == "multiple_choice" else "CHECKBOX",
+            "options": [{"value": option} for option in question.get("options") or []]
+        }
+    else:
+        body["textQuestion"] = {"paragraph": question["question_type"] == "paragraph"}
+    return {"title": question["title"], "questionItem": {"question": body}}
+
+
+def _error(status, message, status_name=None, reason=None):
+    names = {400: "INVALID_ARGUMENT", 403: "PERMISSION_DENIED", 404: "NOT_FOUND", 405: "METHOD_NOT_ALLOWED",
+             429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE"}
+    error = {"code": status, "message": message, "status": status_name or names.get(status, "UNKNOWN")}
+    if reason:
+        error["errors"] = [{"message": message, "domain": "global", "reason": reason}]
+    return status, {"error": error}
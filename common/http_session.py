@@ -0,0 +1,78 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class PooledSession:
+    """
+    Keep-alive HTTP client for calls between the MCP server and the agent.
+
+    Wraps a requests.Session whose adapter keeps up to pool_size open
+    connections per host, so repeated calls reuse a TCP connection instead of
+    opening a new one each time. Every request gets the default timeout unless
+    the caller passes its own. Connection counters come from the underlying
+    urllib3 pools.
+    """
+
+    def __init__(self, pool_size=10, connect_timeout=5, read_timeout=60):
+        """
+        Initialize the session.
+
+        Args:
+            pool_size: Maximum kept-alive connections per host
+            connect_timeout: Seconds allowed to establish a connection
+            read_timeout: Seconds allowed between bytes of the response
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_size = pool_size
+        self.adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+
+    def post(self, url, **kwargs):
+        """Send a POST request (requests.post signature)."""
+        return self.request('POST', url, **kwargs)
+
+    def get(self, url, **kwargs):
+        """Send a GET request (requests.get signature)."""
+        return self.request('GET', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        """Send a request on a pooled connection with the default timeout."""
+        kwargs.setdefault('timeout', self.timeout)
+        with self._lock:
+            self._requests += 1
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            with self._lock:
+                self._errors += 1
+            raise
+
+    def stats(self):
+        """Return request counts and how many connections were opened versus reused."""
+        opened = 0
+        served = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                served += pool.num_requests
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "errors": self._errors,
+                "connections_opened": opened,
+                "connections_reused": max(served - opened, 0),
+                "pool_size": self.pool_size
+            }
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
@@ -0,0 +1,243 @@
+"""
+In-process metrics exposed in the Prometheus text format.
+
+Every thread records into its own shard of each metric, so recording a value
+takes no lock. Shards are summed when /metrics is scraped, and the shards of
+threads that have exited are folded into a running total.
+"""
+
+import bisect
+import contextlib
+import threading
+import time
+import weakref
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class _ThreadShard:
+    """One thread's values of a metric, keyed by label values."""
+
+    __slots__ = ("series", "__weakref__")
+
+    def __init__(self):
+        self.series = {}
+
+
+class _Metric:
+    """Base class of sharded metrics; each series is a fixed-width list of floats."""
+
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=(), width=1):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._width = width
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live = weakref.WeakSet()
+        self._retired = {}
+
+    def _values(self, labelvalues):
+        """Return the calling thread's values for a label set."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _ThreadShard()
+            with self._lock:
+                self._live.add(shard)
+            weakref.finalize(shard, self._retire, shard.series)
+        values = shard.series.get(labelvalues)
+        if values is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labelvalues}")
+            values = shard.series[labelvalues] = [0.0] * self._width
+        return values
+
+    def _retire(self, series):
+        with self._lock:
+            self._merge(self._retired, series)
+
+    def _merge(self, totals, series):
+        for labelvalues, values in list(series.items()):
+            total = totals.get(labelvalues)
+            if total is None:
+                total = totals[labelvalues] = [0.0] * self._width
+            for index, value in enumerate(values):
+                total[index] += value
+
+    def collect(self):
+        """Return {label values: summed values} across all threads."""
+        with self._lock:
+            totals = {labelvalues: list(values) for labelvalues, values in self._retired.items()}
+            shards = list(self._live)
+        for shard in shards:
+            self._merge(totals, shard.series)
+        return totals
+
+    def _labels(self, labelvalues, extra=()):
+        pairs = list(zip(self.labelnames, labelvalues)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for labelvalues, values in sorted(self.collect().items()):
+            lines.extend(self._render_series(labelvalues, values))
+        return lines
+
+    def _render_series(self, labelvalues, values):
+        return [f"{self.name}{self._labels(labelvalues)} {_format_value(values[0])}"]
+
+
+class Counter(_Metric):
+    """Monotonic count, e.g. errors by class."""
+
+    type_name = "counter"
+
+    def inc(self, *labelvalues, amount=1):
+        self._values(labelvalues)[0] += amount
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. requests in flight."""
+
+    type_name = "gauge"
+
+    def inc(self, *labelvalues, amount=1):
+        self._values(labelvalues)[0] += amount
+
+    def dec(self, *labelvalues, amount=1):
+        self._values(labelvalues)[0] -= amount
+
+    @contextlib.contextmanager
+    def track_in_progress(self, *labelvalues):
+        """Count the enclosed block as in progress while it runs."""
+        self.inc(*labelvalues)
+        try:
+            yield
+        finally:
+            self.dec(*labelvalues)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values, e.g. latencies, in cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One slot per bucket, one for +Inf and one for the sum
+        super().__init__(name, documentation, labelnames, width=len(self.buckets) + 2)
+
+    def observe(self, value, *labelvalues):
+        values = self._values(labelvalues)
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    @contextlib.contextmanager
+    def time(self, *labelvalues):
+        """Observe the wall-clock duration of the enclosed block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labelvalues)
+
+    def _render_series(self, labelvalues, values):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), values[:-1]):
+            cumulative += count
+            le = bound if bound == "+Inf" else _format_value(bound)
+            lines.append(f"{self.name}_bucket{self._labels(labelvalues, [('le', le)])} {_format_value(cumulative)}")
+        lines.append(f"{self.name}_sum{self._labels(labelvalues)} {_format_value(values[-1])}")
+        lines.append(f"{self.name}_count{self._labels(labelvalues)} {_format_value(cumulative)}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on /metrics."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def _register(self, cls, name, documentation, labelnames, **kwargs):
+        """Create a metric, or return the existing one if the name is already registered."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.type_name}")
+            return metric
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class observe_call:
+    """
+    Time a call, count it as in flight while it runs and count its exception by class.
+
+    A plain context manager class rather than a generator, as it wraps every
+    tool, Google API and agent phase call.
+
+    Args:
+        duration: Histogram observed with the call's duration
+        in_flight: Gauge raised while the call runs
+        errors: Counter labelled like the others plus the exception class name
+        labelvalues: Label values shared by the three metrics
+    """
+
+    __slots__ = ("duration", "in_flight", "errors", "labelvalues", "started")
+
+    def __init__(self, duration, in_flight, errors, *labelvalues):
+        self.duration = duration
+        self.in_flight = in_flight
+        self.errors = errors
+        self.labelvalues = labelvalues
+
+    def __enter__(self):
+        self.in_flight.inc(*self.labelvalues)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.duration.observe(time.perf_counter() - self.started, *self.labelvalues)
+        self.in_flight.dec(*self.labelvalues)
+        if exc_type is not None:
+            self.errors.inc(*self.labelvalues, exc_type.__name__)
+        return False
+
+
+# Process-wide registry served on /metrics
+registry = MetricsRegistry()
@@ -0,0 +1,179 @@
+"""
+Structured, non-blocking logging.
+
+Request threads check the level, apply sampling, render the message and
+put the record on an in-memory queue; a single listener thread encodes
+records as JSON lines and writes them. Payloads are passed as arguments (wrapped in LazyJSON for
+dicts), so nothing is serialized for records that are filtered out.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_exception_formatter = logging.Formatter()
+
+
+class LazyJSON:
+    """Log argument that is JSON-encoded only if the record is written."""
+
+    __slots__ = ("value", "indent")
+
+    def __init__(self, value, indent=None):
+        self.value = value
+        self.indent = indent
+
+    def __str__(self):
+        try:
+            return json.dumps(self.value, indent=self.indent, default=str)
+        except (TypeError, ValueError):
+            return repr(self.value)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format each record as one JSON object per line.
+
+    Keys are ts, level, logger and msg, plus anything passed as
+    extra={"fields": {...}} and the traceback, if any.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_text or record.exc_info:
+            entry["exc"] = record.exc_text or self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fraction of the records below WARNING, per logger category.
+
+    Rates are keyed by logger name and apply to its child loggers too; the
+    most specific name wins. Warnings and errors are never dropped.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = dict(rates)
+        self._resolved = {}
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._resolved.get(record.name)
+        if rate is None:
+            rate = self._resolved[record.name] = self._rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+    def _rate_for(self, name):
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return self.rates.get("*", 1.0)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves building the output line to the listener thread.
+
+    As in the standard QueueHandler, the message and any traceback are
+    rendered in the calling thread on a copy of the record, because the
+    caller may change its arguments or drop the exception's frames once the
+    call returns. The timestamp, JSON encoding and write happen on the
+    listener. When the queue is full, records are dropped and counted rather
+    than blocking.
+    """
+
+    def __init__(self, record_queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Keep the text and let go of the traceback and its frames
+            record.exc_text = record.exc_text or _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def parse_sample_rates(spec):
+    """
+    Parse "name=rate,name=rate" into a dict; malformed entries are ignored.
+
+    Example: "mcp_server.forms_api=0.1,werkzeug=0"
+    """
+    rates = {}
+    for entry in (spec or "").split(","):
+        name, _, rate = entry.partition("=")
+        try:
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+def configure_logging(level="INFO", json_format=True, sample_rates=None, queue_size=10000, stream=None):
+    """
+    Route the root logger through a queue to a single writer thread.
+
+    Safe to call more than once; only the first call in a process installs
+    the handlers.
+
+    Args:
+        level: Root log level name or number
+        json_format: Emit JSON lines instead of the plain text format
+        sample_rates: Optional {logger name: fraction kept} for records below WARNING
+        queue_size: Records buffered before new ones are dropped
+        stream: Output stream, defaults to stdout
+    """
+    root = logging.getLogger()
+    if any(isinstance(handler, logging.handlers.QueueHandler) for handler in root.handlers):
+        return
+
+    stream_handler = logging.StreamHandler(stream or sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+    queue_handler = DeferredQueueHandler(queue.Queue(maxsize=queue_size))
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    # Records never report their caller, thread or process, so skip collecting them
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(queue_handler.queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
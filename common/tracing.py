@@ -0,0 +1,269 @@
+"""
+Request tracing across the agent, the MCP server and Google API calls.
+
+Spans use W3C Trace Context IDs and travel between services in the
+`traceparent` header; within a process the current span is held in a
+context variable. Finished spans are written as JSON lines, one span per
+line with OTLP's field names, by a single background thread.
+
+Tracing is off until configure_tracing is given an export path. Until then
+start_span returns a shared no-op span, so instrumented code costs almost
+nothing.
+
+Show the spans of one trace as a tree:
+    python tracing.py data/traces.jsonl [more files ...] <trace_id>
+"""
+
+import atexit
+import contextvars
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+TRACEPARENT_HEADER = "traceparent"
+
+_current_span = contextvars.ContextVar("trace_span", default=None)
+_exporter = None
+_sample_rate = 1.0
+
+
+class Span:
+    """
+    One timed operation of a trace; a context manager that makes itself the current span.
+
+    Spans of unsampled traces still carry their IDs to child spans and
+    downstream services but are never exported.
+    """
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "service", "sampled",
+                 "attributes", "start_ns", "_started", "_token")
+
+    def __init__(self, name, service, trace_id, parent_id, sampled, attributes):
+        self.name = name
+        self.service = service
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes = attributes
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def traceparent(self):
+        """Header value that makes this span the parent of a downstream span."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def __enter__(self):
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        duration_ns = time.perf_counter_ns() - self._started
+        _current_span.reset(self._token)
+        exporter = _exporter
+        if self.sampled and exporter is not None:
+            record = {
+                "traceId": self.trace_id,
+                "spanId": self.span_id,
+                "parentSpanId": self.parent_id or "",
+                "name": self.name,
+                "service": self.service,
+                "startTimeUnixNano": self.start_ns,
+                "endTimeUnixNano": self.start_ns + duration_ns,
+                "durationMs": round(duration_ns / 1e6, 3),
+                "attributes": self.attributes,
+                "status": {"code": "OK"} if exc_type is None else {
+                    "code": "ERROR", "message": f"{exc_type.__name__}: {exc}"
+                }
+            }
+            exporter.export(record)
+        return False
+
+
+class _NoopSpan:
+    """Span returned while tracing is off."""
+
+    __slots__ = ()
+
+    trace_id = None
+    sampled = False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def traceparent(self):
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class JsonLinesExporter:
+    """
+    Append finished spans to a JSON-lines file from a background thread.
+
+    Spans are dropped and counted, rather than blocking the request, when
+    the queue is full.
+    """
+
+    def __init__(self, path, queue_size=10000):
+        self.path = path
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def export(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        with open(self.path, "a", encoding="utf-8") as output:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    return
+                output.write(json.dumps(record, default=str) + "\n")
+                if self._queue.empty():
+                    output.flush()
+
+    def close(self):
+        """Write the queued spans and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+
+class Tracer:
+    """Starts spans on behalf of one service (e.g. 'mcp-server')."""
+
+    def __init__(self, service):
+        self.service = service
+
+    def start_span(self, name, traceparent=None, **attributes):
+        """
+        Start a span as a child of the current span.
+
+        Args:
+            name: Operation name, e.g. 'google.forms.batchUpdate'
+            traceparent: Header value of a remote parent, used when no span is current
+            **attributes: Values recorded with the span
+
+        Returns:
+            Span: To be used as a context manager; the no-op span if tracing is off
+        """
+        if _exporter is None:
+            return NOOP_SPAN
+        parent = _current_span.get()
+        if parent is not None:
+            return Span(name, self.service, parent.trace_id, parent.span_id, parent.sampled, attributes)
+        remote = parse_traceparent(traceparent)
+        if remote is not None:
+            trace_id, parent_id, sampled = remote
+            return Span(name, self.service, trace_id, parent_id, sampled, attributes)
+        sampled = _sample_rate >= 1 or random.random() < _sample_rate
+        return Span(name, self.service, f"{random.getrandbits(128):032x}", None, sampled, attributes)
+
+
+def parse_traceparent(value):
+    """
+    Parse a W3C traceparent header.
+
+    Returns:
+        tuple: (trace_id, parent_span_id, sampled), or None if missing or malformed
+    """
+    parts = (value or "").strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+    if set(parts[1]) == {"0"} or set(parts[2]) == {"0"}:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+def current_span():
+    """Return the span active in this context, or None."""
+    return _current_span.get()
+
+
+def current_traceparent():
+    """Header value propagating the current span downstream, or None outside a span."""
+    span = _current_span.get()
+    return span.traceparent() if span is not None else None
+
+
+def configure_tracing(path, sample_rate=1.0):
+    """
+    Turn tracing on, exporting spans to a JSON-lines file.
+
+    Safe to call more than once; only the first call with a path in a process
+    takes effect, so the agent and server can share a process.
+
+    Args:
+        path: File the spans are appended to; tracing stays off if empty
+        sample_rate: Fraction of new traces recorded; traces started upstream
+            follow the caller's decision
+    """
+    global _exporter, _sample_rate
+    if not path or _exporter is not None:
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    _sample_rate = min(max(float(sample_rate), 0.0), 1.0)
+    _exporter = JsonLinesExporter(path)
+
+
+def format_trace(spans):
+    """Render the spans of one trace as an indented tree with start offsets and durations."""
+    if not spans:
+        return ""
+    children = {}
+    ids = {span["spanId"] for span in spans}
+    for span in sorted(spans, key=lambda span: span["startTimeUnixNano"]):
+        parent = span["parentSpanId"] if span["parentSpanId"] in ids else None
+        children.setdefault(parent, []).append(span)
+    origin = min(span["startTimeUnixNano"] for span in spans)
+    lines = []
+
+    def walk(parent, depth):
+        for span in children.get(parent, []):
+            offset_ms = (span["startTimeUnixNano"] - origin) / 1e6
+            error = "  ERROR " + span["status"].get("message", "") if span["status"]["code"] == "ERROR" else ""
+            lines.append(f"{offset_ms:10.1f} ms {span['durationMs']:10.1f} ms  {'  ' * depth}"
+                         f"{span['service']}: {span['name']}{error}")
+            walk(span["spanId"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit("Usage: python tracing.py <spans.jsonl> [more.jsonl ...] <trace_id>")
+    trace_id = sys.argv[-1]
+    spans = []
+    for span_path in sys.argv[1:-1]:
+        with open(span_path, encoding="utf-8") as span_file:
+            spans.extend(span for span in map(json.loads, span_file) if span["traceId"] == trace_id)
+    print(format_trace(spans) or f"No spans found for trace {trace_id}")
@@ -1,22 +1,38 @@
-from flask import Flask, request, jsonify, render_template
+import time
+_startup_started = time.perf_counter()
+
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context
 from flask_cors import CORS
 import json
 import os
 import requests # Import requests library
 
-from mcp_handler import MCPHandler
+from mcp_handler import MCPHandler, tracer
 from utils.logger import log_mcp_request, log_mcp_response, log_error, get_logger
+from structured_logging import LazyJSON
 import config
-from forms_api import GoogleFormsAPI
+from services import get_registry
+from http_session import PooledSession
+from metrics import CONTENT_TYPE, registry as metrics_registry
+from tracing import TRACEPARENT_HEADER
 
 # Initialize Flask application
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Initialize the MCP handler
+# Initialize the MCP handler; Google services are built lazily on first use
 mcp_handler = MCPHandler()
 logger = get_logger()
-forms_api = GoogleFormsAPI()
+# Keep-alive connections to the agent server for /api/agent_proxy
+agent_session = PooledSession(
+    pool_size=config.AGENT_POOL_SIZE,
+    connect_timeout=config.AGENT_CONNECT_TIMEOUT_SECONDS,
+    read_timeout=config.AGENT_READ_TIMEOUT_SECONDS
+)
+startup_ms = round((time.perf_counter() - _startup_started) * 1000, 2)
+logger.info("MCP server initialized in %s ms", startup_ms)
+# Fetch the access token now rather than on the first request; timed under service_init_ms
+get_registry().prime_credentials()
 
 @app.route('/')
 def index():
@@ -51,12 +67,31 @@ def process_mcp_request():
             }), 400
         
         request_data = request.get_json()
-        log_mcp_request(request_data)
         
-        response = mcp_handler.process_request(request_data)
-        log_mcp_response(response)
+        # Continue the agent's trace if it sent a traceparent header
+        with tracer.start_span("POST /api/process", traceparent=request.headers.get(TRACEPARENT_HEADER)):
+            # An array of packets is a batch whose packets may use earlier results
+            if isinstance(request_data, list):
+                batch_error = mcp_handler.validate_batch(request_data)
+                if batch_error:
+                    return jsonify({
+                        "status": "error",
+                        "message": batch_error
+                    }), 400
+                for packet in request_data:
+                    if isinstance(packet, dict):
+                        log_mcp_request(packet)
+                responses = mcp_handler.process_batch(request_data)
+                for response in responses:
+                    log_mcp_response(response)
+                return jsonify(responses)
+        
+            log_mcp_request(request_data)
         
-        return jsonify(response)
+            response = mcp_handler.process_request(request_data)
+            log_mcp_response(response)
+        
+            return jsonify(response)
     
     except Exception as e:
         log_error("Error processing MCP request", e)
@@ -65,12 +100,47 @@ def process_mcp_request():
             "message": str(e)
         }), 500
 
+@app.route('/api/forms/<form_id>/responses.ndjson', methods=['GET'])
+def stream_responses(form_id):
+    """Stream every response of a form as newline-delimited JSON."""
+    try:
+        # Fetch the question titles up front so errors still return a JSON body
+        _, questions = mcp_handler.forms_api.get_question_titles(form_id)
+    except Exception as e:
+        log_error(f"Error preparing response stream for form {form_id}", e)
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+    
+    def generate():
+        try:
+            for response in mcp_handler.forms_api.iter_responses(form_id, questions=questions):
+                yield json.dumps(response) + "\n"
+        except Exception as e:
+            # Headers are already sent, so report the failure as a final line
+            log_error(f"Error streaming responses for form {form_id}", e)
+            yield json.dumps({"status": "error", "message": str(e)}) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics: MCP tool and Google API call latencies, errors and in-flight calls."""
+    return Response(metrics_registry.render(), content_type=CONTENT_TYPE)
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
     return jsonify({
         "status": "ok",
-        "version": config.MCP_VERSION
+        "version": config.MCP_VERSION,
+        "startup_ms": startup_ms,
+        "service_init_ms": get_registry().startup_timings(),
+        "token": get_registry().token_manager.stats(),
+        "http_pool": get_registry().http_pool_stats(),
+        "form_clones": mcp_handler.forms_api.form_registry.stats(),
+        "agent_http": agent_session.stats()
     })
 
 # WebSocket for real-time UI updates
@@ -86,23 +156,23 @@ def forms_api():
         data = request.json
         action = data.get('action')
         
-        logger.info(f"Received form API request: {action}")
+        logger.info("Received form API request: %s", action)
         
         if action == 'create_form':
             title = data.get('title', 'Untitled Form')
             description = data.get('description', '')
             
-            logger.info(f"Creating form with title: {title}")
-            result = forms_api.create_form(title, description)
-            logger.info(f"Form created with ID: {result.get('form_id')}")
-            logger.info(f"Form response URL: {result.get('response_url')}")
-            logger.info(f"Form edit URL: {result.get('edit_url')}")
+            logger.info("Creating form with title: %s", title)
+            result = mcp_handler.forms_api.create_form(title, description)
+            logger.info("Form created with ID: %s", result.get('form_id'))
+            logger.info("Form response URL: %s", result.get('response_url'))
+            logger.info("Form edit URL: %s", result.get('edit_url'))
             
             return jsonify({"status": "success", "result": result})
         
         return jsonify({"status": "error", "message": f"Unknown action: {action}"})
     except Exception as e:
-        logger.error(f"Error in forms API: {str(e)}")
+        logger.error("Error in forms API: %s", e)
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @app.route('/api/agent_proxy', methods=['POST'])
@@ -119,11 +189,10 @@ def agent_proxy():
              log_error("Agent endpoint URL is not configured.", None)
              return jsonify({"status": "error", "message": "Agent service URL not configured."}), 500
         
-        logger.info(f"Proxying request to agent at {agent_url}: {frontend_data}")
+        logger.info("Proxying request to agent at %s: %s", agent_url, frontend_data.get('request_text'))
 
-        # Forward the request to the agent server
-        # Note: Consider adding timeout and error handling for the requests.post call
-        agent_response = requests.post(
+        # Forward the request to the agent server over a kept-alive connection
+        agent_response = agent_session.post(
             agent_url,
             json=frontend_data, 
             headers={'Content-Type': 'application/json'}
@@ -135,7 +204,8 @@ def agent_proxy():
         agent_response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
 
         agent_data = agent_response.json()
-        logger.info(f"Received response from agent: {agent_data}")
+        logger.info("Received response from agent: %s", agent_data.get('status'))
+        logger.debug("Agent response: %s", LazyJSON(agent_data))
         
         # Return the agent's response directly to the frontend
         return jsonify(agent_data)
@@ -147,11 +217,79 @@ def agent_proxy():
         log_error("Error in agent proxy endpoint", e)
         return jsonify({"status": "error", "message": f"Internal proxy error: {str(e)}"}), 500
 
+@app.route('/api/agent_proxy/stream', methods=['POST'])
+def agent_proxy_stream():
+    """Proxy a request to the agent's streaming endpoint, relaying its Server-Sent Events."""
+    frontend_data = request.get_json(silent=True)
+    if not frontend_data or 'request_text' not in frontend_data:
+        log_error("Agent stream proxy received invalid data from frontend", frontend_data)
+        return jsonify({"status": "error", "message": "Invalid request data"}), 400
+    
+    agent_url = config.AGENT_STREAM_ENDPOINT
+    logger.info("Proxying streaming request to agent at %s: %s", agent_url, frontend_data.get('request_text'))
+    
+    try:
+        agent_response = agent_session.post(
+            agent_url,
+            json=frontend_data,
+            headers={'Content-Type': 'application/json', 'Accept': 'text/event-stream'},
+            stream=True
+        )
+        agent_response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        log_error(f"Error communicating with agent server at {agent_url}", e)
+        return jsonify({"status": "error", "message": f"Failed to reach agent service: {str(e)}"}), 502 # Bad Gateway
+    
+    def relay():
+        try:
+            # Forward events as they arrive rather than buffering the response
+            for chunk in agent_response.iter_content(chunk_size=None):
+                yield chunk
+        except requests.exceptions.RequestException as e:
+            log_error(f"Agent stream from {agent_url} failed", e)
+            error = {"status": "error", "message": f"Agent stream interrupted: {str(e)}"}
+            yield f"event: result\ndata: {json.dumps(error)}\n\n"
+        finally:
+            agent_response.close()
+    
+    return Response(
+        stream_with_context(relay()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/agent_proxy/jobs', methods=['POST'])
+@app.route('/api/agent_proxy/jobs/<job_id>', methods=['GET'])
+def agent_proxy_jobs(job_id=None):
+    """Proxy the agent's job API: submit a job, or get its status with optional long-polling."""
+    agent_url = config.AGENT_JOBS_ENDPOINT
+    try:
+        if job_id is None:
+            frontend_data = request.get_json(silent=True)
+            if not frontend_data or 'request_text' not in frontend_data:
+                log_error("Agent job proxy received invalid data from frontend", frontend_data)
+                return jsonify({"status": "error", "message": "Invalid request data"}), 400
+            agent_response = agent_session.post(agent_url, json=frontend_data)
+        else:
+            agent_response = agent_session.get(f"{agent_url}/{job_id}", params=request.args)
+    except requests.exceptions.RequestException as e:
+        log_error(f"Error communicating with agent server at {agent_url}", e)
+        return jsonify({"status": "error", "message": f"Failed to reach agent service: {str(e)}"}), 502 # Bad Gateway
+    
+    # Relay the agent's status and headers the client acts on (202/503/404)
+    response = Response(agent_response.content, status=agent_response.status_code, mimetype='application/json')
+    for header in ('Retry-After', 'Location'):
+        if header in agent_response.headers:
+            value = agent_response.headers[header]
+            response.headers[header] = value.replace('/jobs/', '/api/agent_proxy/jobs/', 1) if header == 'Location' else value
+    return response
+
 if __name__ == '__main__':
     port = config.PORT
     debug = config.DEBUG
     
-    logger.info(f"Starting Google Forms MCP Server on port {port}")
-    logger.info(f"Debug mode: {debug}")
+    logger.info("Starting Google Forms MCP Server on port %s", port)
+    logger.info("Debug mode: %s", debug)
     
-    app.run(host='0.0.0.0', port=port, debug=debug)
+    # The Google API client layer is thread-safe, so serve requests concurrently
+    app.run(host='0.0.0.0', port=port, debug=debug, threaded=True)
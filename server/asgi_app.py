@@ -0,0 +1,192 @@
+import asyncio
+import contextlib
+import uuid
+import time
+_startup_started = time.perf_counter()
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from async_forms_api import AsyncGoogleFormsAPI
+from mcp_handler import MCPHandler, ToolCall, tracer
+from utils.logger import log_mcp_request, log_mcp_response, log_error, get_logger
+import config
+from services import get_registry
+from metrics import CONTENT_TYPE, registry as metrics_registry
+from tracing import TRACEPARENT_HEADER
+
+# ASGI variant of the MCP endpoints in app.py. Request validation and the
+# response packets are shared with the Flask server through MCPHandler; only
+# the Google calls differ, running on a non-blocking client so one worker can
+# keep many slow Forms/Drive calls in flight. Run with:
+#   uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+
+mcp_handler = MCPHandler()
+async_forms_api = AsyncGoogleFormsAPI(mcp_handler.forms_api)
+logger = get_logger()
+startup_ms = round((time.perf_counter() - _startup_started) * 1000, 2)
+logger.info("Async MCP server initialized in %s ms", startup_ms)
+
+
+async def process_request(request_data):
+    """
+    Process an MCP request without blocking the event loop.
+
+    Args:
+        request_data: Dict containing the MCP request data
+
+    Returns:
+        dict: MCP response packet, identical to MCPHandler.process_request
+    """
+    try:
+        transaction_id, outcome = mcp_handler.prepare_request(request_data)
+        if not isinstance(outcome, ToolCall):
+            return outcome
+
+        with mcp_handler.trace_tool(outcome.method, transaction_id), mcp_handler.instrument_tool(outcome.method):
+            result = await async_forms_api.call(outcome.method, *outcome.args, **outcome.kwargs)
+        return mcp_handler._create_success_response(transaction_id, result)
+
+    except Exception as e:
+        return mcp_handler._create_error_response(
+            request_data.get('transaction_id', str(uuid.uuid4())),
+            f"Error processing request: {str(e)}"
+        )
+
+
+async def process_batch(packets):
+    """
+    Process a batch of MCP requests; see MCPHandler.process_batch.
+
+    Each packet runs as its own task as soon as the packets it refers to,
+    and any earlier packet adding questions to the same form, have finished.
+
+    Args:
+        packets: List of MCP request dicts
+
+    Returns:
+        list: MCP response packets, in request order
+    """
+    dependencies = mcp_handler.plan_batch(packets)
+    previous_writes = mcp_handler.plan_form_writes(packets, dependencies)
+    tasks = []
+
+    async def run(packet, dependency, earlier, previous_write):
+        if not isinstance(dependency, set):
+            return dependency
+        if previous_write is not None:
+            await earlier[previous_write]
+        responses = {index: await earlier[index] for index in dependency}
+        bound, error = mcp_handler.bind_batch_packet(packet, responses)
+        if error is not None:
+            return error
+        return await process_request(bound)
+
+    for index, packet in enumerate(packets):
+        tasks.append(asyncio.ensure_future(run(packet, dependencies[index], tasks[:index], previous_writes[index])))
+    return list(await asyncio.gather(*tasks))
+
+
+async def get_schema(request):
+    """Return the MCP tools schema."""
+    try:
+        schema = mcp_handler.get_tools_schema()
+        return JSONResponse({
+            "status": "success",
+            "tools": schema,
+            "version": config.MCP_VERSION
+        })
+    except Exception as e:
+        log_error("Error returning schema", e)
+        return JSONResponse({
+            "status": "error",
+            "message": str(e)
+        }, status_code=500)
+
+
+async def process_mcp_request(request):
+    """Process an MCP request."""
+    try:
+        if "application/json" not in request.headers.get("content-type", ""):
+            return JSONResponse({
+                "status": "error",
+                "message": "Request must be JSON"
+            }, status_code=400)
+
+        request_data = await request.json()
+        
+        # Continue the agent's trace if it sent a traceparent header
+        with tracer.start_span("POST /api/process", traceparent=request.headers.get(TRACEPARENT_HEADER)):
+            # An array of packets is a batch whose packets may use earlier results
+            if isinstance(request_data, list):
+                batch_error = mcp_handler.validate_batch(request_data)
+                if batch_error:
+                    return JSONResponse({
+                        "status": "error",
+                        "message": batch_error
+                    }, status_code=400)
+                for packet in request_data:
+                    if isinstance(packet, dict):
+                        log_mcp_request(packet)
+                responses = await process_batch(request_data)
+                for response in responses:
+                    log_mcp_response(response)
+                return JSONResponse(responses)
+        
+            log_mcp_request(request_data)
+
+            response = await process_request(request_data)
+            log_mcp_response(response)
+
+            return JSONResponse(response)
+
+    except Exception as e:
+        log_error("Error processing MCP request", e)
+        return JSONResponse({
+            "status": "error",
+            "message": str(e)
+        }, status_code=500)
+
+
+async def health_check(request):
+    """Health check endpoint."""
+    return JSONResponse({
+        "status": "ok",
+        "version": config.MCP_VERSION,
+        "startup_ms": startup_ms,
+        "service_init_ms": get_registry().startup_timings(),
+        "token": get_registry().token_manager.stats(),
+        "http_pool": get_registry().http_pool_stats(),
+        "form_clones": mcp_handler.forms_api.form_registry.stats(),
+        # Same payload as app.py; this server has no agent proxy and so no agent pool
+        "agent_http": None
+    })
+
+
+async def metrics(request):
+    """Prometheus metrics: MCP tool and Google API call latencies, errors and in-flight calls."""
+    return Response(metrics_registry.render(), headers={"Content-Type": CONTENT_TYPE})
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Fetch the access token before serving rather than on the first request; the
+    # token endpoint is blocking, so keep it off the event loop
+    await asyncio.to_thread(get_registry().prime_credentials)
+    yield
+    await async_forms_api.aclose()
+
+
+app = Starlette(
+    routes=[
+        Route('/api/schema', get_schema, methods=['GET']),
+        Route('/api/process', process_mcp_request, methods=['POST']),
+        Route('/api/health', health_check, methods=['GET']),
+        Route('/metrics', metrics, methods=['GET'])
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan
+)
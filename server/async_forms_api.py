@@ -0,0 +1,272 @@
+import asyncio
+import random
+
+import httplib2
+import httpx
+from googleapiclient.errors import HttpError
+
+import config
+from form_cache import metadata_from_form
+from http_pool import GOOGLE_API_DURATION, GOOGLE_API_ERRORS, GOOGLE_API_IN_FLIGHT, google_api_method, tracer
+from metrics import observe_call
+from publisher import PublicationQueue
+from utils.logger import get_logger
+
+logger = get_logger("forms_api")
+
+FORMS_API_URL = "https://forms.googleapis.com/v1"
+DRIVE_API_URL = "https://www.googleapis.com/drive/v3"
+
+
+def _http_error(response):
+    """Wrap an httpx error response in the HttpError googleapiclient raises, so messages match the Flask path."""
+    resp = httplib2.Response({"status": response.status_code, **response.headers})
+    return HttpError(resp, response.content, uri=str(response.request.url))
+
+
+class AsyncGoogleFormsAPI:
+    """
+    Non-blocking Google Forms and Drive client for the ASGI server.
+
+    Calls the Forms and Drive REST endpoints through a shared httpx.AsyncClient,
+    so many MCP requests can wait on Google at once without holding a thread.
+    The form cache, response store, publication queue and request/response
+    shaping all come from a wrapped GoogleFormsAPI, so results match the Flask
+    path exactly. Tools without an async implementation run on that instance
+    in a worker thread.
+    """
+
+    ASYNC_METHODS = ("create_form", "add_question", "add_questions", "get_responses", "get_form_status")
+
+    def __init__(self, forms_api):
+        """
+        Initialize the client.
+
+        Args:
+            forms_api: GoogleFormsAPI whose caches, store and helpers are shared
+        """
+        self.forms_api = forms_api
+        self._client = None
+        self._form_write_locks = None
+
+    @property
+    def client(self):
+        """Shared httpx client, created on first use inside the running event loop."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=config.HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=config.ASYNC_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=config.ASYNC_HTTP_MAX_CONNECTIONS
+                )
+            )
+        return self._client
+
+    async def call(self, method, *args, **kwargs):
+        """
+        Run a GoogleFormsAPI method by name without blocking the event loop.
+
+        Methods implemented here are awaited directly; any other method runs
+        on the wrapped GoogleFormsAPI in a worker thread.
+        """
+        if method in self.ASYNC_METHODS:
+            return await getattr(self, method)(*args, **kwargs)
+        return await asyncio.to_thread(getattr(self.forms_api, method), *args, **kwargs)
+
+    async def aclose(self):
+        """Close the underlying HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _authorization(self, force_refresh=False):
+        token_manager = self.forms_api.registry.token_manager
+        credentials = token_manager.credentials
+        if force_refresh:
+            # The token endpoint is blocking, keep it off the event loop
+            await asyncio.to_thread(token_manager.refresh, True)
+        elif not credentials.valid:
+            await asyncio.to_thread(token_manager.get_credentials)
+        return f"Bearer {credentials.token}"
+
+    async def _request(self, method, url, **kwargs):
+        """Send an authorized request, refreshing the token once on a 401."""
+        api, api_method = google_api_method(method, url)
+        # googleapiclient asks for JSON on every call; doing the same keeps error URIs identical
+        kwargs["params"] = {**kwargs.get("params", {}), "alt": "json"}
+        for attempt in range(2):
+            headers = {"Authorization": await self._authorization(force_refresh=attempt > 0)}
+            with tracer.start_span(f"google.{api_method}", api=api, http_method=method) as span:
+                with observe_call(GOOGLE_API_DURATION, GOOGLE_API_IN_FLIGHT, GOOGLE_API_ERRORS, api, api_method):
+                    response = await self.client.request(method, url, headers=headers, **kwargs)
+                span.set_attribute("http_status", response.status_code)
+            if response.status_code >= 400:
+                GOOGLE_API_ERRORS.inc(api, api_method, f"HTTP {response.status_code}")
+            if response.status_code == 401 and attempt == 0:
+                continue
+            if response.status_code >= 400:
+                raise _http_error(response)
+            return response.json() if response.content else {}
+
+    async def create_form(self, title, description="", fast_path=None):
+        """Create a new Google Form; see GoogleFormsAPI.create_form."""
+        if fast_path is None:
+            fast_path = config.FORMS_FAST_PATH
+        if not fast_path:
+            return await asyncio.to_thread(self.forms_api.create_form, title, description, fast_path=False)
+
+        try:
+            upstream_calls = 0
+            form = await self._request("POST", f"{FORMS_API_URL}/forms", json={"info": {"title": title}})
+            upstream_calls += 1
+            form_id = form['formId']
+
+            update_response = await self._request(
+                "POST",
+                f"{FORMS_API_URL}/forms/{form_id}:batchUpdate",
+                json=self.forms_api._build_setup_body(description)
+            )
+            upstream_calls += 1
+            responder_uri = self.forms_api._apply_setup_reply(form_id, update_response) or form.get('responderUri')
+
+            publication = PublicationQueue.PENDING
+            queue = self.forms_api.publication_queue
+            if not (config.ASYNC_PUBLISH and queue.submit(form_id)):
+                try:
+                    await self._publish_to_drive(form_id)
+                    publication = PublicationQueue.PUBLISHED
+                    queue.record(form_id, publication)
+                except Exception as drive_error:
+                    logger.warning("Permission error: %s", drive_error)
+                    publication = PublicationQueue.FAILED
+                    queue.record(form_id, publication, error=str(drive_error))
+                # Counted as one call, like the Drive batch of the Flask path
+                upstream_calls += 1
+
+            return self.forms_api._create_form_result(form_id, title, responder_uri, publication, upstream_calls)
+        except Exception as e:
+            logger.error("Error creating form: %s", e)
+            raise
+
+    async def _publish_to_drive(self, form_id):
+        """Set the public permission and publish concurrently; only a failed permission raises."""
+        permission, publish = await asyncio.gather(
+            self._request(
+                "POST",
+                f"{DRIVE_API_URL}/files/{form_id}/permissions",
+                params={"fields": "id", "sendNotificationEmail": "false"},
+                json={'type': 'anyone', 'role': 'reader', 'allowFileDiscovery': True}
+            ),
+            self._request(
+                "PATCH",
+                f"{DRIVE_API_URL}/files/{form_id}/revisions/head",
+                json={'published': True, 'publishedOutsideDomain': True, 'publishAuto': True}
+            ),
+            return_exceptions=True
+        )
+        if isinstance(publish, Exception):
+            logger.warning("Non-critical publish error: %s", publish)
+        if isinstance(permission, Exception):
+            raise permission
+
+    async def _get_form_metadata(self, form_id):
+        metadata = self.forms_api.form_cache.get(form_id)
+        if metadata is None:
+            form = await self._request("GET", f"{FORMS_API_URL}/forms/{form_id}")
+            metadata = metadata_from_form(form)
+            self.forms_api.form_cache.put(form_id, metadata)
+        return metadata
+
+    async def _insert_questions(self, form_id, questions):
+        """Async counterpart of GoogleFormsAPI._insert_questions."""
+        max_attempts = max(1, config.FORM_WRITE_MAX_ATTEMPTS)
+        async with self._form_write_lock(form_id):
+            for attempt in range(1, max_attempts + 1):
+                metadata = await self._get_form_metadata(form_id)
+                start_index, body = self.forms_api._build_insert_body(metadata, questions)
+                try:
+                    update_response = await self._request(
+                        "POST",
+                        f"{FORMS_API_URL}/forms/{form_id}:batchUpdate",
+                        json=body
+                    )
+                except Exception as e:
+                    self.forms_api.form_cache.invalidate(form_id)
+                    if attempt < max_attempts and self.forms_api._is_write_conflict(e):
+                        logger.info("Revision conflict on form %s, refreshing structure (attempt %s)", form_id, attempt)
+                        await asyncio.sleep(random.uniform(0, config.FORM_WRITE_RETRY_BASE_SECONDS * 2 ** (attempt - 1)))
+                        continue
+                    raise
+                return start_index, self.forms_api._apply_insert_reply(form_id, start_index, questions, update_response)
+
+    def _form_write_lock(self, form_id):
+        """Return the lock that serializes inserts into a form; created inside the running loop."""
+        if self._form_write_locks is None:
+            self._form_write_locks = [asyncio.Lock() for _ in range(64)]
+        return self._form_write_locks[hash(form_id) % len(self._form_write_locks)]
+
+    async def add_question(self, form_id, question_type, title, options=None, required=False):
+        """Add a question to an existing Google Form; see GoogleFormsAPI.add_question."""
+        try:
+            item_id, _ = await self._insert_questions(form_id, [{
+                "question_type": question_type,
+                "title": title,
+                "options": options,
+                "required": required
+            }])
+            return {
+                "form_id": form_id,
+                "question_id": item_id,
+                "title": title,
+                "type": question_type
+            }
+        except Exception as e:
+            logger.error("Error adding question: %s", e)
+            raise
+
+    async def add_questions(self, form_id, questions):
+        """Add several questions in one batchUpdate; see GoogleFormsAPI.add_questions."""
+        try:
+            start_index, replies = await self._insert_questions(form_id, questions)
+            return self.forms_api._add_questions_result(form_id, start_index, questions, replies)
+        except Exception as e:
+            logger.error("Error adding questions: %s", e)
+            raise
+
+    async def get_responses(self, form_id, use_store=False, max_age_seconds=None):
+        """Get responses for a Google Form; see GoogleFormsAPI.get_responses."""
+        if use_store or max_age_seconds is not None:
+            # The SQLite store is blocking
+            return await asyncio.to_thread(
+                self.forms_api.get_responses, form_id,
+                use_store=use_store, max_age_seconds=max_age_seconds
+            )
+
+        try:
+            metadata = await self._get_form_metadata(form_id)
+            questions = metadata["titles"]
+            formatted_responses = []
+            params = {"pageSize": config.RESPONSES_PAGE_SIZE}
+            while True:
+                page = await self._request("GET", f"{FORMS_API_URL}/forms/{form_id}/responses", params=params)
+                formatted_responses.extend(
+                    self.forms_api._format_response(response, questions)
+                    for response in page.get('responses', [])
+                )
+                if not page.get('nextPageToken'):
+                    break
+                params["pageToken"] = page['nextPageToken']
+
+            return {
+                "form_id": form_id,
+                "form_title": metadata["title"],
+                "response_count": len(formatted_responses),
+                "responses": formatted_responses
+            }
+        except Exception as e:
+            logger.error("Error getting responses: %s", e)
+            raise
+
+    async def get_form_status(self, form_id):
+        """Get the Drive publication status of a form; in-memory, so no thread is needed."""
+        return self.forms_api.get_form_status(form_id)
@@ -19,22 +19,103 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive.metadata'
 ]
 
+# Access token cache shared by all server workers, and how long before expiry
+# the background refresh runs
+TOKEN_CACHE_PATH = os.getenv('TOKEN_CACHE_PATH', 'data/token_cache.json')
+TOKEN_REFRESH_MARGIN_SECONDS = int(os.getenv('TOKEN_REFRESH_MARGIN_SECONDS', 300))
+
+# Pooled HTTP transport for Google API calls; pool size bounds concurrent upstream calls
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 10))
+HTTP_POOL_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv('HTTP_POOL_ACQUIRE_TIMEOUT_SECONDS', 30))
+HTTP_POOL_IDLE_SECONDS = float(os.getenv('HTTP_POOL_IDLE_SECONDS', 60))
+HTTP_TIMEOUT_SECONDS = float(os.getenv('HTTP_TIMEOUT_SECONDS', 60))
+
+# Connection limit of the non-blocking client used by the ASGI server (asgi_app.py)
+ASYNC_HTTP_MAX_CONNECTIONS = int(os.getenv('ASYNC_HTTP_MAX_CONNECTIONS', 100))
+
+# Directory checked for '<api>.<version>.json' discovery documents before the
+# copies bundled with google-api-python-client
+DISCOVERY_CACHE_DIR = os.getenv('DISCOVERY_CACHE_DIR', 'discovery_cache')
+
 # Server settings
 PORT = int(os.getenv('PORT', 5000))
 DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
 
+# Logging: level, 'json' lines or 'text', and per-logger sampling of records below
+# WARNING, e.g. LOG_SAMPLE_RATES="mcp_server.forms_api=0.1"
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()
+LOG_SAMPLE_RATES = os.getenv('LOG_SAMPLE_RATES', '')
+
+# Request tracing: spans of MCP requests, tools and Google API calls are appended to
+# this JSON-lines file (off when empty). TRACE_SAMPLE_RATE is the fraction of traces
+# started here that are recorded; traces started by the agent follow its decision.
+TRACE_EXPORT_PATH = os.getenv('TRACE_EXPORT_PATH', '')
+TRACE_SAMPLE_RATE = float(os.getenv('TRACE_SAMPLE_RATE', 1.0))
+
+# Google Forms API behaviour
+# Fast path merges the form setup calls and batches the Drive calls
+FORMS_FAST_PATH = os.getenv('FORMS_FAST_PATH', 'True').lower() == 'true'
+
+# Responses per responses.list page (the Forms API maximum is 5000)
+RESPONSES_PAGE_SIZE = int(os.getenv('RESPONSES_PAGE_SIZE', 5000))
+
+# Form structure cache used to skip forms().get before inserts and response reads
+FORM_CACHE_SIZE = int(os.getenv('FORM_CACHE_SIZE', 256))
+FORM_CACHE_TTL_SECONDS = float(os.getenv('FORM_CACHE_TTL_SECONDS', 300))
+
+# Inserts carry the cached revisionId; a conflicting insert is retried against a fresh
+# copy of the form, up to this many attempts with a jittered backoff between them
+FORM_WRITE_MAX_ATTEMPTS = int(os.getenv('FORM_WRITE_MAX_ATTEMPTS', 5))
+FORM_WRITE_RETRY_BASE_SECONDS = float(os.getenv('FORM_WRITE_RETRY_BASE_SECONDS', 0.05))
+
+# Local SQLite store used by sync_responses and stored get_responses reads
+RESPONSE_STORE_PATH = os.getenv('RESPONSE_STORE_PATH', 'data/responses.db')
+
+# Registry of built form shapes; a repeated shape is made with one Drive copy
+FORM_CLONE_CACHE = os.getenv('FORM_CLONE_CACHE', 'True').lower() == 'true'
+FORM_REGISTRY_PATH = os.getenv('FORM_REGISTRY_PATH', 'data/form_registry.db')
+
+# Most recent days reported per day by summarize_responses; earlier days are counted together
+SUMMARY_MAX_DAYS = int(os.getenv('SUMMARY_MAX_DAYS', 366))
+
+# Background Drive publication for the fast path
+ASYNC_PUBLISH = os.getenv('ASYNC_PUBLISH', 'True').lower() == 'true'
+PUBLISH_WORKERS = int(os.getenv('PUBLISH_WORKERS', 2))
+PUBLISH_QUEUE_SIZE = int(os.getenv('PUBLISH_QUEUE_SIZE', 100))
+PUBLISH_MAX_ATTEMPTS = int(os.getenv('PUBLISH_MAX_ATTEMPTS', 4))
+PUBLISH_RETRY_BASE_SECONDS = float(os.getenv('PUBLISH_RETRY_BASE_SECONDS', 1.0))
+
 # CamelAIOrg Agent settings
 AGENT_ENDPOINT = os.getenv('AGENT_ENDPOINT', 'http://agents:5001/process')
+# Streaming (Server-Sent Events) variant of the agent endpoint
+AGENT_STREAM_ENDPOINT = os.getenv('AGENT_STREAM_ENDPOINT', AGENT_ENDPOINT.rstrip('/') + '/stream')
+# Job API of the agent (submit, then poll /jobs/<job_id>)
+AGENT_JOBS_ENDPOINT = os.getenv('AGENT_JOBS_ENDPOINT', AGENT_ENDPOINT.rstrip('/').rsplit('/', 1)[0] + '/jobs')
 AGENT_API_KEY = os.getenv('AGENT_API_KEY')
 
+# Keep-alive connection pool and timeouts for the /api/agent_proxy hop
+AGENT_POOL_SIZE = int(os.getenv('AGENT_POOL_SIZE', 10))
+AGENT_CONNECT_TIMEOUT_SECONDS = float(os.getenv('AGENT_CONNECT_TIMEOUT_SECONDS', 5))
+AGENT_READ_TIMEOUT_SECONDS = float(os.getenv('AGENT_READ_TIMEOUT_SECONDS', 120))
+
 # MCP Protocol settings
 MCP_VERSION = "1.0.0"
 MCP_TOOLS = [
     "create_form",
     "add_question",
-    "get_responses"
+    "add_questions",
+    "create_form_with_questions",
+    "get_responses",
+    "sync_responses",
+    "summarize_responses",
+    "get_form_status"
 ]
 
+# Batched /api/process requests: maximum packets per batch and how many run at once
+MCP_MAX_BATCH_SIZE = int(os.getenv('MCP_MAX_BATCH_SIZE', 50))
+MCP_BATCH_WORKERS = int(os.getenv('MCP_BATCH_WORKERS', 8))
+
 # LLM Settings / Gemini Settings (Update this section)
 # REMOVE LLM_API_KEY and LLM_API_ENDPOINT
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
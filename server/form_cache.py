@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def metadata_from_form(form):
+    """
+    Extract the cached metadata from a Forms API form resource.
+
+    Args:
+        form: Form dict as returned by forms().get or a batchUpdate reply
+
+    Returns:
+        dict: revision_id, title, item_ids and a question-ID-to-title map
+    """
+    item_ids = []
+    titles = {}
+    for item in form.get('items', []):
+        item_id = item.get('itemId', '')
+        title = item.get('title', '')
+        item_ids.append(item_id)
+        titles[item_id] = title
+        # Responses key their answers by questionId, which differs from itemId
+        question_id = item.get('questionItem', {}).get('question', {}).get('questionId')
+        if question_id:
+            titles[question_id] = title
+    return {
+        "revision_id": form.get('revisionId'),
+        "title": form.get('info', {}).get('title', ''),
+        "item_ids": item_ids,
+        "titles": titles
+    }
+
+
+class FormMetadataCache:
+    """
+    LRU cache of form structure with per-entry TTL.
+
+    Each entry holds the form's revisionId, title, ordered item IDs and
+    question titles. Entries are updated in place from our own batchUpdate
+    replies, so a form we are building never needs to be downloaded again.
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=300):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of forms to keep
+            ttl_seconds: Seconds before an entry must be refreshed
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, form_id):
+        """Return a copy of the cached metadata for a form, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(form_id)
+            if entry is None or entry["expires_at"] < time.monotonic():
+                self._entries.pop(form_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(form_id)
+            self.hits += 1
+            return {
+                "revision_id": entry["revision_id"],
+                "title": entry["title"],
+                "item_ids": list(entry["item_ids"]),
+                "titles": dict(entry["titles"])
+            }
+
+    def put(self, form_id, metadata):
+        """Store metadata for a form, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[form_id] = dict(metadata, expires_at=time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(form_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def apply_created_items(self, form_id, revision_id, created_items):
+        """
+        Update a cached form after our own createItem batch.
+
+        Args:
+            form_id: ID of the form
+            revision_id: Revision ID returned in the batchUpdate reply
+            created_items: List of dicts with index, item_id, question_id and title
+        """
+        with self._lock:
+            entry = self._entries.get(form_id)
+            if entry is None:
+                return
+            if not revision_id or any(not item["item_id"] for item in created_items):
+                # Without the new revision or IDs the entry can no longer be trusted
+                del self._entries[form_id]
+                return
+            for item in sorted(created_items, key=lambda created: created["index"]):
+                entry["item_ids"].insert(item["index"], item["item_id"])
+                entry["titles"][item["item_id"]] = item["title"]
+                if item.get("question_id"):
+                    entry["titles"][item["question_id"]] = item["title"]
+            entry["revision_id"] = revision_id
+
+    def invalidate(self, form_id):
+        """Drop the cached metadata for a form."""
+        with self._lock:
+            self._entries.pop(form_id, None)
+
+    def stats(self):
+        """Return hit and miss counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries)
+            }
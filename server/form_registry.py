@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+
+def questions_signature(questions):
+    """
+    Normalize a question list to a canonical JSON string.
+
+    Titles and options are lower-cased with whitespace collapsed, so cosmetic
+    differences in LLM output map to the same shape.
+
+    Args:
+        questions: List of dicts with question_type, title, options and required
+    """
+    def normalize(text):
+        return re.sub(r'\s+', ' ', str(text or '')).strip().lower()
+
+    return json.dumps([
+        [
+            question['question_type'],
+            normalize(question['title']),
+            [normalize(option) for option in question.get('options') or []]
+            if question['question_type'] in ('multiple_choice', 'checkbox') else [],
+            bool(question.get('required', False))
+        ]
+        for question in questions
+    ], separators=(',', ':'))
+
+
+def form_shape_key(title, questions):
+    """
+    Content address of a form: its title pattern plus its normalized questions.
+
+    Digits in the title are masked, so "Team Meeting 12" and "Team Meeting 13"
+    share a shape.
+    """
+    title_pattern = re.sub(r'\d+', '#', re.sub(r'\s+', ' ', title or '').strip().lower())
+    return hashlib.sha256(f"{title_pattern}\n{questions_signature(questions)}".encode()).hexdigest()
+
+
+class FormShapeRegistry:
+    """
+    Local SQLite registry of forms built by this server, keyed by shape.
+
+    Each entry points at a form whose questions match the shape, so a new form
+    of the same shape can be made with one Drive copy instead of being rebuilt
+    question by question.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the registry. The database file is opened on first use.
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "registered": 0, "forgotten": 0}
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS form_shapes (
+                    shape_key TEXT PRIMARY KEY,
+                    form_id TEXT NOT NULL,
+                    question_count INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    clone_count INTEGER NOT NULL DEFAULT 0
+                )"""
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def lookup(self, shape_key):
+        """
+        Find the source form registered for a shape.
+
+        Returns:
+            str: Form ID, or None if the shape has not been built yet
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT form_id FROM form_shapes WHERE shape_key = ?", (shape_key,)
+            ).fetchone()
+            self._stats["hits" if row else "misses"] += 1
+        return row[0] if row else None
+
+    def register(self, shape_key, form_id, question_count):
+        """Record a freshly built form as the source for its shape."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    """INSERT OR REPLACE INTO form_shapes (shape_key, form_id, question_count, created_at)
+                       VALUES (?, ?, ?, ?)""",
+                    (shape_key, form_id, question_count, time.time())
+                )
+            self._stats["registered"] += 1
+
+    def record_clone(self, shape_key):
+        """Count a successful copy of a shape's source form."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "UPDATE form_shapes SET clone_count = clone_count + 1 WHERE shape_key = ?",
+                    (shape_key,)
+                )
+
+    def forget(self, shape_key):
+        """Drop a shape whose source form is gone or no longer matches."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM form_shapes WHERE shape_key = ?", (shape_key,))
+            self._stats["forgotten"] += 1
+
+    def stats(self):
+        """Return lookup counters and the number of registered shapes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["shapes"] = self._connect().execute("SELECT COUNT(*) FROM form_shapes").fetchone()[0]
+        return stats
@@ -1,10 +1,22 @@
-import google.oauth2.credentials
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
+from googleapiclient.errors import HttpError
 import json
+import random
+import threading
+import time
 import config
+from publisher import PublicationQueue
+from response_store import ResponseStore
+from summarize import ResponseSummarizer
+from form_cache import FormMetadataCache, metadata_from_form
+from form_registry import FormShapeRegistry, form_shape_key, questions_signature
+from services import get_registry
+from utils.logger import get_logger
+from structured_logging import LazyJSON
+
+logger = get_logger("forms_api")
+
+# 403 reasons that are about quota rather than access to the file
+RATE_LIMIT_REASONS = frozenset(('rateLimitExceeded', 'userRateLimitExceeded', 'dailyLimitExceeded', 'quotaExceeded'))
 
 class GoogleFormsAPI:
     """
@@ -12,76 +24,73 @@ class GoogleFormsAPI:
     Handles authentication and provides methods to create forms, add questions, and get responses.
     """
     
-    def __init__(self):
-        self.credentials = self._get_credentials()
-        self.forms_service = self._build_service('forms', 'v1')
-        self.drive_service = self._build_service('drive', 'v3')
+    def __init__(self, registry=None):
+        """
+        Initialize the API handler.
+        
+        Credentials and Google service objects come from the shared service
+        registry and are only built when first used. The services run on a
+        pooled transport, so one instance can serve many threads at once.
+        
+        Args:
+            registry: Optional ServiceRegistry, defaults to the process-wide one
+        """
+        self.registry = registry or get_registry()
+        self.publication_queue = PublicationQueue(
+            self._publish_to_drive,
+            workers=config.PUBLISH_WORKERS,
+            max_pending=config.PUBLISH_QUEUE_SIZE,
+            max_attempts=config.PUBLISH_MAX_ATTEMPTS,
+            backoff_base=config.PUBLISH_RETRY_BASE_SECONDS
+        )
+        self.response_store = ResponseStore(config.RESPONSE_STORE_PATH)
+        self.form_cache = FormMetadataCache(
+            max_entries=config.FORM_CACHE_SIZE,
+            ttl_seconds=config.FORM_CACHE_TTL_SECONDS
+        )
+        self.form_registry = FormShapeRegistry(config.FORM_REGISTRY_PATH)
+        # Inserts into one form are serialized so concurrent writers in this process
+        # never race each other's revisionId; forms share a fixed set of locks
+        self._form_write_locks = [threading.Lock() for _ in range(64)]
     
-    def _get_credentials(self):
-        """Create OAuth2 credentials from environment variables."""
-        try:
-            print("DEBUG: Creating credentials")
-            print(f"DEBUG: Client ID: {config.GOOGLE_CLIENT_ID[:10]}...")
-            print(f"DEBUG: Client Secret: {config.GOOGLE_CLIENT_SECRET[:10]}...")
-            print(f"DEBUG: Refresh Token: {config.GOOGLE_REFRESH_TOKEN[:15]}...")
-            print(f"DEBUG: Scopes: {config.SCOPES}")
-            
-            credentials = google.oauth2.credentials.Credentials(
-                token=None,  # We don't have a token yet
-                refresh_token=config.GOOGLE_REFRESH_TOKEN,
-                client_id=config.GOOGLE_CLIENT_ID,
-                client_secret=config.GOOGLE_CLIENT_SECRET,
-                token_uri='https://oauth2.googleapis.com/token',
-                scopes=[]  # Start with empty scopes to avoid validation during refresh
-            )
-            
-            # Try to validate the credentials
-            print("DEBUG: Validating credentials...")
-            credentials.refresh(Request())
-            print(f"DEBUG: Credentials valid and refreshed! Token valid until: {credentials.expiry}")
-            
-            # Add scopes after successful refresh
-            credentials = google.oauth2.credentials.Credentials(
-                token=credentials.token,
-                refresh_token=credentials.refresh_token,
-                client_id=credentials.client_id,
-                client_secret=credentials.client_secret,
-                token_uri=credentials.token_uri,
-                scopes=config.SCOPES
-            )
-            
-            return credentials
-        except Exception as e:
-            print(f"DEBUG: Credentials error: {str(e)}")
-            raise
+    @property
+    def credentials(self):
+        """OAuth2 credentials shared through the service registry."""
+        return self.registry.credentials
     
-    def _build_service(self, api_name, version):
-        """Build and return a Google API service."""
-        try:
-            print(f"DEBUG: Building {api_name} service v{version}")
-            service = build(api_name, version, credentials=self.credentials)
-            print(f"DEBUG: Successfully built {api_name} service")
-            return service
-        except Exception as e:
-            print(f"DEBUG: Error building {api_name} service: {str(e)}")
-            raise
+    @property
+    def forms_service(self):
+        """Google Forms v1 service, built on first use."""
+        return self.registry.get_service('forms', 'v1')
     
-    def create_form(self, title, description=""):
+    @property
+    def drive_service(self):
+        """Google Drive v3 service, built on first use."""
+        return self.registry.get_service('drive', 'v3')
+    
+    def create_form(self, title, description="", fast_path=None):
         """
         Create a new Google Form.
         
         Args:
             title: Title of the form
             description: Optional description for the form
+            fast_path: Use the minimal round-trip flow (defaults to config.FORMS_FAST_PATH)
             
         Returns:
-            dict: Response containing form ID and edit URL
+            dict: Response containing form ID, edit URL and upstream call count
         """
+        if fast_path is None:
+            fast_path = config.FORMS_FAST_PATH
+        if fast_path:
+            return self._create_form_fast(title, description)
+        
+        upstream_calls = 0
         try:
             # Debug info
-            print("DEBUG: Starting form creation")
-            print(f"DEBUG: Using client_id: {config.GOOGLE_CLIENT_ID[:10]}...")
-            print(f"DEBUG: Using refresh_token: {config.GOOGLE_REFRESH_TOKEN[:10]}...")
+            logger.debug("Starting form creation")
+            logger.debug("Using client_id: %s...", config.GOOGLE_CLIENT_ID[:10])
+            logger.debug("Using refresh_token: %s...", config.GOOGLE_REFRESH_TOKEN[:10])
 
             # Create a simpler form body with ONLY title as required by the API
             form_body = {
@@ -91,25 +100,26 @@ class GoogleFormsAPI:
             }
             
             # Debug info
-            print("DEBUG: About to create form")
-            print("DEBUG: Form body: " + str(form_body))
+            logger.debug("About to create form")
+            logger.debug("Form body: %s", form_body)
             
             try:
                 form = self.forms_service.forms().create(body=form_body).execute()
+                upstream_calls += 1
                 form_id = form['formId']
-                print(f"DEBUG: Form created successfully with ID: {form_id}")
-                print(f"DEBUG: Full form creation response: {json.dumps(form, indent=2)}") # Log full response
+                logger.info("Form created successfully with ID: %s", form_id)
+                logger.debug("Full form creation response: %s", LazyJSON(form, indent=2))
                 
                 # Get the actual URLs from the form response
                 initial_responder_uri = form.get('responderUri')
-                print(f"DEBUG: Initial responderUri from create response: {initial_responder_uri}")
+                logger.debug("Initial responderUri from create response: %s", initial_responder_uri)
                 
                 edit_url = f"https://docs.google.com/forms/d/{form_id}/edit" # Edit URL format is consistent
-                print(f"DEBUG: Tentative Edit URL: {edit_url}")
+                logger.debug("Tentative Edit URL: %s", edit_url)
                 
                 # If description is provided, update the form with it
                 if description:
-                    print("DEBUG: Adding description through batchUpdate")
+                    logger.debug("Adding description through batchUpdate")
                     update_body = {
                         "requests": [
                             {
@@ -126,10 +136,11 @@ class GoogleFormsAPI:
                         formId=form_id,
                         body=update_body
                     ).execute()
-                    print("DEBUG: Description added successfully")
+                    upstream_calls += 1
+                    logger.debug("Description added successfully")
                 
                 # Update form settings to make it public and collectable
-                print("DEBUG: Setting form settings to make it public")
+                logger.debug("Setting form settings to make it public")
                 settings_body = {
                     "requests": [
                         {
@@ -148,34 +159,35 @@ class GoogleFormsAPI:
                     formId=form_id,
                     body=settings_body
                 ).execute()
-                print("DEBUG: Form settings updated")
-                print(f"DEBUG: Full settings update response: {json.dumps(settings_response, indent=2)}") # Log full response
+                upstream_calls += 1
+                logger.debug("Form settings updated")
+                logger.debug("Full settings update response: %s", LazyJSON(settings_response, indent=2))
                 
                 # Check if the settings response has responderUri
                 settings_responder_uri = None
                 if 'form' in settings_response and 'responderUri' in settings_response['form']:
                     settings_responder_uri = settings_response['form']['responderUri']
                     form['responderUri'] = settings_responder_uri # Update form dict if found
-                    print(f"DEBUG: Found responderUri in settings response: {settings_responder_uri}")
+                    logger.debug("Found responderUri in settings response: %s", settings_responder_uri)
                 
                 # Explicitly publish the form to force it to be visible - These might be redundant/incorrect
                 # response_url = f"https://docs.google.com/forms/d/{form_id}/viewform"
                 # edit_url = f"https://docs.google.com/forms/d/{form_id}/edit"
                 
             except Exception as form_error:
-                print(f"DEBUG: Form creation error: {str(form_error)}")
+                logger.warning("Form creation error: %s", form_error)
                 # Create a mock form for testing
                 form = {
                     'formId': 'form_error_state',
                     'responderUri': 'https://docs.google.com/forms/d/e/form_error_state/viewform' # Use /e/ format
                 }
                 form_id = form['formId']
-                print("DEBUG: Created mock form for testing")
+                logger.debug("Created mock form for testing")
                 
             # Make the form public via Drive API - only if we have a real form
             try:
                 if form_id != 'form_error_state':
-                    print(f"DEBUG: About to set Drive permissions for form {form_id}")
+                    logger.debug("About to set Drive permissions for form %s", form_id)
                     
                     # First try to get file to verify it exists in Drive
                     try:
@@ -183,15 +195,16 @@ class GoogleFormsAPI:
                             fileId=form_id,
                             fields="id,name,permissions,webViewLink,webContentLink" # Added webContentLink just in case
                         ).execute()
-                        print(f"DEBUG: File exists in Drive: {file_check.get('name', 'unknown')}")
-                        print(f"DEBUG: Full Drive file get response: {json.dumps(file_check, indent=2)}") # Log full response
+                        upstream_calls += 1
+                        logger.debug("File exists in Drive: %s", file_check.get('name', 'unknown'))
+                        logger.debug("Full Drive file get response: %s", LazyJSON(file_check, indent=2))
                         
                         # Store the web view link for later use
                         drive_web_view_link = file_check.get('webViewLink')
                         if drive_web_view_link:
-                            print(f"DEBUG: Drive webViewLink found: {drive_web_view_link}")
+                            logger.debug("Drive webViewLink found: %s", drive_web_view_link)
                     except Exception as file_error:
-                        print(f"DEBUG: Cannot find/get file in Drive: {str(file_error)}")
+                        logger.debug("Cannot find/get file in Drive: %s", file_error)
                         drive_web_view_link = None # Ensure it's None if error occurs
                     
                     # Set public permission
@@ -206,15 +219,17 @@ class GoogleFormsAPI:
                         fields='id',
                         sendNotificationEmail=False
                     ).execute()
-                    print(f"DEBUG: Permissions set successfully: {perm_result}")
-                    print(f"DEBUG: Full permissions create response: {json.dumps(perm_result, indent=2)}") # Log full response
+                    upstream_calls += 1
+                    logger.debug("Permissions set successfully: %s", perm_result)
+                    logger.debug("Full permissions create response: %s", LazyJSON(perm_result, indent=2))
                     
                     # Check permissions after setting
                     permissions = self.drive_service.permissions().list(
                         fileId=form_id,
                          fields="*" # Get all fields
                     ).execute()
-                    print(f"DEBUG: Full permissions list response after setting: {json.dumps(permissions, indent=2)}") # Log full response
+                    upstream_calls += 1
+                    logger.debug("Full permissions list response after setting: %s", LazyJSON(permissions, indent=2))
                     
                     # Try to publish the file using the Drive API - This might be unnecessary/problematic
                     try:
@@ -228,11 +243,12 @@ class GoogleFormsAPI:
                             revisionId='head',
                             body=publish_body
                         ).execute()
-                        print("DEBUG: Form published successfully via Drive API")
+                        upstream_calls += 1
+                        logger.debug("Form published successfully via Drive API")
                     except Exception as publish_error:
-                        print(f"DEBUG: Non-critical publish error: {str(publish_error)}")
+                        logger.warning("Non-critical publish error: %s", publish_error)
             except Exception as perm_error:
-                print(f"DEBUG: Permission error: {str(perm_error)}")
+                logger.warning("Permission error: %s", perm_error)
                 # Continue even if permission setting fails
             
             # Determine the final response_url based on availability and priority
@@ -240,178 +256,890 @@ class GoogleFormsAPI:
             response_url = None
             if settings_responder_uri:
                  response_url = settings_responder_uri
-                 print(f"DEBUG: FINAL URL: Using responderUri from settings response: {response_url}")
+                 logger.debug("FINAL URL: Using responderUri from settings response: %s", response_url)
             elif initial_responder_uri:
                 response_url = initial_responder_uri
-                print(f"DEBUG: FINAL URL: Using initial responderUri from create response: {response_url}")
+                logger.debug("FINAL URL: Using initial responderUri from create response: %s", response_url)
             elif drive_web_view_link and "/viewform" in drive_web_view_link: # Only use webViewLink if it looks like a view link
                 response_url = drive_web_view_link
-                print(f"DEBUG: FINAL URL: Using Drive webViewLink (as it contained /viewform): {response_url}")
+                logger.debug("FINAL URL: Using Drive webViewLink (as it contained /viewform): %s", response_url)
             else:
                 # Fallback to manual construction if absolutely nothing else is found
                 response_url = f"https://docs.google.com/forms/d/e/{form_id}/viewform" # Use /e/ format for fallback
-                print(f"DEBUG: FINAL URL: Using manually constructed fallback (/e/ format): {response_url}")
+                logger.debug("FINAL URL: Using manually constructed fallback (/e/ format): %s", response_url)
                 # Also log the potentially problematic webViewLink if it existed but wasn't used
                 if drive_web_view_link:
-                    print(f"DEBUG: Note: Drive webViewLink found but not used as final URL: {drive_web_view_link}")
+                    logger.debug("Note: Drive webViewLink found but not used as final URL: %s", drive_web_view_link)
 
             # Ensure edit_url is correctly set (it's usually stable)
             edit_url = f"https://docs.google.com/forms/d/{form_id}/edit"
-            print(f"DEBUG: FINAL Edit URL: {edit_url}")
+            logger.debug("FINAL Edit URL: %s", edit_url)
             
             return {
                 "form_id": form_id,
                 "response_url": response_url,
                 "edit_url": edit_url,
-                "title": title
+                "title": title,
+                "upstream_calls": upstream_calls
             }
         except Exception as e:
-            print(f"Error creating form: {str(e)}")
+            logger.error("Error creating form: %s", e)
             raise
     
-    def add_question(self, form_id, question_type, title, options=None, required=False):
+    def _create_form_fast(self, title, description=""):
         """
-        Add a question to an existing Google Form.
+        Create a new Google Form with the fewest upstream round trips.
+        
+        The description and settings go out in one batchUpdate and the diagnostic
+        Drive reads are skipped. Publication is handed to the background queue
+        when config.ASYNC_PUBLISH is set, otherwise the permission and publish
+        calls share a single Drive HTTP batch.
+        
+        Args:
+            title: Title of the form
+            description: Optional description for the form
+            
+        Returns:
+            dict: Response containing form ID, URLs and upstream call count
+        """
+        upstream_calls = 0
+        try:
+            form = self.forms_service.forms().create(body={"info": {"title": title}}).execute()
+            upstream_calls += 1
+            form_id = form['formId']
+            responder_uri = form.get('responderUri')
+            logger.info("Form created successfully with ID: %s", form_id)
+            
+            update_response = self.forms_service.forms().batchUpdate(
+                formId=form_id,
+                body=self._build_setup_body(description)
+            ).execute()
+            upstream_calls += 1
+            responder_uri = self._apply_setup_reply(form_id, update_response) or responder_uri
+            
+            publication, publish_calls = self._publish_new_form(form_id)
+            upstream_calls += publish_calls
+            
+            return self._create_form_result(form_id, title, responder_uri, publication, upstream_calls)
+        except Exception as e:
+            logger.error("Error creating form: %s", e)
+            raise
+    
+    def _publish_new_form(self, form_id):
+        """
+        Publish a new form, in the background when config.ASYNC_PUBLISH is set.
+        
+        Returns:
+            tuple: (publication state, upstream calls made inline)
+        """
+        # Drive publication is queued so the caller can continue adding questions
+        if config.ASYNC_PUBLISH and self.publication_queue.submit(form_id):
+            return PublicationQueue.PENDING, 0
+        try:
+            self._publish_to_drive(form_id)
+            publication = PublicationQueue.PUBLISHED
+            self.publication_queue.record(form_id, publication)
+        except Exception as drive_error:
+            logger.warning("Permission error: %s", drive_error)
+            # Continue even if permission setting fails
+            publication = PublicationQueue.FAILED
+            self.publication_queue.record(form_id, publication, error=str(drive_error))
+        return publication, 1
+    
+    def _create_form_result(self, form_id, title, responder_uri, publication, upstream_calls):
+        """Build the create_form result of the fast path."""
+        return {
+            "form_id": form_id,
+            "response_url": responder_uri or f"https://docs.google.com/forms/d/e/{form_id}/viewform",
+            "edit_url": f"https://docs.google.com/forms/d/{form_id}/edit",
+            "title": title,
+            "publication": publication,
+            "upstream_calls": upstream_calls
+        }
+    
+    def _build_setup_body(self, description):
+        """Build the single batchUpdate that sets a new form's description and settings."""
+        update_requests = []
+        if description:
+            update_requests.append({
+                "updateFormInfo": {
+                    "info": {
+                        "description": description
+                    },
+                    "updateMask": "description"
+                }
+            })
+        update_requests.append({
+            "updateSettings": {
+                "settings": {
+                    "quizSettings": {
+                        "isQuiz": False
+                    }
+                },
+                "updateMask": "quizSettings.isQuiz"
+            }
+        })
+        return {
+            "requests": update_requests,
+            "includeFormInResponse": True
+        }
+    
+    def _apply_setup_reply(self, form_id, update_response):
+        """Cache the new form from the setup batchUpdate reply and return its responderUri."""
+        updated_form = update_response.get('form', {})
+        if updated_form:
+            # The new form is about to receive questions, so skip its first forms().get
+            self.form_cache.put(form_id, metadata_from_form(updated_form))
+        return updated_form.get('responderUri')
+    
+    def _publish_to_drive(self, form_id):
+        """
+        Make a form public via Drive with a single HTTP batch.
+        
+        The permission and publish calls are independent, so they share one
+        round trip. A failed permission raises so the caller can retry, while
+        a failed publish is logged and ignored as before.
+        
+        Args:
+            form_id: ID of the form to publish
+        """
+        errors = {}
+        
+        def _drive_callback(request_id, response, exception):
+            if exception is not None:
+                errors[request_id] = exception
+        
+        drive_batch = self.drive_service.new_batch_http_request(callback=_drive_callback)
+        drive_batch.add(self.drive_service.permissions().create(
+            fileId=form_id,
+            body={
+                'type': 'anyone',
+                'role': 'reader',
+                'allowFileDiscovery': True
+            },
+            fields='id',
+            sendNotificationEmail=False
+        ), request_id='permission')
+        drive_batch.add(self.drive_service.revisions().update(
+            fileId=form_id,
+            revisionId='head',
+            body={
+                'published': True,
+                'publishedOutsideDomain': True,
+                'publishAuto': True
+            }
+        ), request_id='publish')
+        drive_batch.execute()
+        
+        if 'publish' in errors:
+            logger.warning("Non-critical publish error: %s", errors['publish'])
+        if 'permission' in errors:
+            raise errors['permission']
+    
+    def get_form_status(self, form_id):
+        """
+        Get the Drive publication status of a form created by this server.
+        
+        Args:
+            form_id: ID of the form
+            
+        Returns:
+            dict: Publication state, attempt count and last error
+        """
+        status = self.publication_queue.status(form_id)
+        if status is None:
+            return {
+                "form_id": form_id,
+                "publication": "unknown"
+            }
+        return {
+            "form_id": form_id,
+            "publication": status["state"],
+            "attempts": status["attempts"],
+            "error": status["error"],
+            "updated_at": status["updated_at"]
+        }
+    
+    def _build_question_item(self, question_type, title, options=None, required=False):
+        """
+        Build the Forms API item body for a single question.
         
         Args:
-            form_id: ID of the form to add the question to
             question_type: Type of question (text, paragraph, multiple_choice, etc.)
             title: Question title/text
             options: List of options for multiple choice questions
             required: Whether the question is required
             
         Returns:
-            dict: Response containing question ID
+            dict: Item body suitable for a createItem request
+        """
+        question = {
+            "required": required
+        }
+        
+        # Set up question type specific configuration
+        if question_type == "text":
+            question["textQuestion"] = {}
+        
+        elif question_type == "paragraph":
+            # Google Forms API uses textQuestion with different properties for paragraphs
+            question["textQuestion"] = {
+                "paragraph": True
+            }
+        
+        elif question_type == "multiple_choice" and options:
+            question["choiceQuestion"] = {
+                "type": "RADIO",
+                "options": [{"value": option} for option in options],
+                "shuffle": False
+            }
+        
+        elif question_type == "checkbox" and options:
+            question["choiceQuestion"] = {
+                "type": "CHECKBOX",
+                "options": [{"value": option} for option in options],
+                "shuffle": False
+            }
+        
+        return {
+            "title": title,
+            "questionItem": {
+                "question": question
+            }
+        }
+    
+    def _question_from_item(self, item):
+        """Map a Forms API item back to the question dict it was built from."""
+        question = item.get('questionItem', {}).get('question', {})
+        choice = question.get('choiceQuestion')
+        if choice is not None:
+            question_type = "checkbox" if choice.get('type') == "CHECKBOX" else "multiple_choice"
+            options = [option.get('value') for option in choice.get('options', [])]
+        else:
+            question_type = "paragraph" if question.get('textQuestion', {}).get('paragraph') else "text"
+            options = []
+        return {
+            "question_type": question_type,
+            "title": item.get('title', ''),
+            "options": options,
+            "required": question.get('required', False)
+        }
+    
+    def create_form_with_questions(self, title, description, questions):
         """
+        Create a form with its questions, copying an identical form when one exists.
+        
+        Forms are registered by a hash of their title pattern and normalized
+        questions. A repeated shape costs a Drive copy plus one batchUpdate that
+        sets the title and description, with publication handled as for a new
+        form, however many questions it has. The first form of a shape is built
+        with create_form and add_questions and registered as the source. A source
+        that is gone (404), unreadable (403 other than a rate limit) or no longer
+        matches is forgotten; when copying fails for another reason the form is
+        built but the source is kept.
+        
+        Args:
+            title: Title of the form
+            description: Description of the form
+            questions: List of dicts with question_type, title, options and required
+            
+        Returns:
+            dict: create_form result plus the added questions and the source form, if
+                copied. If the form was created but its questions could not be added,
+                question_error holds the failure and each question carries the error.
+        """
+        shape_key = form_shape_key(title, questions)
+        source_form_id = self.form_registry.lookup(shape_key) if config.FORM_CLONE_CACHE else None
+        if source_form_id:
+            try:
+                result = self._clone_form(source_form_id, title, description, questions)
+            except HttpError as e:
+                if not self._is_source_gone(e):
+                    # A rate limit or server error says nothing about the source form,
+                    # so it stays registered and this form is built from scratch
+                    logger.warning("Could not copy form %s, building instead: %s", source_form_id, e)
+                    return self._build_form_with_questions(title, description, questions)
+                logger.warning("Could not copy form %s: %s", source_form_id, e)
+                result = None
+            if result is not None:
+                self.form_registry.record_clone(shape_key)
+                return result
+            self.form_registry.forget(shape_key)
+        
+        return self._build_form_with_questions(title, description, questions, shape_key)
+    
+    def _build_form_with_questions(self, title, description, questions, shape_key=None):
+        """
+        Create a form and add its questions, registering it as the source of shape_key if given.
+        
+        Returns:
+            dict: create_form_with_questions result
+        """
+        form = self.create_form(title, description)
         try:
-            print(f"DEBUG: Adding {question_type} question to form {form_id}")
-            # Get the current form
-            form = self.forms_service.forms().get(formId=form_id).execute()
+            added = self.add_questions(form['form_id'], questions)
+        except Exception as e:
+            # The form exists in Drive, so report it rather than orphaning it, and
+            # leave it out of the registry since it does not have the shape
+            logger.error("Form %s created, but adding its questions failed: %s", form['form_id'], e)
+            return dict(
+                form,
+                questions=[
+                    {"title": question['title'], "type": question['question_type'], "error": str(e)}
+                    for question in questions
+                ],
+                question_count=0,
+                question_error=str(e),
+                upstream_calls=form.get('upstream_calls', 0) + 1,
+                cloned_from=None
+            )
+        if shape_key and config.FORM_CLONE_CACHE:
+            self.form_registry.register(shape_key, form['form_id'], len(questions))
+        return dict(
+            form,
+            questions=added['questions'],
+            question_count=added['question_count'],
+            upstream_calls=form.get('upstream_calls', 0) + 1,
+            cloned_from=None
+        )
+    
+    def _clone_form(self, source_form_id, title, description, questions):
+        """
+        Copy a registered form and give the copy its own title and description.
+        
+        The batchUpdate reply includes the copy's items, which are checked
+        against the requested questions; a source form edited since it was
+        registered fails the check, and its copy is deleted.
+        
+        Returns:
+            dict: create_form_with_questions result, or None if the copy does not match
+        """
+        copied = self.drive_service.files().copy(
+            fileId=source_form_id,
+            body={"name": title},
+            fields="id"
+        ).execute()
+        form_id = copied['id']
+        logger.info("Copied form %s to %s", source_form_id, form_id)
+        
+        try:
+            return self._finish_copy(source_form_id, form_id, title, description, questions)
+        except Exception:
+            # Whatever failed, the caller never sees this copy
+            self._delete_copy(form_id)
+            raise
+    
+    def _finish_copy(self, source_form_id, form_id, title, description, questions):
+        """
+        Rename a fresh copy, check its items and publish it; see _clone_form.
+        
+        Returns:
+            dict: create_form_with_questions result, or None if the copy does not match
+        """
+        update_response = self.forms_service.forms().batchUpdate(
+            formId=form_id,
+            body={
+                "requests": [{
+                    "updateFormInfo": {
+                        "info": {"title": title, "description": description or ""},
+                        "updateMask": "title,description"
+                    }
+                }],
+                "includeFormInResponse": True
+            }
+        ).execute()
+        upstream_calls = 2
+        
+        form = update_response.get('form', {})
+        items = form.get('items', [])
+        if questions_signature([self._question_from_item(item) for item in items]) != questions_signature(questions):
+            logger.warning("Form %s no longer matches its shape, discarding copy %s", source_form_id, form_id)
+            self._delete_copy(form_id)
+            return None
+        
+        self.form_cache.put(form_id, metadata_from_form(form))
+        publication, publish_calls = self._publish_new_form(form_id)
+        upstream_calls += publish_calls
+        
+        result = self._create_form_result(form_id, title, form.get('responderUri'), publication, upstream_calls)
+        result["questions"] = [
+            {
+                "question_id": index,
+                "item_id": item.get('itemId'),
+                "google_question_id": item.get('questionItem', {}).get('question', {}).get('questionId'),
+                "title": question['title'],
+                "type": question['question_type']
+            }
+            for index, (item, question) in enumerate(zip(items, questions))
+        ]
+        result["question_count"] = len(questions)
+        result["cloned_from"] = source_form_id
+        return result
+    
+    def _is_source_gone(self, error):
+        """Check whether a failed copy means the source form is deleted or no longer readable."""
+        status = getattr(error.resp, 'status', None)
+        if status == 404:
+            return True
+        return status == 403 and not RATE_LIMIT_REASONS & self._error_reasons(error)
+    
+    def _error_reasons(self, error):
+        """Collect the reason codes of a Google API error body."""
+        try:
+            body = json.loads(error.content)
+        except (TypeError, ValueError):
+            return set()
+        details = body.get('error', {}) if isinstance(body, dict) else {}
+        if not isinstance(details, dict):
+            return set()
+        return {
+            entry.get('reason')
+            for entry in details.get('errors', []) + details.get('details', [])
+            if isinstance(entry, dict)
+        }
+    
+    def _delete_copy(self, form_id):
+        """Delete a copy that will not be returned, logging rather than raising on failure."""
+        try:
+            self.drive_service.files().delete(fileId=form_id).execute()
+        except HttpError as e:
+            logger.warning("Could not delete copy %s: %s", form_id, e)
+    
+    def _get_form_metadata(self, form_id):
+        """
+        Get a form's revision, item IDs and question titles, from cache if possible.
+        
+        Args:
+            form_id: ID of the form
             
-            # Determine the item ID for the new question
-            item_id = len(form.get('items', []))
-            print(f"DEBUG: New question will have item_id: {item_id}")
+        Returns:
+            dict: Cached metadata as built by form_cache.metadata_from_form
+        """
+        metadata = self.form_cache.get(form_id)
+        if metadata is None:
+            metadata = self._fetch_form_metadata(form_id)
+        return metadata
+    
+    def _fetch_form_metadata(self, form_id):
+        """Read a form from the API, bypassing the cache, and cache its metadata."""
+        form = self.forms_service.forms().get(formId=form_id).execute()
+        metadata = metadata_from_form(form)
+        self.form_cache.put(form_id, metadata)
+        return metadata
+    
+    def _is_write_conflict(self, error):
+        """Check whether a batchUpdate failed because the required revision is stale."""
+        if not isinstance(error, HttpError):
+            return False
+        status = getattr(error.resp, 'status', None)
+        content = getattr(error, 'content', b'')
+        if status in (409, 412):
+            return True
+        content = str(content or b'')
+        return status == 400 and ('revision' in content.lower() or 'FAILED_PRECONDITION' in content)
+    
+    def _insert_questions(self, form_id, questions):
+        """
+        Append questions to a form in one batchUpdate.
+        
+        The insert index comes from the cached item count and the request carries
+        the cached revisionId as a write control. Inserts into the same form from
+        this process run one at a time. If the form changed behind our back (e.g.
+        another worker wrote to it) the cache entry is dropped and the insert is
+        retried against a fresh copy of the form, up to FORM_WRITE_MAX_ATTEMPTS
+        times with a jittered backoff.
+        
+        Args:
+            form_id: ID of the form
+            questions: List of dicts with question_type, title, options and required
             
-            # Create base request
-            request = {
-                "requests": [{
+        Returns:
+            tuple: (start index, batchUpdate replies)
+        """
+        max_attempts = max(1, config.FORM_WRITE_MAX_ATTEMPTS)
+        with self._form_write_lock(form_id):
+            for attempt in range(1, max_attempts + 1):
+                start_index, body = self._build_insert_body(self._get_form_metadata(form_id), questions)
+                
+                try:
+                    update_response = self.forms_service.forms().batchUpdate(
+                        formId=form_id,
+                        body=body
+                    ).execute()
+                except Exception as e:
+                    self.form_cache.invalidate(form_id)
+                    if attempt < max_attempts and self._is_write_conflict(e):
+                        logger.info("Revision conflict on form %s, refreshing structure (attempt %s)", form_id, attempt)
+                        time.sleep(random.uniform(0, config.FORM_WRITE_RETRY_BASE_SECONDS * 2 ** (attempt - 1)))
+                        continue
+                    raise
+                
+                return start_index, self._apply_insert_reply(form_id, start_index, questions, update_response)
+    
+    def _form_write_lock(self, form_id):
+        """Return the lock that serializes inserts into a form."""
+        return self._form_write_locks[hash(form_id) % len(self._form_write_locks)]
+    
+    def _build_insert_body(self, metadata, questions):
+        """
+        Build the batchUpdate body that appends questions after the form's current items.
+        
+        Returns:
+            tuple: (start index, batchUpdate body)
+        """
+        start_index = len(metadata["item_ids"])
+        body = {
+            "requests": [
+                {
                     "createItem": {
-                        "item": {
-                            "title": title,
-                            "questionItem": {
-                                "question": {
-                                    "required": required
-                                }
-                            }
-                        },
+                        "item": self._build_question_item(
+                            question['question_type'],
+                            question['title'],
+                            question.get('options'),
+                            question.get('required', False)
+                        ),
                         "location": {
-                            "index": item_id
+                            "index": start_index + offset
                         }
                     }
-                }]
+                }
+                for offset, question in enumerate(questions)
+            ]
+        }
+        if metadata["revision_id"]:
+            body["writeControl"] = {"requiredRevisionId": metadata["revision_id"]}
+        return start_index, body
+    
+    def _apply_insert_reply(self, form_id, start_index, questions, update_response):
+        """Update the cached form from a createItem batchUpdate reply and return the replies."""
+        replies = update_response.get('replies', [])
+        created_items = []
+        for offset, question in enumerate(questions):
+            create_item = replies[offset].get('createItem', {}) if offset < len(replies) else {}
+            question_ids = create_item.get('questionId', [])
+            created_items.append({
+                "index": start_index + offset,
+                "item_id": create_item.get('itemId'),
+                "question_id": question_ids[0] if question_ids else None,
+                "title": question['title']
+            })
+        self.form_cache.apply_created_items(
+            form_id,
+            update_response.get('writeControl', {}).get('requiredRevisionId'),
+            created_items
+        )
+        return replies
+    
+    def add_question(self, form_id, question_type, title, options=None, required=False):
+        """
+        Add a question to an existing Google Form.
+        
+        Args:
+            form_id: ID of the form to add the question to
+            question_type: Type of question (text, paragraph, multiple_choice, etc.)
+            title: Question title/text
+            options: List of options for multiple choice questions
+            required: Whether the question is required
+            
+        Returns:
+            dict: Response containing question ID
+        """
+        try:
+            logger.debug("Adding %s question to form %s", question_type, form_id)
+            item_id, _ = self._insert_questions(form_id, [{
+                "question_type": question_type,
+                "title": title,
+                "options": options,
+                "required": required
+            }])
+            logger.debug("Question added successfully at index %s", item_id)
+            
+            return {
+                "form_id": form_id,
+                "question_id": item_id,
+                "title": title,
+                "type": question_type
             }
+        except Exception as e:
+            logger.error("Error adding question: %s", e)
+            raise
+    
+    def add_questions(self, form_id, questions):
+        """
+        Add several questions to an existing Google Form in one batchUpdate.
+        
+        Args:
+            form_id: ID of the form to add the questions to
+            questions: List of dicts with question_type, title, options and required
             
-            # Set up question type specific configuration
-            if question_type == "text":
-                print("DEBUG: Setting up text question")
-                request["requests"][0]["createItem"]["item"]["questionItem"]["question"]["textQuestion"] = {}
+        Returns:
+            dict: Response containing the created item IDs, in request order
+        """
+        try:
+            logger.debug("Adding %s questions to form %s", len(questions), form_id)
+            start_index, replies = self._insert_questions(form_id, questions)
+            logger.debug("%s questions added successfully", len(questions))
+            return self._add_questions_result(form_id, start_index, questions, replies)
+        except Exception as e:
+            logger.error("Error adding questions: %s", e)
+            raise
+    
+    def _add_questions_result(self, form_id, start_index, questions, replies):
+        """Build the add_questions result; replies come back in request order."""
+        results = []
+        for offset, question in enumerate(questions):
+            reply = replies[offset] if offset < len(replies) else {}
+            create_item = reply.get('createItem', {})
+            question_ids = create_item.get('questionId', [])
+            results.append({
+                "question_id": start_index + offset,
+                "item_id": create_item.get('itemId'),
+                "google_question_id": question_ids[0] if question_ids else None,
+                "title": question['title'],
+                "type": question['question_type']
+            })
+        
+        return {
+            "form_id": form_id,
+            "question_count": len(results),
+            "questions": results
+        }
+    
+    def get_question_titles(self, form_id):
+        """
+        Get the form title and a question-ID-to-title map.
+        
+        Args:
+            form_id: ID of the form
             
-            elif question_type == "paragraph":
-                print("DEBUG: Setting up paragraph question")
-                # Google Forms API uses textQuestion with different properties for paragraphs
-                request["requests"][0]["createItem"]["item"]["questionItem"]["question"]["textQuestion"] = {
-                    "paragraph": True
-                }
+        Returns:
+            tuple: (form title, dict of item and question IDs to question title)
+        """
+        metadata = self._get_form_metadata(form_id)
+        return metadata["title"], metadata["titles"]
+    
+    def _format_response(self, response, questions):
+        """Convert a raw Forms API response into the MCP response format."""
+        answer_data = {}
+        answers = response.get('answers', {})
+        
+        for question_id, answer in answers.items():
+            question_title = questions.get(question_id, question_id)
             
-            elif question_type == "multiple_choice" and options:
-                print(f"DEBUG: Setting up multiple choice question with {len(options)} options")
-                choices = [{"value": option} for option in options]
-                request["requests"][0]["createItem"]["item"]["questionItem"]["question"]["choiceQuestion"] = {
-                    "type": "RADIO",
-                    "options": choices,
-                    "shuffle": False
-                }
+            if 'textAnswers' in answer:
+                text_values = [text.get('value', '') for text in answer.get('textAnswers', {}).get('answers', [])]
+                answer_data[question_title] = text_values[0] if len(text_values) == 1 else text_values
             
-            elif question_type == "checkbox" and options:
-                print(f"DEBUG: Setting up checkbox question with {len(options)} options")
-                choices = [{"value": option} for option in options]
-                request["requests"][0]["createItem"]["item"]["questionItem"]["question"]["choiceQuestion"] = {
-                    "type": "CHECKBOX",
-                    "options": choices,
-                    "shuffle": False
-                }
+            elif 'choiceAnswers' in answer:
+                choice_values = answer.get('choiceAnswers', {}).get('answers', [])
+                answer_data[question_title] = choice_values
+        
+        return {
+            'response_id': response.get('responseId', ''),
+            'created_time': response.get('createTime', ''),
+            'answers': answer_data
+        }
+    
+    def _iter_response_pages(self, form_id, page_size=None, submitted_since=None):
+        """
+        Yield pages of raw Forms API responses, following every page token.
+        
+        Args:
+            form_id: ID of the form to get responses for
+            page_size: Responses per page (defaults to config.RESPONSES_PAGE_SIZE)
+            submitted_since: Optional RFC3339 timestamp; only responses submitted
+                at or after it are returned
             
-            print(f"DEBUG: Request body: {request}")
+        Yields:
+            list: The raw responses of one page
+        """
+        list_params = {
+            "formId": form_id,
+            "pageSize": page_size or config.RESPONSES_PAGE_SIZE
+        }
+        if submitted_since:
+            list_params["filter"] = f"timestamp >= {submitted_since}"
+        
+        while True:
+            page = self.forms_service.forms().responses().list(**list_params).execute()
+            yield page.get('responses', [])
             
-            # Execute the request
-            update_response = self.forms_service.forms().batchUpdate(
-                formId=form_id, 
-                body=request
-            ).execute()
-            print(f"DEBUG: Question added successfully: {update_response}")
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                break
+            list_params["pageToken"] = page_token
+    
+    def iter_responses(self, form_id, questions=None, page_size=None):
+        """
+        Yield formatted responses for a Google Form, following every page.
+        
+        Only one page of raw responses is held in memory at a time.
+        
+        Args:
+            form_id: ID of the form to get responses for
+            questions: Optional question-ID-to-title map, fetched if not given
+            page_size: Responses per page (defaults to config.RESPONSES_PAGE_SIZE)
+            
+        Yields:
+            dict: One formatted response
+        """
+        if questions is None:
+            _, questions = self.get_question_titles(form_id)
+        
+        for page in self._iter_response_pages(form_id, page_size=page_size):
+            for response in page:
+                yield self._format_response(response, questions)
+    
+    def sync_responses(self, form_id, full=False):
+        """
+        Bring the local response store up to date for a form.
+        
+        Only responses submitted at or after the stored watermark are downloaded.
+        The form itself is re-read only on the first sync, on a full sync, or
+        when the delta references a question the store has not seen.
+        
+        Args:
+            form_id: ID of the form to sync
+            full: Discard stored responses and download everything
+            
+        Returns:
+            dict: Number of responses fetched, stored total and the new watermark
+        """
+        try:
+            upstream_calls = 0
+            state = None if full else self.response_store.get_sync_state(form_id)
+            
+            if state is None:
+                metadata = self.form_cache.get(form_id)
+                if metadata is None:
+                    metadata = self._fetch_form_metadata(form_id)
+                    upstream_calls += 1
+                form_title, questions = metadata["title"], metadata["titles"]
+                submitted_since = None
+            else:
+                form_title, questions = state["form_title"], state["questions"]
+                submitted_since = state["watermark"] or None
+            
+            delta = []
+            for page in self._iter_response_pages(form_id, submitted_since=submitted_since):
+                delta.extend(page)
+                upstream_calls += 1
+            
+            # Refresh titles if the form gained questions since the last sync; the
+            # cached metadata may predate those questions, so read the form itself
+            if any(question_id not in questions
+                   for response in delta
+                   for question_id in response.get('answers', {})):
+                metadata = self._fetch_form_metadata(form_id)
+                form_title, questions = metadata["title"], metadata["titles"]
+                upstream_calls += 1
+            
+            watermark = self.response_store.apply_sync(
+                form_id, form_title, questions, delta, full=state is None
+            )
+            logger.info("Synced %s responses for form %s", len(delta), form_id)
             
             return {
                 "form_id": form_id,
-                "question_id": item_id,
-                "title": title,
-                "type": question_type
+                "fetched_count": len(delta),
+                "stored_count": self.response_store.count(form_id),
+                "watermark": watermark,
+                "upstream_calls": upstream_calls
             }
         except Exception as e:
-            print(f"Error adding question: {str(e)}")
+            logger.error("Error syncing responses: %s", e)
             raise
     
-    def get_responses(self, form_id):
+    def _get_fresh_sync_state(self, form_id, max_age_seconds=None):
+        """Return the store's sync state for a form, syncing first if it is missing or stale."""
+        state = self.response_store.get_sync_state(form_id)
+        if state is None or (max_age_seconds is not None and time.time() - state["synced_at"] > max_age_seconds):
+            self.sync_responses(form_id)
+            state = self.response_store.get_sync_state(form_id)
+        return state
+    
+    def _get_stored_responses(self, form_id, max_age_seconds=None):
+        """Serve responses from the local store, syncing first if it is missing or stale."""
+        state = self._get_fresh_sync_state(form_id, max_age_seconds)
+        
+        questions = state["questions"]
+        formatted_responses = [
+            self._format_response(response, questions)
+            for response in self.response_store.iter_responses(form_id)
+        ]
+        
+        return {
+            "form_id": form_id,
+            "form_title": state["form_title"],
+            "response_count": len(formatted_responses),
+            "responses": formatted_responses,
+            "source": "store",
+            "synced_at": state["synced_at"]
+        }
+    
+    def get_responses(self, form_id, use_store=False, max_age_seconds=None):
         """
         Get responses for a Google Form.
         
         Args:
             form_id: ID of the form to get responses for
+            use_store: Serve from the local response store instead of a full download
+            max_age_seconds: Sync the store first if its last sync is older than this
+                (implies use_store)
             
         Returns:
             dict: Form responses
         """
         try:
-            # Get the form to retrieve question titles
-            form = self.forms_service.forms().get(formId=form_id).execute()
-            questions = {}
-            
-            for item in form.get('items', []):
-                question_id = item.get('itemId', '')
-                title = item.get('title', '')
-                questions[question_id] = title
-            
-            # Get form responses
-            response_data = self.forms_service.forms().responses().list(formId=form_id).execute()
-            responses = response_data.get('responses', [])
+            if use_store or max_age_seconds is not None:
+                return self._get_stored_responses(form_id, max_age_seconds)
             
-            formatted_responses = []
-            for response in responses:
-                answer_data = {}
-                answers = response.get('answers', {})
-                
-                for question_id, answer in answers.items():
-                    question_title = questions.get(question_id, question_id)
-                    
-                    if 'textAnswers' in answer:
-                        text_values = [text.get('value', '') for text in answer.get('textAnswers', {}).get('answers', [])]
-                        answer_data[question_title] = text_values[0] if len(text_values) == 1 else text_values
-                    
-                    elif 'choiceAnswers' in answer:
-                        choice_values = answer.get('choiceAnswers', {}).get('answers', [])
-                        answer_data[question_title] = choice_values
-                
-                formatted_responses.append({
-                    'response_id': response.get('responseId', ''),
-                    'created_time': response.get('createTime', ''),
-                    'answers': answer_data
-                })
+            # Get the form to retrieve question titles
+            form_title, questions = self.get_question_titles(form_id)
+            formatted_responses = list(self.iter_responses(form_id, questions=questions))
             
             return {
                 "form_id": form_id,
-                "form_title": form.get('info', {}).get('title', ''),
+                "form_title": form_title,
                 "response_count": len(formatted_responses),
                 "responses": formatted_responses
             }
         except Exception as e:
-            print(f"Error getting responses: {str(e)}")
+            logger.error("Error getting responses: %s", e)
+            raise
+    
+    def summarize_responses(self, form_id, use_store=False, max_age_seconds=None):
+        """
+        Compute per-question aggregates for a Google Form's responses.
+        
+        Responses are reduced page by page, so the result has the same size
+        however many responses the form has.
+        
+        Args:
+            form_id: ID of the form to summarize
+            use_store: Read responses from the local store instead of downloading them
+            max_age_seconds: Sync the store first if its last sync is older than this
+                (implies use_store)
+            
+        Returns:
+            dict: Response counts of the most recent days and per-question option
+                counts, scale statistics and answer counts
+        """
+        try:
+            form = self.forms_service.forms().get(formId=form_id).execute()
+            self.form_cache.put(form_id, metadata_from_form(form))
+            summarizer = ResponseSummarizer(form, max_days=config.SUMMARY_MAX_DAYS)
+            
+            if use_store or max_age_seconds is not None:
+                self._get_fresh_sync_state(form_id, max_age_seconds)
+                pages = self.response_store.iter_pages(form_id)
+            else:
+                pages = self._iter_response_pages(form_id)
+            
+            for page in pages:
+                summarizer.add_page(page)
+            
+            return summarizer.result()
+        except Exception as e:
+            logger.error("Error summarizing responses: %s", e)
             raise
@@ -0,0 +1,195 @@
+import queue
+import re
+import threading
+import time
+import urllib.parse
+
+import google_auth_httplib2
+import httplib2
+
+from metrics import observe_call, registry
+from tracing import Tracer
+
+tracer = Tracer("mcp-server")
+
+GOOGLE_API_DURATION = registry.histogram(
+    "google_api_request_duration_seconds", "Duration of Google API calls", ["api", "method"]
+)
+GOOGLE_API_IN_FLIGHT = registry.gauge(
+    "google_api_requests_in_flight", "Google API calls in progress", ["api", "method"]
+)
+GOOGLE_API_ERRORS = registry.counter(
+    "google_api_errors_total", "Failed Google API calls by exception class or HTTP status", ["api", "method", "error"]
+)
+
+_VERSION_SEGMENT = re.compile(r"v\d+(beta\d*)?")
+# Resource methods that appear as a path segment after the ID, e.g. files/{id}/copy
+_CUSTOM_VERBS = {"copy", "watch"}
+# APIs whose discovery documents name nested resources without their parent
+_FLAT_RESOURCE_APIS = {"drive"}
+_COLLECTION_VERBS = {"GET": "list", "POST": "create"}
+_ITEM_VERBS = {"GET": "get", "PATCH": "update", "PUT": "update", "DELETE": "delete"}
+
+
+def google_api_method(http_method, uri):
+    """
+    Name the Google API method behind a REST call, without any IDs.
+    
+    Examples: ('forms', 'forms.batchUpdate'), ('drive', 'permissions.create'),
+    ('drive', 'files.copy'), ('drive', 'batch').
+    
+    Returns:
+        tuple: (api, method)
+    """
+    parts = urllib.parse.urlsplit(uri)
+    path = [segment for segment in parts.path.split("/") if segment]
+    host_api = (parts.hostname or "").split(".")[0]
+    api = host_api if host_api not in ("", "www") else (path[0] if path else "unknown")
+    if path and path[0] == "batch":
+        return (path[1] if len(path) > 1 else api), "batch"
+    
+    for index, segment in enumerate(path):
+        if _VERSION_SEGMENT.fullmatch(segment):
+            if host_api in ("", "www") and index > 0:
+                api = path[index - 1]
+            path = path[index + 1:]
+            break
+    if not path:
+        return api, http_method.lower()
+    
+    last = path[-1]
+    if ":" in last:
+        resources = [segment.split(":", 1)[0] for segment in path[0::2]]
+        verb = last.split(":", 1)[1]
+    elif len(path) % 2 and len(path) > 1 and last in _CUSTOM_VERBS:
+        resources = path[0:-1:2]
+        verb = last
+    else:
+        resources = path[0::2]
+        verbs = _COLLECTION_VERBS if len(path) % 2 else _ITEM_VERBS
+        verb = verbs.get(http_method.upper(), http_method.lower())
+    if api in _FLAT_RESOURCE_APIS:
+        resources = resources[-1:]
+    return api, ".".join(resources + [verb])
+
+
+class PooledHttp:
+    """
+    Thread-safe stand-in for an httplib2 transport, backed by a bounded pool.
+
+    httplib2.Http is not safe to share between threads, so each request checks
+    out its own authorized connection, runs on it and returns it to the pool.
+    Returned connections keep their keep-alive sockets for the next request.
+    Connections that raised are discarded, and connections left idle for too
+    long have their sockets closed before reuse, since the far end has likely
+    dropped them. Google API services are built on this object in place of
+    credentials, so every service call and batch goes through the pool.
+    """
+
+    def __init__(self, credentials, max_size=10, acquire_timeout=30, idle_seconds=60, timeout=60, http_factory=None):
+        """
+        Initialize the pool. Connections are created on demand.
+
+        Args:
+            credentials: google-auth credentials applied to every request
+            max_size: Maximum number of connections, and so concurrent requests
+            acquire_timeout: Seconds to wait for a free connection before failing
+            idle_seconds: Idle time after which a connection's sockets are reset
+            timeout: Socket timeout in seconds for each connection
+            http_factory: Optional callable returning the httplib2.Http-compatible
+                transport of a new connection, e.g. an in-memory fake for benchmarks
+        """
+        self.credentials = credentials
+        self.http_factory = http_factory or (lambda: httplib2.Http(timeout=self.timeout))
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.idle_seconds = idle_seconds
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "reset_idle": 0,
+            "discarded": 0,
+            "in_use": 0,
+            "waited": 0
+        }
+
+    def request(self, uri, method="GET", *args, **kwargs):
+        """Run one HTTP request on a pooled connection (httplib2.Http.request signature)."""
+        api, api_method = google_api_method(method, uri)
+        # The span includes waiting for a pooled connection
+        with tracer.start_span(f"google.{api_method}", api=api, http_method=method) as span:
+            connection = self._acquire()
+            try:
+                with observe_call(GOOGLE_API_DURATION, GOOGLE_API_IN_FLIGHT, GOOGLE_API_ERRORS, api, api_method):
+                    response = connection.request(uri, method, *args, **kwargs)
+            except Exception:
+                self._discard(connection)
+                raise
+            self._release(connection)
+            status = getattr(response[0], "status", 200)
+            span.set_attribute("http_status", status)
+        if status >= 400:
+            GOOGLE_API_ERRORS.inc(api, api_method, f"HTTP {status}")
+        return response
+
+    def close(self):
+        """Close the sockets of every idle connection."""
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close_connection(connection)
+
+    def stats(self):
+        """Return pool counters: connections created, reused, reset, discarded and in use."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["idle"] = self._idle.qsize()
+        stats["max_size"] = self.max_size
+        return stats
+
+    def _acquire(self):
+        if not self._slots.acquire(blocking=False):
+            self._count("waited")
+            if not self._slots.acquire(timeout=self.acquire_timeout):
+                raise TimeoutError(f"No free HTTP connection after {self.acquire_timeout}s (pool size {self.max_size})")
+        self._count("in_use")
+        try:
+            connection, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            self._count("created")
+            return google_auth_httplib2.AuthorizedHttp(self.credentials, http=self.http_factory())
+
+        # Health check: sockets idle for long are probably closed by the server
+        if time.monotonic() - last_used > self.idle_seconds:
+            self._close_connection(connection)
+            self._count("reset_idle")
+        else:
+            self._count("reused")
+        return connection
+
+    def _release(self, connection):
+        self._idle.put((connection, time.monotonic()))
+        self._count("in_use", -1)
+        self._slots.release()
+
+    def _discard(self, connection):
+        self._close_connection(connection)
+        self._count("discarded")
+        self._count("in_use", -1)
+        self._slots.release()
+
+    def _close_connection(self, connection):
+        try:
+            connection.http.close()
+        except Exception:
+            pass
+
+    def _count(self, name, delta=1):
+        with self._stats_lock:
+            self._stats[name] += delta
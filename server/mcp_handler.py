@@ -1,8 +1,34 @@
+import contextvars
 import json
 import uuid
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from forms_api import GoogleFormsAPI
+from metrics import observe_call, registry
+from tracing import Tracer, configure_tracing
 import config
 
+configure_tracing(config.TRACE_EXPORT_PATH, config.TRACE_SAMPLE_RATE)
+tracer = Tracer("mcp-server")
+
+# A validated tool request: the GoogleFormsAPI method name and its arguments
+ToolCall = namedtuple('ToolCall', ['method', 'args', 'kwargs'])
+
+TOOL_DURATION = registry.histogram("mcp_tool_duration_seconds", "Duration of MCP tool calls", ["tool"])
+TOOLS_IN_FLIGHT = registry.gauge("mcp_tools_in_flight", "MCP tool calls in progress", ["tool"])
+TOOL_ERRORS = registry.counter("mcp_tool_errors_total", "Failed MCP tool calls by exception class", ["tool", "error"])
+
+# Marker key of a parameter value that refers to the result of an earlier packet in a batch
+RESULT_REFERENCE = '$result'
+
+# Question types add_question, add_questions and create_form_with_questions accept
+QUESTION_TYPES = ('text', 'paragraph', 'multiple_choice', 'checkbox')
+# Of those, the types that need options
+CHOICE_QUESTION_TYPES = ('multiple_choice', 'checkbox')
+
+# Tools that insert into an existing form; a batch runs those aimed at one form in packet order
+FORM_WRITE_TOOLS = ('add_question', 'add_questions')
+
 class MCPHandler:
     """
     Handler for Model Context Protocol (MCP) packets.
@@ -11,9 +37,14 @@ class MCPHandler:
     appropriately formatted MCP responses.
     """
     
-    def __init__(self):
-        """Initialize the MCP handler with a GoogleFormsAPI instance."""
-        self.forms_api = GoogleFormsAPI()
+    def __init__(self, forms_api=None):
+        """
+        Initialize the MCP handler.
+        
+        Args:
+            forms_api: GoogleFormsAPI to call; one on the shared service registry if not given
+        """
+        self.forms_api = forms_api or GoogleFormsAPI()
         self.version = config.MCP_VERSION
         self.tools = config.MCP_TOOLS
     
@@ -30,6 +61,10 @@ class MCPHandler:
                     "description": {
                         "type": "string",
                         "description": "Optional description for the form"
+                    },
+                    "fast_path": {
+                        "type": "boolean",
+                        "description": "Use the minimal round-trip creation flow (defaults to server setting)"
                     }
                 },
                 "required": ["title"]
@@ -43,8 +78,8 @@ class MCPHandler:
                     },
                     "question_type": {
                         "type": "string",
-                        "description": "The type of question (text, paragraph, multiple_choice, checkbox)",
-                        "enum": ["text", "paragraph", "multiple_choice", "checkbox"]
+                        "description": f"The type of question ({', '.join(QUESTION_TYPES)})",
+                        "enum": list(QUESTION_TYPES)
                     },
                     "title": {
                         "type": "string",
@@ -65,12 +100,127 @@ class MCPHandler:
                 },
                 "required": ["form_id", "question_type", "title"]
             },
+            "add_questions": {
+                "description": "Adds several questions to an existing Google Form in a single batch",
+                "parameters": {
+                    "form_id": {
+                        "type": "string",
+                        "description": "The ID of the form to add the questions to"
+                    },
+                    "questions": {
+                        "type": "array",
+                        "description": "Questions to add, in order",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "question_type": {
+                                    "type": "string",
+                                    "description": f"The type of question ({', '.join(QUESTION_TYPES)})",
+                                    "enum": list(QUESTION_TYPES)
+                                },
+                                "title": {
+                                    "type": "string",
+                                    "description": "The question title/text"
+                                },
+                                "options": {
+                                    "type": "array",
+                                    "description": "Options for multiple choice or checkbox questions",
+                                    "items": {
+                                        "type": "string"
+                                    }
+                                },
+                                "required": {
+                                    "type": "boolean",
+                                    "description": "Whether the question is required",
+                                    "default": False
+                                }
+                            },
+                            "required": ["question_type", "title"]
+                        }
+                    }
+                },
+                "required": ["form_id", "questions"]
+            },
+            "create_form_with_questions": {
+                "description": "Creates a new Google Form with its questions, copying a previously built form of the same shape when possible",
+                "parameters": {
+                    "title": {
+                        "type": "string",
+                        "description": "The title of the form"
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "Optional description for the form"
+                    },
+                    "questions": {
+                        "type": "array",
+                        "description": "Questions to add, in order, in the same format as add_questions",
+                        "items": {
+                            "type": "object"
+                        }
+                    }
+                },
+                "required": ["title", "questions"]
+            },
             "get_responses": {
                 "description": "Gets responses for a Google Form",
                 "parameters": {
                     "form_id": {
                         "type": "string",
                         "description": "The ID of the form to get responses for"
+                    },
+                    "use_store": {
+                        "type": "boolean",
+                        "description": "Serve responses from the local store kept up to date by sync_responses",
+                        "default": False
+                    },
+                    "max_age_seconds": {
+                        "type": "number",
+                        "description": "Sync the local store first if it is older than this many seconds (implies use_store)"
+                    }
+                },
+                "required": ["form_id"]
+            },
+            "sync_responses": {
+                "description": "Downloads new or edited responses for a Google Form into the local store",
+                "parameters": {
+                    "form_id": {
+                        "type": "string",
+                        "description": "The ID of the form to sync"
+                    },
+                    "full": {
+                        "type": "boolean",
+                        "description": "Discard stored responses and download everything",
+                        "default": False
+                    }
+                },
+                "required": ["form_id"]
+            },
+            "summarize_responses": {
+                "description": "Computes per-question aggregates (option counts, scale statistics, answer counts, responses per day) for a Google Form",
+                "parameters": {
+                    "form_id": {
+                        "type": "string",
+                        "description": "The ID of the form to summarize"
+                    },
+                    "use_store": {
+                        "type": "boolean",
+                        "description": "Read responses from the local store kept up to date by sync_responses",
+                        "default": False
+                    },
+                    "max_age_seconds": {
+                        "type": "number",
+                        "description": "Sync the local store first if it is older than this many seconds (implies use_store)"
+                    }
+                },
+                "required": ["form_id"]
+            },
+            "get_form_status": {
+                "description": "Gets the Drive publication status of a form created by this server",
+                "parameters": {
+                    "form_id": {
+                        "type": "string",
+                        "description": "The ID of the form to check"
                     }
                 },
                 "required": ["form_id"]
@@ -88,28 +238,14 @@ class MCPHandler:
             dict: MCP response packet
         """
         try:
-            # Extract MCP request components
-            transaction_id = request_data.get('transaction_id', str(uuid.uuid4()))
-            tool_name = request_data.get('tool_name')
-            parameters = request_data.get('parameters', {})
-            
-            # Validate tool name
-            if tool_name not in self.tools:
-                return self._create_error_response(
-                    transaction_id,
-                    f"Unknown tool '{tool_name}'. Available tools: {', '.join(self.tools)}"
-                )
+            transaction_id, outcome = self.prepare_request(request_data)
+            if not isinstance(outcome, ToolCall):
+                return outcome
             
-            # Process the request based on the tool name
-            if tool_name == "create_form":
-                return self._handle_create_form(transaction_id, parameters)
-            elif tool_name == "add_question":
-                return self._handle_add_question(transaction_id, parameters)
-            elif tool_name == "get_responses":
-                return self._handle_get_responses(transaction_id, parameters)
-            
-            # Shouldn't reach here due to validation above
-            return self._create_error_response(transaction_id, f"Tool '{tool_name}' not implemented")
+            method = getattr(self.forms_api, outcome.method)
+            with self.trace_tool(outcome.method, transaction_id), self.instrument_tool(outcome.method):
+                result = method(*outcome.args, **outcome.kwargs)
+            return self._create_success_response(transaction_id, result)
         
         except Exception as e:
             return self._create_error_response(
@@ -117,6 +253,256 @@ class MCPHandler:
                 f"Error processing request: {str(e)}"
             )
     
+    def process_batch(self, packets):
+        """
+        Process a batch of MCP requests that may use each other's results.
+        
+        A parameter value of the form {"$result": <packet>, "path": "form_id"}
+        is replaced by that field of an earlier packet's result, where <packet>
+        is the earlier packet's index or transaction_id. Packets run as soon as
+        the packets they refer to have succeeded, so independent packets run
+        concurrently. A packet whose dependency failed is not run. Packets that
+        add questions to the same form run one after another, in packet order.
+        
+        Args:
+            packets: List of MCP request dicts
+            
+        Returns:
+            list: MCP response packets, in request order
+        """
+        dependencies = self.plan_batch(packets)
+        previous_writes = self.plan_form_writes(packets, dependencies)
+        workers = max(1, min(config.MCP_BATCH_WORKERS, len(packets)))
+        
+        # Packets only wait on earlier packets and the executor starts tasks in
+        # submission order, so a waiting task never starves the one it waits on.
+        # Each task runs in a copy of the caller's context to keep its trace.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = []
+            for index, packet in enumerate(packets):
+                futures.append(executor.submit(
+                    contextvars.copy_context().run,
+                    self._run_batch_packet, packet, dependencies[index], futures[:index], previous_writes[index]
+                ))
+            return [future.result() for future in futures]
+    
+    def validate_batch(self, packets):
+        """Return an error message if a batch as a whole cannot be processed, else None."""
+        if not packets:
+            return "Batch must contain at least one packet"
+        if len(packets) > config.MCP_MAX_BATCH_SIZE:
+            return f"Batch of {len(packets)} packets exceeds the limit of {config.MCP_MAX_BATCH_SIZE}"
+        return None
+    
+    def _run_batch_packet(self, packet, dependency, earlier, previous_write):
+        if not isinstance(dependency, set):
+            return dependency
+        if previous_write is not None:
+            # Only the order matters; the earlier write's outcome is its own
+            earlier[previous_write].result()
+        responses = {index: earlier[index].result() for index in dependency}
+        bound, error = self.bind_batch_packet(packet, responses)
+        if error is not None:
+            return error
+        return self.process_request(bound)
+    
+    def plan_batch(self, packets):
+        """
+        Find the earlier packets each packet of a batch refers to.
+        
+        Args:
+            packets: List of MCP request dicts
+            
+        Returns:
+            list: For each packet, the set of packet indices it depends on,
+                or an MCP error response if the packet or a reference is invalid
+        """
+        indices_by_id = {}
+        plan = []
+        for index, packet in enumerate(packets):
+            if not isinstance(packet, dict):
+                plan.append(self._create_error_response(str(uuid.uuid4()), f"Packet {index} must be an object"))
+                continue
+            
+            transaction_id = packet.get('transaction_id', str(uuid.uuid4()))
+            try:
+                plan.append({
+                    self._reference_index(reference, index, indices_by_id)
+                    for reference in self._find_references(packet.get('parameters', {}))
+                })
+            except ValueError as e:
+                plan.append(self._create_error_response(transaction_id, str(e)))
+            
+            if 'transaction_id' in packet:
+                indices_by_id.setdefault(packet['transaction_id'], index)
+        return plan
+    
+    def plan_form_writes(self, packets, dependencies):
+        """
+        Find, for each packet that adds questions, the previous such packet aimed at the same form.
+        
+        The form is compared as written in the packet: the same form ID, or a
+        reference to the same field of the same earlier packet.
+        
+        Args:
+            packets: List of MCP request dicts
+            dependencies: The batch plan from plan_batch
+            
+        Returns:
+            list: For each packet, the index of the packet it must run after, or None
+        """
+        indices_by_id = {}
+        last_write = {}
+        previous = []
+        for index, packet in enumerate(packets):
+            previous.append(None)
+            if not isinstance(packet, dict):
+                continue
+            parameters = packet.get('parameters')
+            if (packet.get('tool_name') in FORM_WRITE_TOOLS and isinstance(dependencies[index], set)
+                    and isinstance(parameters, dict)):
+                form_id = parameters.get('form_id')
+                if isinstance(form_id, dict) and RESULT_REFERENCE in form_id:
+                    target = form_id[RESULT_REFERENCE]
+                    target = indices_by_id.get(target, target) if isinstance(target, str) else target
+                    key = ('result', target, str(form_id.get('path', '')))
+                elif isinstance(form_id, str):
+                    key = ('form', form_id)
+                else:
+                    key = None
+                if key is not None:
+                    previous[index] = last_write.get(key)
+                    last_write[key] = index
+            if 'transaction_id' in packet:
+                indices_by_id.setdefault(packet['transaction_id'], index)
+        return previous
+    
+    def bind_batch_packet(self, packet, responses):
+        """
+        Replace the result references in a packet with values from earlier responses.
+        
+        Args:
+            packet: MCP request dict
+            responses: Dict of packet index to MCP response for every packet referred to
+            
+        Returns:
+            tuple: (packet with references resolved, None) or (None, MCP error response)
+        """
+        transaction_id = packet.get('transaction_id', str(uuid.uuid4()))
+        for index in sorted(responses):
+            if responses[index].get('status') != 'success':
+                return None, self._create_error_response(
+                    transaction_id,
+                    f"Not run: packet {index} it depends on failed"
+                )
+        
+        try:
+            parameters = self._bind_references(packet.get('parameters', {}), responses, packet)
+        except ValueError as e:
+            return None, self._create_error_response(transaction_id, str(e))
+        
+        bound = dict(packet, parameters=parameters)
+        bound['transaction_id'] = transaction_id
+        return bound, None
+    
+    def _find_references(self, value):
+        """Yield every result reference nested in a parameter value."""
+        if isinstance(value, dict):
+            if RESULT_REFERENCE in value:
+                yield value
+                return
+            for item in value.values():
+                yield from self._find_references(item)
+        elif isinstance(value, list):
+            for item in value:
+                yield from self._find_references(item)
+    
+    def _reference_index(self, reference, index, indices_by_id):
+        """Resolve the packet a reference points to, which must come earlier in the batch."""
+        target = reference[RESULT_REFERENCE]
+        if isinstance(target, int) and not isinstance(target, bool):
+            if 0 <= target < index:
+                return target
+        elif target in indices_by_id:
+            return indices_by_id[target]
+        raise ValueError(f"Invalid reference {json.dumps(target)} in packet {index}: must name an earlier packet by index or transaction_id")
+    
+    def _bind_references(self, value, responses, packet):
+        if isinstance(value, dict):
+            if RESULT_REFERENCE in value:
+                return self._resolve_reference(value, responses, packet)
+            return {key: self._bind_references(item, responses, packet) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._bind_references(item, responses, packet) for item in value]
+        return value
+    
+    def _resolve_reference(self, reference, responses, packet):
+        """Look up a dot-separated path, e.g. 'questions.0.item_id', in a referenced result."""
+        target = reference[RESULT_REFERENCE]
+        if not isinstance(target, int) or isinstance(target, bool):
+            target = next(index for index in sorted(responses)
+                          if responses[index].get('transaction_id') == target)
+        value = responses[target].get('result')
+        path = reference.get('path', '')
+        for key in filter(None, str(path).split('.')):
+            if isinstance(value, list) and key.isdigit() and int(key) < len(value):
+                value = value[int(key)]
+            elif isinstance(value, dict) and key in value:
+                value = value[key]
+            else:
+                raise ValueError(f"Result of packet {target} has no field '{path}'")
+        return value
+    
+    def prepare_request(self, request_data):
+        """
+        Validate an MCP request and resolve it to a GoogleFormsAPI call without running it.
+        
+        Shared by the synchronous and asynchronous servers so both validate
+        packets and word errors identically.
+        
+        Args:
+            request_data: Dict containing the MCP request data
+            
+        Returns:
+            tuple: (transaction_id, ToolCall to run or MCP error response)
+        """
+        # Extract MCP request components
+        transaction_id = request_data.get('transaction_id', str(uuid.uuid4()))
+        tool_name = request_data.get('tool_name')
+        parameters = request_data.get('parameters', {})
+        
+        # Validate tool name
+        if tool_name not in self.tools:
+            TOOL_ERRORS.inc("unknown", "UnknownTool")
+            return transaction_id, self._create_error_response(
+                transaction_id,
+                f"Unknown tool '{tool_name}'. Available tools: {', '.join(self.tools)}"
+            )
+        
+        # Resolve the request based on the tool name
+        handlers = {
+            "create_form": self._handle_create_form,
+            "add_question": self._handle_add_question,
+            "add_questions": self._handle_add_questions,
+            "create_form_with_questions": self._handle_create_form_with_questions,
+            "get_responses": self._handle_get_responses,
+            "sync_responses": self._handle_sync_responses,
+            "summarize_responses": self._handle_summarize_responses,
+            "get_form_status": self._handle_get_form_status
+        }
+        handler = handlers.get(tool_name)
+        if handler is None:
+            # Shouldn't reach here due to validation above
+            return transaction_id, self._create_error_response(transaction_id, f"Tool '{tool_name}' not implemented")
+        
+        outcome = handler(transaction_id, parameters)
+        if not isinstance(outcome, ToolCall):
+            TOOL_ERRORS.inc(tool_name, "InvalidParameters")
+        return transaction_id, outcome
+    
+    # Each _handle_* method validates one tool's parameters and returns either
+    # an MCP error response or the ToolCall that fulfils the request.
+    
     def _handle_create_form(self, transaction_id, parameters):
         """Handle a create_form MCP request."""
         if 'title' not in parameters:
@@ -124,14 +510,9 @@ class MCPHandler:
         
         title = parameters['title']
         description = parameters.get('description', "")
+        fast_path = parameters.get('fast_path')
         
-        result = self.forms_api.create_form(title, description)
-        
-        return {
-            "transaction_id": transaction_id,
-            "status": "success",
-            "result": result
-        }
+        return self._tool_call("create_form", title, description, fast_path=fast_path)
     
     def _handle_add_question(self, transaction_id, parameters):
         """Handle an add_question MCP request."""
@@ -149,27 +530,97 @@ class MCPHandler:
         required = parameters.get('required', False)
         
         # Validate question type
-        valid_types = ['text', 'paragraph', 'multiple_choice', 'checkbox']
-        if question_type not in valid_types:
+        if question_type not in QUESTION_TYPES:
             return self._create_error_response(
                 transaction_id,
-                f"Invalid question_type '{question_type}'. Valid types: {', '.join(valid_types)}"
+                f"Invalid question_type '{question_type}'. Valid types: {', '.join(QUESTION_TYPES)}"
             )
         
         # Validate options for choice questions
-        if question_type in ['multiple_choice', 'checkbox'] and not options:
+        if question_type in CHOICE_QUESTION_TYPES and not options:
             return self._create_error_response(
                 transaction_id,
                 f"Options are required for '{question_type}' questions"
             )
         
-        result = self.forms_api.add_question(form_id, question_type, title, options, required)
+        return self._tool_call("add_question", form_id, question_type, title, options, required)
+    
+    def _handle_add_questions(self, transaction_id, parameters):
+        """Handle an add_questions MCP request."""
+        # Validate required parameters
+        required_params = ['form_id', 'questions']
+        for param in required_params:
+            if param not in parameters:
+                return self._create_error_response(transaction_id, f"Missing required parameter '{param}'")
         
-        return {
-            "transaction_id": transaction_id,
-            "status": "success",
-            "result": result
-        }
+        normalized = self._normalize_questions(transaction_id, parameters['questions'])
+        if isinstance(normalized, dict):
+            return normalized
+        
+        return self._tool_call("add_questions", parameters['form_id'], normalized)
+    
+    def _handle_create_form_with_questions(self, transaction_id, parameters):
+        """Handle a create_form_with_questions MCP request."""
+        for param in ['title', 'questions']:
+            if param not in parameters:
+                return self._create_error_response(transaction_id, f"Missing required parameter '{param}'")
+        
+        normalized = self._normalize_questions(transaction_id, parameters['questions'])
+        if isinstance(normalized, dict):
+            return normalized
+        
+        return self._tool_call(
+            "create_form_with_questions",
+            parameters['title'],
+            parameters.get('description', ""),
+            normalized
+        )
+    
+    def _normalize_questions(self, transaction_id, questions):
+        """
+        Validate a questions array and fill in defaults.
+        
+        Returns:
+            list: Normalized questions, or an MCP error response dict
+        """
+        if not isinstance(questions, list) or not questions:
+            return self._create_error_response(transaction_id, "Parameter 'questions' must be a non-empty array")
+        
+        # Validate every question up front so the batch is all-or-nothing
+        normalized = []
+        for index, question in enumerate(questions):
+            if not isinstance(question, dict):
+                return self._create_error_response(transaction_id, f"Question {index} must be an object")
+            
+            for param in ['question_type', 'title']:
+                if param not in question:
+                    return self._create_error_response(
+                        transaction_id,
+                        f"Missing required parameter '{param}' in question {index}"
+                    )
+            
+            question_type = question['question_type']
+            options = question.get('options', [])
+            if question_type not in QUESTION_TYPES:
+                return self._create_error_response(
+                    transaction_id,
+                    f"Invalid question_type '{question_type}' in question {index}. Valid types: {', '.join(QUESTION_TYPES)}"
+                )
+            
+            if question_type in CHOICE_QUESTION_TYPES and not options:
+                return self._create_error_response(
+                    transaction_id,
+                    f"Options are required for '{question_type}' questions (question {index})"
+                )
+            
+            normalized.append({
+                "question_type": question_type,
+                "title": question['title'],
+                "options": options,
+                "required": question.get('required', False)
+            })
+        
+        return normalized
     
     def _handle_get_responses(self, transaction_id, parameters):
         """Handle a get_responses MCP request."""
@@ -177,8 +628,66 @@ class MCPHandler:
             return self._create_error_response(transaction_id, "Missing required parameter 'form_id'")
         
         form_id = parameters['form_id']
-        result = self.forms_api.get_responses(form_id)
+        use_store = parameters.get('use_store', False)
+        max_age_seconds = parameters.get('max_age_seconds')
+        
+        if not self._is_valid_max_age(max_age_seconds):
+            return self._create_error_response(transaction_id, "Parameter 'max_age_seconds' must be a non-negative number")
+        
+        return self._tool_call("get_responses", form_id, use_store=use_store, max_age_seconds=max_age_seconds)
+    
+    def _handle_sync_responses(self, transaction_id, parameters):
+        """Handle a sync_responses MCP request."""
+        if 'form_id' not in parameters:
+            return self._create_error_response(transaction_id, "Missing required parameter 'form_id'")
+        
+        return self._tool_call("sync_responses", parameters['form_id'], full=parameters.get('full', False))
+    
+    def _handle_summarize_responses(self, transaction_id, parameters):
+        """Handle a summarize_responses MCP request."""
+        if 'form_id' not in parameters:
+            return self._create_error_response(transaction_id, "Missing required parameter 'form_id'")
+        
+        max_age_seconds = parameters.get('max_age_seconds')
+        if not self._is_valid_max_age(max_age_seconds):
+            return self._create_error_response(transaction_id, "Parameter 'max_age_seconds' must be a non-negative number")
+        
+        return self._tool_call(
+            "summarize_responses",
+            parameters['form_id'],
+            use_store=parameters.get('use_store', False),
+            max_age_seconds=max_age_seconds
+        )
+    
+    def _handle_get_form_status(self, transaction_id, parameters):
+        """Handle a get_form_status MCP request."""
+        if 'form_id' not in parameters:
+            return self._create_error_response(transaction_id, "Missing required parameter 'form_id'")
         
+        return self._tool_call("get_form_status", parameters['form_id'])
+    
+    def _is_valid_max_age(self, max_age_seconds):
+        """Check an optional max_age_seconds parameter."""
+        if max_age_seconds is None:
+            return True
+        if isinstance(max_age_seconds, bool) or not isinstance(max_age_seconds, (int, float)):
+            return False
+        return max_age_seconds >= 0
+    
+    def instrument_tool(self, tool):
+        """Context manager recording a tool call's duration, in-flight count and errors."""
+        return observe_call(TOOL_DURATION, TOOLS_IN_FLIGHT, TOOL_ERRORS, tool)
+    
+    def trace_tool(self, tool, transaction_id):
+        """Span covering a tool call; the Google API calls it makes become its children."""
+        return tracer.start_span(f"mcp.{tool}", tool=tool, transaction_id=transaction_id)
+    
+    def _tool_call(self, method, *args, **kwargs):
+        """Describe a validated GoogleFormsAPI call."""
+        return ToolCall(method, args, kwargs)
+    
+    def _create_success_response(self, transaction_id, result):
+        """Create an MCP success response."""
         return {
             "transaction_id": transaction_id,
             "status": "success",
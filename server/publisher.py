@@ -0,0 +1,129 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from tracing import Tracer, current_traceparent
+from utils.logger import get_logger, log_error
+
+logger = get_logger()
+tracer = Tracer("mcp-server")
+
+
+class PublicationQueue:
+    """
+    Bounded background queue for Drive publication jobs.
+
+    Jobs are processed by a fixed pool of daemon worker threads, so the request
+    thread only pays for putting a form ID on the queue. Failed jobs are retried
+    with exponential backoff inside the worker, and the latest state of every
+    job is kept for status lookups. A job's Drive calls are traced as part of
+    the request that queued it.
+    """
+
+    PENDING = "pending"
+    RETRYING = "retrying"
+    PUBLISHED = "published"
+    FAILED = "failed"
+
+    def __init__(self, publish_fn, workers=2, max_pending=100,
+                 max_attempts=4, backoff_base=1.0, status_limit=1000):
+        """
+        Initialize the queue. Worker threads are started on the first submit.
+
+        Args:
+            publish_fn: Callable(form_id) that raises on failure
+            workers: Number of worker threads
+            max_pending: Maximum number of queued jobs
+            max_attempts: Attempts per job before it is marked failed
+            backoff_base: Delay in seconds before the first retry, doubled each time
+            status_limit: Number of job statuses to keep in memory
+        """
+        self._publish_fn = publish_fn
+        self._workers = workers
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._status_limit = status_limit
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._statuses = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def submit(self, form_id):
+        """
+        Queue a form for publication without blocking.
+
+        Returns:
+            bool: False if the queue is full and the job was not accepted
+        """
+        self._ensure_workers()
+        self._set_status(form_id, self.PENDING, attempts=0)
+        try:
+            self._queue.put_nowait((form_id, current_traceparent()))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._statuses.pop(form_id, None)
+            return False
+
+    def status(self, form_id):
+        """Return a copy of the job status for a form, or None if unknown."""
+        with self._lock:
+            entry = self._statuses.get(form_id)
+            return dict(entry) if entry else None
+
+    def record(self, form_id, state, attempts=1, error=None):
+        """Record the outcome of a publication that ran outside the queue."""
+        self._set_status(form_id, state, attempts=attempts, error=error)
+
+    def _set_status(self, form_id, state, attempts, error=None):
+        with self._lock:
+            self._statuses[form_id] = {
+                "state": state,
+                "attempts": attempts,
+                "error": error,
+                "updated_at": datetime.now().isoformat()
+            }
+            self._statuses.move_to_end(form_id)
+            while len(self._statuses) > self._status_limit:
+                self._statuses.popitem(last=False)
+
+    def _ensure_workers(self):
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self._workers):
+                thread = threading.Thread(
+                    target=self._run_worker,
+                    name=f"drive-publisher-{index}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _run_worker(self):
+        while True:
+            form_id, traceparent = self._queue.get()
+            try:
+                with tracer.start_span("publisher.publish", traceparent=traceparent, form_id=form_id):
+                    self._process(form_id)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, form_id):
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                self._publish_fn(form_id)
+                self._set_status(form_id, self.PUBLISHED, attempts=attempt)
+                logger.info("Form %s published after %s attempt(s)", form_id, attempt)
+                return
+            except Exception as e:
+                if attempt == self._max_attempts:
+                    self._set_status(form_id, self.FAILED, attempts=attempt, error=str(e))
+                    log_error(f"Publishing form {form_id} failed after {attempt} attempts", e)
+                    return
+                self._set_status(form_id, self.RETRYING, attempts=attempt, error=str(e))
+                time.sleep(self._backoff_base * (2 ** (attempt - 1)))
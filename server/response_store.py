@@ -0,0 +1,171 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def normalize_timestamp(timestamp):
+    """
+    Normalize an RFC3339 UTC timestamp to nanosecond precision.
+
+    The Forms API omits trailing fractional digits, so raw strings do not sort
+    correctly. Padding the fraction makes lexical order match time order.
+    """
+    if not timestamp:
+        return ""
+    base = timestamp.rstrip('Z')
+    if '.' in base:
+        seconds, fraction = base.split('.', 1)
+    else:
+        seconds, fraction = base, ""
+    return f"{seconds}.{fraction.ljust(9, '0')[:9]}Z"
+
+
+class ResponseStore:
+    """
+    Local SQLite store of raw form responses for incremental sync.
+
+    Responses are keyed by form ID and response ID. For each form the store
+    records the newest lastSubmittedTime seen, the question-ID-to-title map and
+    the time of the last sync, so callers only need to download the delta.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the store. The database file is opened on first use.
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    form_id TEXT NOT NULL,
+                    response_id TEXT NOT NULL,
+                    last_submitted_time TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (form_id, response_id)
+                )"""
+            )
+            connection.execute(
+                """CREATE INDEX IF NOT EXISTS responses_by_time
+                   ON responses (form_id, last_submitted_time)"""
+            )
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS form_sync (
+                    form_id TEXT PRIMARY KEY,
+                    form_title TEXT NOT NULL,
+                    questions TEXT NOT NULL,
+                    watermark TEXT NOT NULL,
+                    synced_at REAL NOT NULL
+                )"""
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def get_sync_state(self, form_id):
+        """
+        Get the sync state of a form.
+
+        Returns:
+            dict: form_title, questions, watermark and synced_at, or None if never synced
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT form_title, questions, watermark, synced_at FROM form_sync WHERE form_id = ?",
+                (form_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "form_title": row[0],
+            "questions": json.loads(row[1]),
+            "watermark": row[2],
+            "synced_at": row[3]
+        }
+
+    def apply_sync(self, form_id, form_title, questions, responses, full=False):
+        """
+        Store a batch of raw responses and advance the form's watermark.
+
+        Args:
+            form_id: ID of the form
+            form_title: Current form title
+            questions: Question-ID-to-title map
+            responses: Raw Forms API responses from the delta
+            full: Replace all stored responses of the form instead of merging
+
+        Returns:
+            str: The new watermark
+        """
+        state = self.get_sync_state(form_id)
+        watermark = "" if full or state is None else state["watermark"]
+        rows = []
+        for response in responses:
+            submitted = normalize_timestamp(response.get('lastSubmittedTime') or response.get('createTime'))
+            watermark = max(watermark, submitted)
+            rows.append((form_id, response.get('responseId', ''), submitted, json.dumps(response)))
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                if full:
+                    connection.execute("DELETE FROM responses WHERE form_id = ?", (form_id,))
+                connection.executemany(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO form_sync VALUES (?, ?, ?, ?, ?)",
+                    (form_id, form_title, json.dumps(questions), watermark, time.time())
+                )
+        return watermark
+
+    def count(self, form_id):
+        """Return the number of stored responses for a form."""
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM responses WHERE form_id = ?",
+                (form_id,)
+            ).fetchone()[0]
+
+    def iter_pages(self, form_id, page_size=1000):
+        """
+        Yield the stored raw responses of a form in submission order, one page at a time.
+
+        Args:
+            form_id: ID of the form
+            page_size: Number of responses per page
+        """
+        last_key = ("", "")
+        while True:
+            with self._lock:
+                rows = self._connect().execute(
+                    """SELECT last_submitted_time, response_id, payload FROM responses
+                       WHERE form_id = ? AND (last_submitted_time, response_id) > (?, ?)
+                       ORDER BY last_submitted_time, response_id
+                       LIMIT ?""",
+                    (form_id, last_key[0], last_key[1], page_size)
+                ).fetchall()
+            if not rows:
+                break
+            yield [json.loads(row[2]) for row in rows]
+            last_key = (rows[-1][0], rows[-1][1])
+
+    def iter_responses(self, form_id):
+        """Yield the stored raw responses of a form in submission order."""
+        for page in self.iter_pages(form_id):
+            for response in page:
+                yield response
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+import config
+from http_pool import PooledHttp
+from token_manager import TokenManager
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class ServiceRegistry:
+    """
+    Process-wide registry of Google API credentials and service objects.
+
+    Nothing is created at import time. Credentials and each service are built
+    on first use, exactly once, from discovery documents read from disk, so
+    startup never depends on the discovery endpoints. Services run on a shared
+    PooledHttp, which makes them safe to call from many threads. Build timings
+    are kept for the health endpoint.
+    """
+
+    def __init__(self, credentials=None, http_factory=None):
+        """
+        Initialize an empty registry.
+
+        Args:
+            credentials: Optional credentials to use instead of the token manager's
+            http_factory: Optional transport factory for the HTTP pool; see PooledHttp
+        """
+        self._credentials = credentials
+        self._http_factory = http_factory
+        self._token_manager = None
+        self._http_pool = None
+        self._services = {}
+        self._documents = {}
+        self._timings = {}
+        self._lock = threading.RLock()
+
+    @property
+    def credentials(self):
+        """Return the shared OAuth2 credentials, creating them on first use."""
+        if self._credentials is None:
+            with self._lock:
+                if self._credentials is None:
+                    started = time.perf_counter()
+                    self._credentials = self.token_manager.get_credentials()
+                    self._record_timing("credentials", started)
+        return self._credentials
+
+    def prime_credentials(self):
+        """
+        Fetch the access token ahead of the first request.
+
+        Called at server startup; a failure is logged, not raised, so the
+        server still starts and the first request retries the refresh.
+        """
+        try:
+            self.credentials
+        except Exception as e:
+            logger.warning("Could not fetch an access token at startup: %s", e)
+
+    def get_service(self, api_name, version):
+        """
+        Return the shared service object for an API, building it on first use.
+
+        Args:
+            api_name: API name, e.g. 'forms'
+            version: API version, e.g. 'v1'
+        """
+        key = f"{api_name}.{version}"
+        service = self._services.get(key)
+        if service is None:
+            with self._lock:
+                service = self._services.get(key)
+                if service is None:
+                    http = self.http_pool
+                    started = time.perf_counter()
+                    document = self.get_discovery_document(api_name, version)
+                    service = build_from_document(document, http=http)
+                    self._services[key] = service
+                    self._record_timing(f"service:{key}", started)
+        return service
+
+    @property
+    def http_pool(self):
+        """Return the shared pooled HTTP transport, creating it on first use."""
+        if self._http_pool is None:
+            with self._lock:
+                if self._http_pool is None:
+                    self._http_pool = PooledHttp(
+                        self.credentials,
+                        max_size=config.HTTP_POOL_SIZE,
+                        acquire_timeout=config.HTTP_POOL_ACQUIRE_TIMEOUT_SECONDS,
+                        idle_seconds=config.HTTP_POOL_IDLE_SECONDS,
+                        timeout=config.HTTP_TIMEOUT_SECONDS,
+                        http_factory=self._http_factory
+                    )
+        return self._http_pool
+
+    def http_pool_stats(self):
+        """Return the HTTP pool counters, or None if no Google call has been made yet."""
+        return self._http_pool.stats() if self._http_pool is not None else None
+
+    def get_discovery_document(self, api_name, version):
+        """
+        Load a discovery document without touching the network.
+
+        A file named '<api>.<version>.json' in config.DISCOVERY_CACHE_DIR takes
+        precedence, otherwise the copy bundled with google-api-python-client is used.
+        """
+        key = f"{api_name}.{version}"
+        document = self._documents.get(key)
+        if document is not None:
+            return document
+
+        path = os.path.join(config.DISCOVERY_CACHE_DIR, f"{key}.json")
+        if os.path.exists(path):
+            with open(path) as document_file:
+                document = document_file.read()
+        else:
+            document = get_static_doc(api_name, version)
+        if document is None:
+            raise RuntimeError(f"No cached discovery document for {key}; place one at {path}")
+
+        self._documents[key] = document
+        return document
+
+    def startup_timings(self):
+        """Return the time in milliseconds spent creating credentials and each service."""
+        return dict(self._timings)
+
+    def _record_timing(self, name, started):
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        self._timings[name] = elapsed_ms
+        logger.info("Initialized %s in %s ms", name, elapsed_ms)
+
+    @property
+    def token_manager(self):
+        """Return the shared token manager, creating it on first use."""
+        if self._token_manager is None:
+            with self._lock:
+                if self._token_manager is None:
+                    self._token_manager = TokenManager(
+                        client_id=config.GOOGLE_CLIENT_ID,
+                        client_secret=config.GOOGLE_CLIENT_SECRET,
+                        refresh_token=config.GOOGLE_REFRESH_TOKEN,
+                        cache_path=config.TOKEN_CACHE_PATH,
+                        refresh_margin_seconds=config.TOKEN_REFRESH_MARGIN_SECONDS,
+                        scopes=config.SCOPES
+                    )
+        return self._token_manager
+
+
+# Shared by every GoogleFormsAPI in the process
+registry = ServiceRegistry()
+
+
+def get_registry():
+    """Get the shared service registry."""
+    return registry
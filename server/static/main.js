@@ -29,6 +29,7 @@ const API = {
     health: '/api/health',
     form_request: '/api/form_request',
     agent_proxy: '/api/agent_proxy',
+    agent_proxy_stream: '/api/agent_proxy/stream',
     form_status: '/api/form_status'
 };
 
@@ -238,8 +239,13 @@ async function handleSendRequest() {
         // Update stage to agent
         updateStage(STAGES.AGENT);
         
-        // Process the request with the agent
-        const agentResponse = await processWithAgent(requestText);
+        // Process the request with the agent, animating each step as it is streamed
+        const progress = createProgressAnimator();
+        const agentResponse = await processWithAgentStream(requestText, entry => {
+            logItem(entry, 'Agent Step');
+            progress.onStep(entry);
+        });
+        await progress.finished();
         
         // Log agent proxy response
         logPacket(agentResponse, 'Agent Processing');
@@ -251,29 +257,6 @@ async function handleSendRequest() {
             throw new Error(agentResponse.message || 'Agent processing failed');
         }
         
-        // Continue flow to MCP server
-        await window.flowAnimator.animateFlow('agent', 'mcp', 'outgoing');
-        updateStage(STAGES.MCP);
-        
-        // Simulate MCP server processing time
-        await new Promise(resolve => setTimeout(resolve, 1000));
-        
-        // Continue flow to Google Forms
-        await window.flowAnimator.animateFlow('mcp', 'google', 'outgoing');
-        updateStage(STAGES.GOOGLE);
-        
-        // Simulate Google Forms API interaction time
-        await new Promise(resolve => setTimeout(resolve, 1500));
-        
-        // Begin response flow
-        // From Google back to MCP
-        await window.flowAnimator.animateFlow('google', 'mcp', 'incoming');
-        updateStage(STAGES.MCP);
-        
-        // From MCP back to agent
-        await window.flowAnimator.animateFlow('mcp', 'agent', 'incoming');
-        updateStage(STAGES.AGENT);
-        
         // Final response from agent to frontend
         await window.flowAnimator.animateFlow('agent', 'frontend', 'incoming');
         updateStage(STAGES.FRONTEND);
@@ -328,6 +311,138 @@ async function handleSendRequest() {
     }
 }
 
+/**
+ * Drives the flow animation from streamed agent steps.
+ * Animations are chained so they play in order even when steps arrive quickly.
+ * @returns {Object} - onStep(entry) to feed steps, finished() resolving when all animations are done
+ */
+function createProgressAnimator() {
+    let chain = Promise.resolve();
+    const enqueue = animation => {
+        chain = chain.then(animation).catch(error => console.error('Flow animation failed:', error));
+    };
+    
+    return {
+        onStep(entry) {
+            const stepType = entry.step_type || '';
+            if (stepType === 'NLP Analysis Start') {
+                enqueue(() => window.flowAnimator.pulseNode('agent', 1000));
+            } else if (stepType.startsWith('MCP Request')) {
+                // The agent has sent packets to the MCP server, which calls Google Forms
+                enqueue(async () => {
+                    await window.flowAnimator.animateFlow('agent', 'mcp', 'outgoing');
+                    updateStage(STAGES.MCP);
+                    await window.flowAnimator.animateFlow('mcp', 'google', 'outgoing');
+                    updateStage(STAGES.GOOGLE);
+                });
+            } else if (stepType.startsWith('MCP Response')) {
+                enqueue(async () => {
+                    await window.flowAnimator.animateFlow('google', 'mcp', 'incoming');
+                    updateStage(STAGES.MCP);
+                    await window.flowAnimator.animateFlow('mcp', 'agent', 'incoming');
+                    updateStage(STAGES.AGENT);
+                });
+            }
+        },
+        finished() {
+            return chain;
+        }
+    };
+}
+
+/**
+ * Sends the natural language request to the agent's streaming endpoint.
+ * Falls back to the non-streaming endpoint if streaming is unavailable.
+ * @param {string} requestText - The raw natural language text.
+ * @param {Function} onStep - Called with each agent log entry as it arrives.
+ * @returns {Promise<Object>} - The final response from the agent server.
+ */
+async function processWithAgentStream(requestText, onStep) {
+    let response;
+    try {
+        response = await fetch(API.agent_proxy_stream, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            },
+            body: JSON.stringify({ request_text: requestText })
+        });
+    } catch (error) {
+        console.error('Error opening agent stream:', error);
+        return processWithAgent(requestText);
+    }
+    
+    if (!response.ok || !response.body) {
+        console.warn(`Agent stream unavailable (${response.status}), falling back to a single request`);
+        return processWithAgent(requestText);
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let result = null;
+    
+    try {
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) {
+                break;
+            }
+            buffer += decoder.decode(value, { stream: true }).replace(/\r\n/g, '\n');
+            
+            // Events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const event = parseSSEEvent(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+                if (!event) {
+                    continue;
+                }
+                if (event.event === 'step') {
+                    onStep(event.data);
+                } else if (event.event === 'result') {
+                    result = event.data;
+                }
+            }
+        }
+    } catch (error) {
+        console.error('Error reading agent stream:', error);
+        return { status: 'error', message: `Agent stream interrupted: ${error.message}` };
+    }
+    
+    return result || { status: 'error', message: 'Agent stream ended without a result' };
+}
+
+/**
+ * Parse one Server-Sent Event block.
+ * @param {string} block - Lines of a single event, without the trailing blank line
+ * @returns {Object|null} - { event, data } or null for comments and malformed events
+ */
+function parseSSEEvent(block) {
+    let eventName = 'message';
+    const dataLines = [];
+    block.split('\n').forEach(line => {
+        if (line.startsWith(':')) {
+            return; // Keep-alive comment
+        }
+        if (line.startsWith('event:')) {
+            eventName = line.slice(6).trim();
+        } else if (line.startsWith('data:')) {
+            dataLines.push(line.slice(5).replace(/^ /, ''));
+        }
+    });
+    if (!dataLines.length) {
+        return null;
+    }
+    try {
+        return { event: eventName, data: JSON.parse(dataLines.join('\n')) };
+    } catch (error) {
+        console.error('Malformed agent stream event:', block);
+        return null;
+    }
+}
+
 /**
  * Sends the natural language request to the agent server.
  * @param {string} requestText - The raw natural language text.
@@ -0,0 +1,239 @@
+import numpy as np
+
+
+def _to_number(value):
+    """Parse a scale answer, or return NaN if it is not a number."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class ResponseSummarizer:
+    """
+    Per-question aggregation of form responses.
+
+    Responses are consumed one page at a time. Each page is flattened once
+    into columnar (question index, value) arrays, encoded with np.unique and
+    reduced with bincount, then merged into fixed-size running totals. Only
+    the most recent max_days days are counted by day. Memory use and the
+    summary size do not depend on the number of responses.
+    """
+
+    def __init__(self, form, max_days=366):
+        """
+        Initialize the summarizer from a Forms API form resource.
+
+        Args:
+            form: Form dict as returned by forms().get
+            max_days: Most recent days reported in responses_by_day; responses
+                of earlier days are only counted in earlier_response_count
+        """
+        self.form_id = form.get('formId', '')
+        self.form_title = form.get('info', {}).get('title', '')
+        self.response_count = 0
+        self.max_days = max_days
+        self.responses_by_day = {}
+        self.earlier_response_count = 0
+        self._day_cutoff = None
+        self.questions = []
+
+        for item in form.get('items', []):
+            question = item.get('questionItem', {}).get('question')
+            if not question:
+                continue
+            spec = {
+                "question_id": question.get('questionId', item.get('itemId', '')),
+                "title": item.get('title', ''),
+                "answered": 0
+            }
+            if 'choiceQuestion' in question:
+                options = [option.get('value', '') for option in question['choiceQuestion'].get('options', [])]
+                spec.update({
+                    "kind": "choice",
+                    "options": options,
+                    "option_index": {value: index for index, value in enumerate(options)},
+                    # Last bucket counts answers that match no listed option ("Other")
+                    "counts": np.zeros(len(options) + 1, dtype=np.int64)
+                })
+            elif 'scaleQuestion' in question:
+                low = question['scaleQuestion'].get('low', 0)
+                high = question['scaleQuestion'].get('high', low)
+                spec.update({
+                    "kind": "scale",
+                    "low": low,
+                    "counts": np.zeros(high - low + 1, dtype=np.int64),
+                    "sum": 0.0,
+                    "sum_squares": 0.0
+                })
+            elif 'textQuestion' in question:
+                spec["kind"] = "text"
+            else:
+                spec["kind"] = "other"
+            self.questions.append(spec)
+
+        self._question_index = {spec["question_id"]: index for index, spec in enumerate(self.questions)}
+        # Values are only needed for questions that are counted by value
+        self._value_kinds = {index for index, spec in enumerate(self.questions) if spec["kind"] in ("choice", "scale")}
+
+    def add_page(self, responses):
+        """
+        Merge one page of raw Forms API responses into the running totals.
+
+        Args:
+            responses: List of raw response dicts
+        """
+        if not responses:
+            return
+        self.response_count += len(responses)
+
+        days = np.array(
+            [(response.get('createTime') or response.get('lastSubmittedTime') or '')[:10] or 'NaT'
+             for response in responses],
+            dtype='datetime64[D]'
+        )
+        days = days[~np.isnat(days)]
+        unique_days, day_counts = np.unique(days, return_counts=True)
+        self._add_day_counts(unique_days.astype(str).tolist(), day_counts.tolist())
+
+        answered, value_questions, values = self._columns(responses)
+        self._answered_counts(answered)
+        if not values:
+            return
+        value_questions = np.array(value_questions, dtype=np.int64)
+        # Encode the page's distinct values once; each question then maps codes, not strings
+        vocabulary, value_codes = np.unique(np.array(values, dtype=str), return_inverse=True)
+        for index in np.unique(value_questions).tolist():
+            spec = self.questions[index]
+            codes = value_codes[value_questions == index]
+            if spec["kind"] == "choice":
+                self._add_choice_codes(spec, vocabulary, codes)
+            else:
+                self._add_scale_codes(spec, vocabulary, codes)
+
+    def _columns(self, responses):
+        """
+        Flatten a page of responses in one pass.
+
+        Returns:
+            tuple: Question index of every answered (response, question) pair, and
+                the question index and value of every answer entry of choice and
+                scale questions
+        """
+        question_index = self._question_index
+        value_kinds = self._value_kinds
+        answered = []
+        value_questions = []
+        values = []
+        for response in responses:
+            for question_id, answer in response.get('answers', {}).items():
+                index = question_index.get(question_id)
+                if index is None or not answer:
+                    continue
+                entries = answer.get('textAnswers', answer.get('choiceAnswers', {})).get('answers', [])
+                if not entries:
+                    continue
+                answered.append(index)
+                if index in value_kinds:
+                    for entry in entries:
+                        value_questions.append(index)
+                        values.append(entry.get('value', '') if isinstance(entry, dict) else entry)
+        return answered, value_questions, values
+
+    def _answered_counts(self, answered):
+        if not answered:
+            return
+        counts = np.bincount(np.array(answered, dtype=np.int64), minlength=len(self.questions))
+        for spec, count in zip(self.questions, counts.tolist()):
+            spec["answered"] += count
+
+    def _add_day_counts(self, days, counts):
+        """Merge per-day counts, folding days older than the max_days most recent into one count."""
+        for day, count in zip(days, counts):
+            if self._day_cutoff is not None and day <= self._day_cutoff:
+                self.earlier_response_count += count
+            else:
+                self.responses_by_day[day] = self.responses_by_day.get(day, 0) + count
+        if len(self.responses_by_day) > self.max_days:
+            for day in sorted(self.responses_by_day)[:len(self.responses_by_day) - self.max_days]:
+                self.earlier_response_count += self.responses_by_day.pop(day)
+                self._day_cutoff = day
+
+    def _add_choice_codes(self, spec, vocabulary, codes):
+        other = len(spec["options"])
+        option_codes = np.fromiter(
+            (spec["option_index"].get(value, other) for value in vocabulary.tolist()),
+            dtype=np.int64,
+            count=len(vocabulary)
+        )
+        spec["counts"] += np.bincount(option_codes[codes], minlength=other + 1)
+
+    def _add_scale_codes(self, spec, vocabulary, codes):
+        # The vocabulary also holds other questions' values; convert only this question's
+        used, codes = np.unique(codes, return_inverse=True)
+        numbers = np.array([_to_number(value) for value in vocabulary[used]], dtype=np.float64)[codes]
+        # Ignore unparsable answers (NaN) and answers outside the scale so the stats match the distribution
+        numbers = numbers[(numbers >= spec["low"]) & (numbers < spec["low"] + len(spec["counts"]))]
+        spec["sum"] += float(numbers.sum())
+        spec["sum_squares"] += float(np.square(numbers).sum())
+        codes = numbers.astype(np.int64) - spec["low"]
+        spec["counts"] += np.bincount(codes, minlength=len(spec["counts"]))
+
+    def result(self):
+        """Return the summary as a JSON-serializable dict."""
+        questions = []
+        for spec in self.questions:
+            summary = {
+                "question_id": spec["question_id"],
+                "title": spec["title"],
+                "kind": spec["kind"],
+                "answered": spec["answered"]
+            }
+            if spec["kind"] == "choice":
+                counts = spec["counts"].tolist()
+                summary["options"] = [
+                    {"value": value, "count": count}
+                    for value, count in zip(spec["options"], counts[:-1])
+                ]
+                summary["other_count"] = counts[-1]
+            elif spec["kind"] == "scale":
+                summary.update(self._scale_stats(spec))
+            questions.append(summary)
+
+        return {
+            "form_id": self.form_id,
+            "form_title": self.form_title,
+            "response_count": self.response_count,
+            "responses_by_day": [
+                {"date": day, "count": self.responses_by_day[day]}
+                for day in sorted(self.responses_by_day)
+            ],
+            "earlier_response_count": self.earlier_response_count,
+            "questions": questions
+        }
+
+    def _scale_stats(self, spec):
+        counts = spec["counts"]
+        total = int(counts.sum())
+        scale_values = np.arange(spec["low"], spec["low"] + len(counts))
+        stats = {
+            "distribution": [
+                {"value": int(value), "count": int(count)}
+                for value, count in zip(scale_values, counts)
+            ]
+        }
+        if total == 0:
+            stats.update({"mean": None, "std": None, "median": None, "min": None, "max": None})
+            return stats
+
+        mean = spec["sum"] / total
+        present = scale_values[counts > 0]
+        cumulative = np.cumsum(counts)
+        stats.update({
+            "mean": mean,
+            "std": float(np.sqrt(max(spec["sum_squares"] / total - mean * mean, 0.0))),
+            "median": int(scale_values[np.searchsorted(cumulative, total / 2)]),
+            "min": int(present[0]),
+            "max": int(present[-1])
+        })
+        return stats
@@ -0,0 +1,217 @@
+import datetime
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+import google.oauth2.credentials
+from google.auth.transport.requests import Request
+
+from utils.logger import get_logger, log_error
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = get_logger()
+
+
+def _utcnow():
+    """Current UTC time as a naive datetime, comparable with Credentials.expiry."""
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class TokenManager:
+    """
+    Owns the OAuth2 access token shared by every Google API call.
+
+    The token is refreshed on a background timer shortly before it expires,
+    so request threads never wait on the token endpoint. Refreshed tokens are
+    written to a file cache guarded by an exclusive lock; other workers and
+    restarted processes adopt a still-valid cached token instead of refreshing.
+    """
+
+    RETRY_SECONDS = 30
+
+    def __init__(self, client_id, client_secret, refresh_token, cache_path,
+                 refresh_margin_seconds=300, token_uri='https://oauth2.googleapis.com/token', scopes=None):
+        """
+        Initialize the manager. No network call is made until credentials are requested.
+
+        Args:
+            client_id: OAuth2 client ID
+            client_secret: OAuth2 client secret
+            refresh_token: Long-lived refresh token
+            cache_path: Path of the shared token cache file
+            refresh_margin_seconds: How long before expiry to refresh
+            token_uri: OAuth2 token endpoint
+            scopes: Scopes the refresh token must grant; a refresh that grants
+                fewer fails instead of yielding a token the API calls reject
+        """
+        self.cache_path = cache_path
+        self.refresh_margin = datetime.timedelta(seconds=refresh_margin_seconds)
+        # One credentials object for the whole process
+        self.credentials = google.oauth2.credentials.Credentials(
+            token=None,
+            refresh_token=refresh_token,
+            client_id=client_id,
+            client_secret=client_secret,
+            token_uri=token_uri,
+            scopes=scopes
+        )
+        self._cache_key = hashlib.sha256((refresh_token or "").encode()).hexdigest()
+        self._lock = threading.Lock()
+        self._timer = None
+        self._stats = {
+            "refresh_count": 0,
+            "refresh_failures": 0,
+            "cache_adoptions": 0,
+            "total_refresh_ms": 0.0,
+            "last_refresh_ms": None
+        }
+
+    def get_credentials(self):
+        """Return credentials holding a valid token and start the refresh timer."""
+        if self.credentials.token is None or self._expires_soon():
+            self.refresh()
+        return self.credentials
+
+    def refresh(self, force=False):
+        """
+        Make sure the credentials hold a token that is not about to expire.
+
+        Under the file lock the cache is re-read first, so only one worker
+        actually calls the token endpoint per expiry.
+
+        Args:
+            force: Refresh even if the current or cached token is still valid
+        """
+        with self._lock:
+            with self._file_lock():
+                if not force and self._adopt_cached_token():
+                    self._schedule()
+                    return
+                started = time.perf_counter()
+                try:
+                    self.credentials.refresh(Request())
+                except Exception:
+                    self._stats["refresh_failures"] += 1
+                    raise
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self._stats["refresh_count"] += 1
+                self._stats["total_refresh_ms"] += elapsed_ms
+                self._stats["last_refresh_ms"] = round(elapsed_ms, 2)
+                self._write_cache()
+            logger.info("Access token refreshed in %.1f ms, valid until %s", elapsed_ms, self.credentials.expiry)
+            self._schedule()
+
+    def stats(self):
+        """Return refresh counters, latency and the current token expiry."""
+        with self._lock:
+            stats = dict(self._stats)
+        total_ms = stats.pop("total_refresh_ms")
+        stats["avg_refresh_ms"] = round(total_ms / stats["refresh_count"], 2) if stats["refresh_count"] else None
+        expiry = self.credentials.expiry
+        stats["token_expiry"] = expiry.isoformat() + "Z" if expiry else None
+        return stats
+
+    def _expires_soon(self, expiry=None):
+        expiry = expiry or self.credentials.expiry
+        if expiry is None:
+            return True
+        return expiry - self.refresh_margin <= _utcnow()
+
+    def _adopt_cached_token(self):
+        """Use a token from the current credentials or the file cache if it is still fresh."""
+        if self.credentials.token and not self._expires_soon():
+            return True
+        cached = self._read_cache()
+        if cached is None:
+            return False
+        expiry = datetime.datetime.fromisoformat(cached["expiry"])
+        if self._expires_soon(expiry):
+            return False
+        self.credentials.token = cached["token"]
+        self.credentials.expiry = expiry
+        self._stats["cache_adoptions"] += 1
+        return True
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path) as cache_file:
+                cached = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        if cached.get("key") != self._cache_key or not cached.get("token") or not cached.get("expiry"):
+            return None
+        return cached
+
+    def _write_cache(self):
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as cache_file:
+                json.dump({
+                    "key": self._cache_key,
+                    "token": self.credentials.token,
+                    "expiry": self.credentials.expiry.isoformat()
+                }, cache_file)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            log_error("Could not write token cache", e)
+
+    def _file_lock(self):
+        return _FileLock(f"{self.cache_path}.lock")
+
+    def _schedule(self):
+        """Arm the timer to refresh shortly before expiry, with jitter across workers."""
+        if self._timer is not None:
+            self._timer.cancel()
+        expiry = self.credentials.expiry
+        if expiry is None:
+            return
+        delay = (expiry - self.refresh_margin - _utcnow()).total_seconds()
+        delay = max(delay, 0) + random.uniform(0, min(30, self.refresh_margin.total_seconds() / 4))
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            log_error("Background token refresh failed", e)
+            self._timer = threading.Timer(self.RETRY_SECONDS, self._background_refresh)
+            self._timer.daemon = True
+            self._timer.start()
+
+
+class _FileLock:
+    """Exclusive advisory lock on a file, shared across processes."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a')
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        return False
@@ -1,22 +1,17 @@
 import logging
-import sys
-import json
-from datetime import datetime
 
-# Configure logger
-logger = logging.getLogger("mcp_server")
-logger.setLevel(logging.INFO)
-
-# Console handler
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(logging.INFO)
+import config
+from structured_logging import LazyJSON, configure_logging, parse_sample_rates
 
-# Format
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
+# Route all logging through the queue-based JSON pipeline
+configure_logging(
+    level=config.LOG_LEVEL,
+    json_format=config.LOG_FORMAT == 'json',
+    sample_rates=parse_sample_rates(config.LOG_SAMPLE_RATES)
+)
 
-# Add handler to logger
-logger.addHandler(console_handler)
+# Configure logger
+logger = logging.getLogger("mcp_server")
 
 
 def log_mcp_request(request_data):
@@ -25,11 +20,14 @@ def log_mcp_request(request_data):
         transaction_id = request_data.get('transaction_id', 'unknown')
         tool_name = request_data.get('tool_name', 'unknown')
         
-        logger.info(f"MCP Request [{transaction_id}] - Tool: {tool_name}")
-        logger.debug(f"Request data: {json.dumps(request_data, indent=2)}")
+        logger.info(
+            "MCP Request [%s] - Tool: %s", transaction_id, tool_name,
+            extra={"fields": {"transaction_id": transaction_id, "tool": tool_name}}
+        )
+        logger.debug("Request data: %s", LazyJSON(request_data, indent=2))
         
     except Exception as e:
-        logger.error(f"Error logging MCP request: {str(e)}")
+        logger.error("Error logging MCP request: %s", e)
 
 
 def log_mcp_response(response_data):
@@ -38,18 +36,21 @@ def log_mcp_response(response_data):
         transaction_id = response_data.get('transaction_id', 'unknown')
         status = response_data.get('status', 'unknown')
         
-        logger.info(f"MCP Response [{transaction_id}] - Status: {status}")
-        logger.debug(f"Response data: {json.dumps(response_data, indent=2)}")
+        logger.info(
+            "MCP Response [%s] - Status: %s", transaction_id, status,
+            extra={"fields": {"transaction_id": transaction_id, "status": status}}
+        )
+        logger.debug("Response data: %s", LazyJSON(response_data, indent=2))
         
     except Exception as e:
-        logger.error(f"Error logging MCP response: {str(e)}")
+        logger.error("Error logging MCP response: %s", e)
 
 
 def log_error(message, error=None):
     """Log an error."""
     try:
         if error:
-            logger.error(f"{message}: {str(error)}")
+            logger.error("%s: %s", message, error)
         else:
             logger.error(message)
     except Exception as e:
@@ -57,6 +58,11 @@ def log_error(message, error=None):
         print(f"Logging error: {str(e)}")
 
 
-def get_logger():
-    """Get the configured logger."""
-    return logger
+def get_logger(category=None):
+    """
+    Get the configured logger, or its child for a category.
+    
+    Args:
+        category: Optional child name, e.g. 'forms_api'; LOG_SAMPLE_RATES can sample it separately
+    """
+    return logger.getChild(category) if category else logger
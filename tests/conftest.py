@@ -0,0 +1,65 @@
+"""
+Shared fixtures: an MCPHandler and GoogleFormsAPI wired to the in-memory
+Forms/Drive fake in benchmarks/fake_google.py, so no credentials or network
+are needed. common/ holds the modules the server shares with the agent, whose
+modules in agents/ are importable too.
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "common"))
+sys.path.insert(0, os.path.join(ROOT_DIR, "server"))
+sys.path.insert(0, os.path.join(ROOT_DIR, "benchmarks"))
+sys.path.insert(0, os.path.join(ROOT_DIR, "agents"))
+
+# The server reads its settings at import time; keep its stores out of the tree
+# and publish inline so each test sees every upstream call
+_STATE_DIR = tempfile.mkdtemp(prefix="mcp-tests-")
+os.environ.setdefault("RESPONSE_STORE_PATH", os.path.join(_STATE_DIR, "responses.db"))
+os.environ.setdefault("FORM_REGISTRY_PATH", os.path.join(_STATE_DIR, "form_registry.db"))
+os.environ.setdefault("TOKEN_CACHE_PATH", os.path.join(_STATE_DIR, "token_cache.json"))
+os.environ["ASYNC_PUBLISH"] = "False"
+os.environ["FORM_CLONE_CACHE"] = "True"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ["TRACE_EXPORT_PATH"] = ""
+
+import pytest  # noqa: E402
+from google.oauth2.credentials import Credentials  # noqa: E402
+
+from fake_google import FakeGoogleBackend  # noqa: E402
+from form_registry import FormShapeRegistry  # noqa: E402
+from forms_api import GoogleFormsAPI  # noqa: E402
+from mcp_handler import MCPHandler  # noqa: E402
+from response_store import ResponseStore  # noqa: E402
+from services import ServiceRegistry  # noqa: E402
+
+
+@pytest.fixture
+def backend():
+    return FakeGoogleBackend()
+
+
+@pytest.fixture
+def make_forms_api(tmp_path):
+    """Factory of GoogleFormsAPIs on a fake backend, each with its own response store and shape registry."""
+    def make(backend):
+        registry = ServiceRegistry(credentials=Credentials(token="fake-token"), http_factory=backend.http)
+        api = GoogleFormsAPI(registry=registry)
+        state_dir = tempfile.mkdtemp(dir=tmp_path)
+        api.response_store = ResponseStore(os.path.join(state_dir, "responses.db"))
+        api.form_registry = FormShapeRegistry(os.path.join(state_dir, "form_registry.db"))
+        return api
+    return make
+
+
+@pytest.fixture
+def forms_api(backend, make_forms_api):
+    return make_forms_api(backend)
+
+
+@pytest.fixture
+def handler(forms_api):
+    return MCPHandler(forms_api=forms_api)
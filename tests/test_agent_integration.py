@@ -0,0 +1,40 @@
+"""FormAgent LLM phase: template matches, the LLM output cache and its failures."""
+
+import pytest
+
+import agent_integration
+from agent_integration import FormAgent
+
+STRUCTURE = {"title": "Feedback", "description": "", "questions": [{"title": "Comments", "type": "text"}]}
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    # Every request misses the templates and the cache, and the LLM answers at once
+    monkeypatch.setattr(agent_integration.template_matcher, "match", lambda request_text: (None, None, 0.0))
+    monkeypatch.setattr(agent_integration.llm_cache, "get", lambda key: None)
+    agent = FormAgent()
+    monkeypatch.setattr(agent, "_query_llm", lambda request_text: dict(STRUCTURE))
+    return agent
+
+
+def test_failed_cache_write_still_returns_the_llm_output(agent, monkeypatch):
+    def fail(key, value):
+        raise OSError("database is locked")
+
+    monkeypatch.setattr(agent_integration.llm_cache, "put", fail)
+
+    assert agent._call_llm_agent("a feedback form") == STRUCTURE
+
+
+def test_prompt_version_is_computed_once(agent, monkeypatch):
+    builds = []
+    build_prompt = agent._build_llm_prompt
+    monkeypatch.setattr(FormAgent, "_cached_prompt_version", None)
+    monkeypatch.setattr(agent, "_build_llm_prompt", lambda request_text: builds.append(1) or build_prompt(request_text))
+    monkeypatch.setattr(agent_integration.llm_cache, "put", lambda key, value: None)
+
+    agent._call_llm_agent("a feedback form")
+    agent._call_llm_agent("another feedback form")
+
+    assert len(builds) == 1
@@ -0,0 +1,68 @@
+"""Agent server job API: submission and long-polling."""
+
+import threading
+
+import pytest
+
+import agent_server
+from job_queue import JobQueue
+
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    # Let a job the test left running finish
+    event.set()
+
+
+@pytest.fixture
+def client(monkeypatch, release):
+    def handler(request_text, on_step):
+        on_step({"step": "Started"})
+        release.wait(5)
+        return {"status": "success", "request_text": request_text}
+
+    monkeypatch.setattr(agent_server, "job_queue", JobQueue(handler, workers=1, max_queued=2))
+    return agent_server.app.test_client()
+
+
+def submit(client):
+    response = client.post("/jobs", json={"request_text": "a feedback form"})
+    assert response.status_code == 202
+    return response.get_json()["status_url"]
+
+
+@pytest.mark.parametrize("query", [
+    "wait=nan", "wait=inf", "wait=-1", "wait=soon", "since=-1", "since=1.5", "since=all"
+])
+def test_job_poll_rejects_invalid_wait_and_since(client, query):
+    status_url = submit(client)
+
+    response = client.get(f"{status_url}?{query}")
+
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Parameters 'wait' and 'since' must be non-negative numbers"
+
+
+def test_job_poll_with_since_returns_on_a_new_log_entry(client):
+    status_url = submit(client)
+
+    job = client.get(f"{status_url}?wait=5&since=0").get_json()["job"]
+
+    assert job["state"] == JobQueue.RUNNING
+    assert job["log_entries"] == [{"step": "Started"}]
+
+
+def test_job_poll_with_wait_returns_the_result(client, release):
+    status_url = submit(client)
+    release.set()
+
+    job = client.get(f"{status_url}?wait=5").get_json()["job"]
+
+    assert job["state"] == JobQueue.COMPLETED
+    assert job["result"] == {"status": "success", "request_text": "a feedback form"}
+
+
+def test_unknown_job_is_not_found(client):
+    assert client.get("/jobs/no-such-job?wait=0").status_code == 404
@@ -0,0 +1,49 @@
+"""Flask server endpoints against the fake backend."""
+
+import json
+
+import pytest
+
+import app
+import config
+
+
+@pytest.fixture
+def client(forms_api, monkeypatch):
+    monkeypatch.setattr(app.mcp_handler, "forms_api", forms_api)
+    return app.app.test_client()
+
+
+def test_responses_stream_as_one_json_line_each_across_pages(client, backend, monkeypatch):
+    monkeypatch.setattr(config, "RESPONSES_PAGE_SIZE", 2)
+    form_id = backend.seed_form("Survey", [{"question_type": "text", "title": "Name"}], response_count=5)
+
+    response = client.get(f"/api/forms/{form_id}/responses.ndjson")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line["response_id"] for line in lines] == [f"resp{index:08d}" for index in range(5)]
+    assert all(set(line["answers"]) == {"Name"} for line in lines)
+    assert backend.calls["forms.responses.list"] == 3
+
+
+def test_responses_stream_of_a_missing_form_is_a_json_error(client):
+    response = client.get("/api/forms/no-such-form/responses.ndjson")
+
+    assert response.status_code == 500
+    assert response.get_json()["status"] == "error"
+
+
+def test_responses_stream_reports_a_failed_page_as_its_last_line(client, backend, monkeypatch):
+    monkeypatch.setattr(config, "RESPONSES_PAGE_SIZE", 2)
+    form_id = backend.seed_form("Survey", [{"question_type": "text", "title": "Name"}], response_count=5)
+    # Headers go out once the form is read, so the failing page can only be reported in the body
+    backend.fail_next("forms.responses.list", 503)
+
+    response = client.get(f"/api/forms/{form_id}/responses.ndjson")
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines == [{"status": "error", "message": lines[0]["message"]}]
+    assert "503" in lines[0]["message"]
@@ -0,0 +1,64 @@
+"""ASGI server parity: AsyncGoogleFormsAPI and asgi_app against their Flask counterparts."""
+
+import asyncio
+import datetime
+
+import httpx
+import pytest
+from googleapiclient.errors import HttpError
+from starlette.testclient import TestClient
+
+import app
+import asgi_app
+from async_forms_api import AsyncGoogleFormsAPI
+
+
+@pytest.fixture
+def async_forms_api(forms_api, backend):
+    # The async client authorizes through the token manager; hand it a token that is still valid
+    credentials = forms_api.registry.token_manager.credentials
+    credentials.token = "fake-token"
+    credentials.expiry = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(hours=1)
+
+    def handle(request):
+        status, content_type, content = backend.handle(
+            str(request.url), request.method, request.content, dict(request.headers)
+        )
+        return httpx.Response(status, headers={"content-type": content_type}, content=content)
+
+    api = AsyncGoogleFormsAPI(forms_api)
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    return api
+
+
+def run(api, method, *args, **kwargs):
+    async def call():
+        try:
+            return await api.call(method, *args, **kwargs)
+        finally:
+            await api.aclose()
+    return asyncio.run(call())
+
+
+def test_errors_read_the_same_as_the_flask_path(forms_api, async_forms_api):
+    with pytest.raises(HttpError) as sync_error:
+        forms_api.add_question("no-such-form", "text", "Q")
+    with pytest.raises(HttpError) as async_error:
+        run(async_forms_api, "add_question", "no-such-form", "text", "Q")
+
+    assert str(async_error.value) == str(sync_error.value)
+
+
+def test_inline_publication_counts_as_one_upstream_call(forms_api, async_forms_api):
+    sync_result = forms_api.create_form("Form")
+    async_result = run(async_forms_api, "create_form", "Form")
+
+    assert async_result["publication"] == sync_result["publication"] == "published"
+    assert async_result["upstream_calls"] == sync_result["upstream_calls"]
+
+
+def test_health_payloads_have_the_same_fields():
+    flask_health = app.app.test_client().get("/api/health").get_json()
+    asgi_health = TestClient(asgi_app.app).get("/api/health").json()
+
+    assert sorted(asgi_health) == sorted(flask_health)
@@ -0,0 +1,54 @@
+"""TemplateMatcher: which requests are answered from the template library."""
+
+import pytest
+
+from form_templates import TemplateMatcher
+
+
+@pytest.fixture
+def matcher():
+    return TemplateMatcher()
+
+
+@pytest.mark.parametrize("request_text, template_id", [
+    ("Set up an RSVP form for my party", "rsvp"),
+    ("Please create a contact form", "contact")
+])
+def test_plain_requests_for_a_library_form_match(matcher, request_text, template_id):
+    matched_id, form, score = matcher.match(request_text)
+
+    assert matched_id == template_id
+    assert form == matcher.templates[template_id]["form"]
+    assert score >= matcher.threshold
+
+
+@pytest.mark.parametrize("request_text, closest", [
+    ("rsvp form for my wedding with dietary restrictions, plus-one name, song requests and shuttle times", "rsvp"),
+    ("cusotmer feedback survey", "customer_feedback")
+])
+def test_requests_with_their_own_details_go_to_the_llm(matcher, request_text, closest):
+    matched_id, form, score = matcher.match(request_text)
+
+    # The closest template is still reported, for the agent's log
+    assert matched_id == closest
+    assert form is None
+    assert score < matcher.threshold
+
+
+def test_request_without_known_words_matches_nothing(matcher):
+    assert matcher.match("") == (None, None, 0.0)
+
+
+def test_matched_form_is_a_copy(matcher):
+    _, form, _ = matcher.match("Please create a contact form")
+    form["formTitle"] = "Changed"
+
+    assert matcher.match("Please create a contact form")[1]["formTitle"] != "Changed"
+
+
+def test_threshold_above_one_disables_matching():
+    matcher = TemplateMatcher(threshold=1.01)
+
+    assert matcher.match("Please create a contact form")[1] is None
+    assert matcher.stats()["hits"] == 0
+    assert matcher.stats()["lookups"] == 1
@@ -0,0 +1,209 @@
+"""GoogleFormsAPI against the fake backend: form shape copies and revision conflicts."""
+
+import threading
+
+import pytest
+from googleapiclient.errors import HttpError
+
+import config
+from fake_google import FakeGoogleBackend
+from form_registry import form_shape_key
+
+QUESTIONS = [
+    {"question_type": "text", "title": "Your name", "required": True},
+    {"question_type": "multiple_choice", "title": "Pick one", "options": ["A", "B", "C"]}
+]
+
+
+def registered_source(forms_api):
+    return forms_api.form_registry.lookup(form_shape_key("Survey", QUESTIONS))
+
+
+def test_first_form_of_a_shape_is_built_and_registered(forms_api, backend):
+    result = forms_api.create_form_with_questions("Survey", "First", QUESTIONS)
+
+    assert result["cloned_from"] is None
+    assert result["question_count"] == 2
+    assert backend.item_titles(result["form_id"]) == ["Your name", "Pick one"]
+    assert registered_source(forms_api) == result["form_id"]
+    assert "files.copy" not in backend.calls
+
+
+def test_repeated_shape_is_copied_from_the_registered_form(forms_api, backend):
+    source = forms_api.create_form_with_questions("Survey", "First", QUESTIONS)
+    backend.calls.clear()
+
+    result = forms_api.create_form_with_questions("Survey", "Second", QUESTIONS)
+
+    assert result["cloned_from"] == source["form_id"]
+    assert result["form_id"] != source["form_id"]
+    assert [question["title"] for question in result["questions"]] == ["Your name", "Pick one"]
+    assert backend.item_titles(result["form_id"]) == ["Your name", "Pick one"]
+    assert backend.get_form(result["form_id"])["info"]["description"] == "Second"
+    assert backend.calls["files.copy"] == 1
+    assert "forms.create" not in backend.calls
+
+
+def test_edited_source_is_forgotten_and_its_copy_deleted(forms_api, backend):
+    source = forms_api.create_form_with_questions("Survey", "First", QUESTIONS)
+    backend.remove_item(source["form_id"])
+    forms_before = backend.form_ids()
+
+    result = forms_api.create_form_with_questions("Survey", "Second", QUESTIONS)
+
+    assert result["cloned_from"] is None
+    assert backend.calls["files.delete"] == 1
+    # Only the rebuilt form is new; the mismatching copy is gone
+    assert backend.form_ids() - forms_before == {result["form_id"]}
+    assert backend.item_titles(result["form_id"]) == ["Your name", "Pick one"]
+    assert registered_source(forms_api) == result["form_id"]
+
+
+def test_deleted_source_is_forgotten_and_the_form_rebuilt(forms_api, backend):
+    source = forms_api.create_form_with_questions("Survey", "First", QUESTIONS)
+    backend.delete_form(source["form_id"])
+
+    result = forms_api.create_form_with_questions("Survey", "Second", QUESTIONS)
+
+    assert result["cloned_from"] is None
+    assert backend.item_titles(result["form_id"]) == ["Your name", "Pick one"]
+    assert registered_source(forms_api) == result["form_id"]
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_source_is_kept_when_copying_fails_transiently(forms_api, backend, status):
+    source = forms_api.create_form_with_questions("Survey", "First", QUESTIONS)
+    backend.fail_next("files.copy", status)
+
+    result = forms_api.create_form_with_questions("Survey", "Second", QUESTIONS)
+
+    assert result["cloned_from"] is None
+    assert backend.item_titles(result["form_id"]) == ["Your name", "Pick one"]
+    assert registered_source(forms_api) == source["form_id"]
+
+
+def test_unreadable_source_is_forgotten(forms_api, backend):
+    forms_api.create_form_with_questions("Survey", "First", QUESTIONS)
+    backend.fail_next("files.copy", 403, reason="insufficientFilePermissions")
+
+    result = forms_api.create_form_with_questions("Survey", "Second", QUESTIONS)
+
+    assert result["cloned_from"] is None
+    assert registered_source(forms_api) == result["form_id"]
+
+
+@pytest.mark.parametrize("reason", ["rateLimitExceeded", "userRateLimitExceeded"])
+def test_source_is_kept_when_copying_is_rate_limited(forms_api, backend, reason):
+    source = forms_api.create_form_with_questions("Survey", "First", QUESTIONS)
+    backend.fail_next("files.copy", 403, reason=reason)
+
+    result = forms_api.create_form_with_questions("Survey", "Second", QUESTIONS)
+
+    assert result["cloned_from"] is None
+    assert backend.item_titles(result["form_id"]) == ["Your name", "Pick one"]
+    assert registered_source(forms_api) == source["form_id"]
+
+
+def test_copy_is_deleted_when_renaming_it_fails(forms_api, backend):
+    source = forms_api.create_form_with_questions("Survey", "First", QUESTIONS)
+    forms_before = backend.form_ids()
+    # The first batchUpdate after the copy is its rename
+    backend.fail_next("forms.batchUpdate", 503)
+
+    result = forms_api.create_form_with_questions("Survey", "Second", QUESTIONS)
+
+    assert backend.calls["files.delete"] == 1
+    assert backend.form_ids() - forms_before == {result["form_id"]}
+    assert registered_source(forms_api) == source["form_id"]
+
+
+def test_copy_is_deleted_when_finishing_it_raises(forms_api, backend, monkeypatch):
+    source = forms_api.create_form_with_questions("Survey", "First", QUESTIONS)
+    forms_before = backend.form_ids()
+
+    def fail(form_id):
+        raise RuntimeError("queue closed")
+
+    monkeypatch.setattr(forms_api, "_publish_new_form", fail)
+
+    with pytest.raises(RuntimeError):
+        forms_api.create_form_with_questions("Survey", "Second", QUESTIONS)
+    assert backend.calls["files.delete"] == 1
+    assert backend.form_ids() == forms_before
+    assert registered_source(forms_api) == source["form_id"]
+
+
+def test_form_is_reported_but_not_registered_when_its_questions_fail(forms_api, backend, monkeypatch):
+    def fail(form_id, questions):
+        raise RuntimeError("quota exceeded")
+
+    monkeypatch.setattr(forms_api, "add_questions", fail)
+
+    result = forms_api.create_form_with_questions("Survey", "First", QUESTIONS)
+
+    assert result["form_id"] in backend.form_ids()
+    assert result["question_count"] == 0
+    assert result["question_error"] == "quota exceeded"
+    assert [question["error"] for question in result["questions"]] == ["quota exceeded"] * 2
+    assert registered_source(forms_api) is None
+
+
+def test_insert_retries_against_a_fresh_form_on_revision_conflict(forms_api, backend):
+    form_id = backend.seed_form("Survey", QUESTIONS[:1])
+    forms_api.get_question_titles(form_id)
+    # Someone else edits the form after we cached its structure
+    backend.add_item(form_id, {"question_type": "text", "title": "Added elsewhere"})
+    backend.calls.clear()
+
+    result = forms_api.add_questions(form_id, QUESTIONS[1:])
+
+    assert backend.calls["forms.batchUpdate"] == 2
+    assert backend.calls["forms.get"] == 1
+    assert backend.item_titles(form_id) == ["Your name", "Added elsewhere", "Pick one"]
+    assert result["question_count"] == 1
+    assert forms_api.get_question_titles(form_id)[1][result["questions"][0]["item_id"]] == "Pick one"
+
+
+def test_insert_gives_up_after_repeated_revision_conflicts(forms_api, backend, monkeypatch):
+    monkeypatch.setattr(config, "FORM_WRITE_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(config, "FORM_WRITE_RETRY_BASE_SECONDS", 0)
+    form_id = backend.seed_form("Survey", QUESTIONS[:1])
+    fetch = forms_api._fetch_form_metadata
+
+    def stale_fetch(form_id):
+        # Every read is followed by another edit, so the next write conflicts again
+        metadata = fetch(form_id)
+        backend.bump_revision(form_id)
+        return metadata
+
+    monkeypatch.setattr(forms_api, "_fetch_form_metadata", stale_fetch)
+
+    with pytest.raises(HttpError):
+        forms_api.add_questions(form_id, QUESTIONS[1:])
+    assert backend.calls["forms.batchUpdate"] == 3
+    assert backend.item_titles(form_id) == ["Your name"]
+
+
+def test_concurrent_inserts_into_one_form_all_succeed(make_forms_api, monkeypatch):
+    monkeypatch.setattr(config, "FORM_WRITE_RETRY_BASE_SECONDS", 0.001)
+    slow_backend = FakeGoogleBackend(latency_ms=2)
+    form_id = slow_backend.seed_form("Survey", [])
+    # Two API instances stand in for two server workers; only their retries keep them apart
+    apis = [make_forms_api(slow_backend) for _ in range(2)]
+    titles = [f"Question {index}" for index in range(8)]
+    errors = []
+
+    def insert(index):
+        try:
+            apis[index % 2].add_question(form_id, "text", titles[index])
+        except Exception as e:  # noqa: BLE001 - collected for the assertion below
+            errors.append(e)
+
+    threads = [threading.Thread(target=insert, args=(index,)) for index in range(len(titles))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(slow_backend.item_titles(form_id)) == sorted(titles)
@@ -0,0 +1,15 @@
+"""PooledSession: connection reuse counters."""
+
+from http_session import PooledSession
+
+
+def test_stats_report_the_configured_pool_size():
+    session = PooledSession(pool_size=3)
+
+    assert session.stats() == {
+        "requests": 0,
+        "errors": 0,
+        "connections_opened": 0,
+        "connections_reused": 0,
+        "pool_size": 3
+    }
@@ -0,0 +1,172 @@
+"""MCPHandler batches: result references, ordering and failed dependencies."""
+
+from fake_google import FakeGoogleBackend
+from mcp_handler import QUESTION_TYPES, MCPHandler
+
+
+def packet(transaction_id, tool_name, **parameters):
+    return {"transaction_id": transaction_id, "tool_name": tool_name, "parameters": parameters}
+
+
+def form_id_of(target):
+    return {"$result": target, "path": "form_id"}
+
+
+def test_plan_batch_resolves_index_and_transaction_id_references(handler):
+    plan = handler.plan_batch([
+        packet("create", "create_form", title="Form"),
+        packet("by-index", "add_question", form_id=form_id_of(0), question_type="text", title="Q1"),
+        packet("by-id", "add_question", form_id=form_id_of("create"), question_type="text", title="Q2"),
+        packet("both", "add_questions", form_id=form_id_of("by-id"),
+               questions=[{"question_type": "text", "title": {"$result": 1, "path": "title"}}])
+    ])
+
+    assert plan == [set(), {0}, {0}, {1, 2}]
+
+
+def test_plan_batch_rejects_forward_and_self_references(handler):
+    plan = handler.plan_batch([
+        packet("first", "add_question", form_id=form_id_of(1), question_type="text", title="Q"),
+        packet("second", "add_question", form_id=form_id_of(1), question_type="text", title="Q"),
+        packet("third", "add_question", form_id=form_id_of("third"), question_type="text", title="Q"),
+        packet("fourth", "add_question", form_id=form_id_of("fifth"), question_type="text", title="Q"),
+        packet("fifth", "create_form", title="Form")
+    ])
+
+    for index, response in enumerate(plan[:4]):
+        assert response["status"] == "error"
+        assert f"in packet {index}" in response["error"]["message"]
+    assert plan[4] == set()
+
+
+def test_plan_batch_rejects_non_object_packets(handler):
+    plan = handler.plan_batch(["not a packet", packet("create", "create_form", title="Form")])
+
+    assert plan[0]["status"] == "error"
+    assert plan[0]["error"]["message"] == "Packet 0 must be an object"
+    assert plan[1] == set()
+
+
+def test_bind_batch_packet_follows_nested_paths(handler):
+    responses = {0: {"transaction_id": "add", "status": "success",
+                     "result": {"questions": [{"item_id": "item-a"}, {"item_id": "item-b"}]}}}
+
+    bound, error = handler.bind_batch_packet(
+        packet("next", "get_responses", form_id={"$result": "add", "path": "questions.1.item_id"}),
+        responses
+    )
+
+    assert error is None
+    assert bound["parameters"] == {"form_id": "item-b"}
+
+
+def test_bind_batch_packet_reports_missing_field(handler):
+    responses = {0: {"transaction_id": "create", "status": "success", "result": {"form_id": "abc"}}}
+
+    bound, error = handler.bind_batch_packet(
+        packet("next", "get_responses", form_id={"$result": 0, "path": "questions.0.item_id"}),
+        responses
+    )
+
+    assert bound is None
+    assert error["transaction_id"] == "next"
+    assert error["error"]["message"] == "Result of packet 0 has no field 'questions.0.item_id'"
+
+
+def test_process_batch_binds_results_into_later_packets(handler, backend):
+    responses = handler.process_batch([
+        packet("create", "create_form", title="Form"),
+        packet("by-index", "add_question", form_id=form_id_of(0), question_type="text", title="Q1"),
+        packet("by-id", "add_question", form_id=form_id_of("create"), question_type="text", title="Q2")
+    ])
+
+    assert [response["status"] for response in responses] == ["success"] * 3
+    form_id = responses[0]["result"]["form_id"]
+    assert responses[1]["result"]["form_id"] == form_id
+    assert responses[2]["result"]["form_id"] == form_id
+    assert sorted(backend.item_titles(form_id)) == ["Q1", "Q2"]
+
+
+def test_process_batch_returns_responses_in_request_order(handler, backend):
+    responses = handler.process_batch([
+        packet("a", "create_form", title="Form A"),
+        packet("b", "create_form", title="Form B"),
+        packet("to-b", "add_question", form_id=form_id_of("b"), question_type="text", title="For B"),
+        packet("to-a", "add_question", form_id=form_id_of(0), question_type="text", title="For A")
+    ])
+
+    assert [response["transaction_id"] for response in responses] == ["a", "b", "to-b", "to-a"]
+    assert backend.item_titles(responses[0]["result"]["form_id"]) == ["For A"]
+    assert backend.item_titles(responses[1]["result"]["form_id"]) == ["For B"]
+
+
+def test_process_batch_skips_packets_whose_dependency_failed(handler, backend):
+    responses = handler.process_batch([
+        packet("missing", "add_question", form_id="no-such-form", question_type="text", title="Q"),
+        packet("child", "add_question", form_id=form_id_of(0), question_type="text", title="Q"),
+        packet("grandchild", "add_question", form_id=form_id_of("child"), question_type="text", title="Q"),
+        packet("independent", "create_form", title="Form")
+    ])
+
+    assert responses[0]["status"] == "error"
+    assert responses[1]["error"]["message"] == "Not run: packet 0 it depends on failed"
+    assert responses[2]["error"]["message"] == "Not run: packet 1 it depends on failed"
+    assert responses[3]["status"] == "success"
+    # The skipped packets never reached the API: one read of the missing form, and
+    # the create's own setup batchUpdate
+    assert backend.calls["forms.get"] == 1
+    assert backend.calls["forms.batchUpdate"] == backend.calls["forms.create"] == 1
+
+
+def test_process_batch_reports_invalid_reference_without_running_it(handler, backend):
+    responses = handler.process_batch([
+        packet("create", "create_form", title="Form"),
+        packet("bad", "add_question", form_id={"$result": 5, "path": "form_id"}, question_type="text", title="Q")
+    ])
+
+    assert responses[0]["status"] == "success"
+    assert responses[1]["status"] == "error"
+    assert "Invalid reference 5 in packet 1" in responses[1]["error"]["message"]
+    assert backend.item_titles(responses[0]["result"]["form_id"]) == []
+
+
+def test_plan_form_writes_chains_inserts_into_the_same_form(handler):
+    packets = [
+        packet("create", "create_form", title="Form"),
+        packet("q1", "add_question", form_id=form_id_of(0), question_type="text", title="Q1"),
+        packet("other", "add_question", form_id="other-form", question_type="text", title="Q"),
+        packet("q2", "add_questions", form_id=form_id_of("create"), questions=[]),
+        packet("read", "get_responses", form_id=form_id_of(0)),
+        packet("q3", "add_question", form_id=form_id_of(0), question_type="text", title="Q3"),
+        packet("other-again", "add_question", form_id="other-form", question_type="text", title="Q")
+    ]
+
+    assert handler.plan_form_writes(packets, handler.plan_batch(packets)) == [None, None, None, 1, None, 3, 2]
+
+
+def test_process_batch_runs_inserts_into_one_form_in_packet_order(make_forms_api):
+    slow_backend = FakeGoogleBackend(latency_ms=2)
+    slow_handler = MCPHandler(forms_api=make_forms_api(slow_backend))
+    titles = [f"Q{index}" for index in range(6)]
+
+    responses = slow_handler.process_batch([packet("create", "create_form", title="Form")] + [
+        packet(title, "add_question", form_id=form_id_of(0), question_type="text", title=title)
+        for title in titles
+    ])
+
+    assert [response["status"] for response in responses] == ["success"] * 7
+    assert slow_backend.item_titles(responses[0]["result"]["form_id"]) == titles
+
+
+def test_schema_and_validation_share_the_question_types(handler):
+    schema = handler.get_tools_schema()
+    single = handler.process_request(packet("one", "add_question", form_id="f", question_type="rating", title="Q"))
+    several = handler.process_request(
+        packet("many", "add_questions", form_id="f", questions=[{"question_type": "rating", "title": "Q"}])
+    )
+
+    assert schema["add_question"]["parameters"]["question_type"]["enum"] == list(QUESTION_TYPES)
+    assert schema["add_questions"]["parameters"]["questions"]["items"]["properties"]["question_type"]["enum"] == list(QUESTION_TYPES)
+    for response in (single, several):
+        assert response["status"] == "error"
+        assert response["error"]["message"].endswith(f"Valid types: {', '.join(QUESTION_TYPES)}")
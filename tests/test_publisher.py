@@ -0,0 +1,58 @@
+"""PublicationQueue: background publication with retries."""
+
+from publisher import PublicationQueue
+
+
+def flaky(failures):
+    """A publish function that fails the first `failures` calls for each form."""
+    calls = []
+
+    def publish(form_id):
+        calls.append(form_id)
+        if calls.count(form_id) <= failures:
+            raise RuntimeError(f"Drive unavailable ({calls.count(form_id)})")
+
+    publish.calls = calls
+    return publish
+
+
+def run(queue, *form_ids):
+    for form_id in form_ids:
+        assert queue.submit(form_id)
+    queue._queue.join()
+
+
+def test_failed_publication_is_retried_until_it_succeeds():
+    publish = flaky(failures=2)
+    queue = PublicationQueue(publish, workers=1, max_attempts=4, backoff_base=0)
+
+    run(queue, "form-1")
+
+    status = queue.status("form-1")
+    assert status["state"] == PublicationQueue.PUBLISHED
+    assert status["attempts"] == 3
+    assert publish.calls == ["form-1"] * 3
+
+
+def test_publication_fails_after_the_last_attempt():
+    publish = flaky(failures=10)
+    queue = PublicationQueue(publish, workers=2, max_attempts=3, backoff_base=0)
+
+    run(queue, "form-1", "form-2")
+
+    for form_id in ("form-1", "form-2"):
+        status = queue.status(form_id)
+        assert status["state"] == PublicationQueue.FAILED
+        assert status["attempts"] == 3
+        assert status["error"] == "Drive unavailable (3)"
+
+
+def test_full_queue_rejects_the_job_and_forgets_it():
+    queue = PublicationQueue(flaky(failures=0), workers=1, max_pending=1)
+    # Hold the only slot without starting the workers
+    queue._threads.append(None)
+    assert queue.submit("form-1")
+
+    assert not queue.submit("form-2")
+    assert queue.status("form-1")["state"] == PublicationQueue.PENDING
+    assert queue.status("form-2") is None
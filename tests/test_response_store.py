@@ -0,0 +1,71 @@
+"""Incremental response sync and store-backed reads."""
+
+import pytest
+
+from response_store import normalize_timestamp
+
+QUESTIONS = [{"question_type": "text", "title": "Name"}]
+
+
+@pytest.fixture
+def form_id(backend):
+    return backend.seed_form("Survey", QUESTIONS, response_count=3)
+
+
+def test_later_syncs_fetch_only_the_delta_since_the_watermark(forms_api, backend, form_id):
+    first = forms_api.sync_responses(form_id)
+    backend.add_responses(form_id, 2)
+    backend.calls.clear()
+
+    second = forms_api.sync_responses(form_id)
+
+    assert first["fetched_count"] == 3
+    # The newest stored response is fetched again: the watermark filter is inclusive
+    assert second["fetched_count"] == 3
+    assert second["stored_count"] == 5
+    assert second["watermark"] > first["watermark"]
+    assert "forms.get" not in backend.calls
+
+
+def test_full_sync_downloads_everything_again(forms_api, backend, form_id):
+    forms_api.sync_responses(form_id)
+    backend.add_responses(form_id, 1)
+    forms_api.form_cache.invalidate(form_id)
+    backend.calls.clear()
+
+    result = forms_api.sync_responses(form_id, full=True)
+
+    assert result["fetched_count"] == result["stored_count"] == 4
+    assert backend.calls["forms.get"] == 1
+
+
+def test_store_backed_reads_sync_once_and_then_serve_locally(forms_api, backend, form_id):
+    live = forms_api.get_responses(form_id)
+    first = forms_api.get_responses(form_id, use_store=True)
+    backend.calls.clear()
+
+    second = forms_api.get_responses(form_id, use_store=True)
+
+    assert first["source"] == second["source"] == "store"
+    assert second["responses"] == live["responses"]
+    assert not backend.calls
+
+
+def test_stale_store_is_synced_before_it_is_read(forms_api, backend, form_id):
+    forms_api.get_responses(form_id, use_store=True)
+    backend.add_responses(form_id, 1)
+
+    fresh_enough = forms_api.get_responses(form_id, max_age_seconds=3600)
+    synced = forms_api.get_responses(form_id, max_age_seconds=0)
+
+    assert fresh_enough["response_count"] == 3
+    assert synced["response_count"] == 4
+
+
+def test_normalized_timestamps_sort_in_time_order():
+    timestamps = ["2024-01-01T00:00:00.5Z", "2024-01-01T00:00:00Z", "2024-01-01T00:00:00.123Z"]
+
+    assert sorted(timestamps, key=normalize_timestamp) == [
+        "2024-01-01T00:00:00Z", "2024-01-01T00:00:00.123Z", "2024-01-01T00:00:00.5Z"
+    ]
+    assert normalize_timestamp("2024-01-01T00:00:00.5Z") == "2024-01-01T00:00:00.500000000Z"
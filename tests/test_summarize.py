@@ -0,0 +1,62 @@
+"""ResponseSummarizer: per-question totals of raw Forms API responses."""
+
+from summarize import ResponseSummarizer
+
+FORM = {
+    "formId": "form-1",
+    "info": {"title": "Survey"},
+    "items": [
+        {"itemId": "i1", "title": "Rating",
+         "questionItem": {"question": {"questionId": "rating", "scaleQuestion": {"low": 1, "high": 5}}}},
+        {"itemId": "i2", "title": "Colour",
+         "questionItem": {"question": {"questionId": "colour",
+                                       "choiceQuestion": {"options": [{"value": "Red"}, {"value": "Blue"}]}}}}
+    ]
+}
+
+
+def response(day, rating=None, colour=None):
+    answers = {}
+    if rating is not None:
+        answers["rating"] = {"textAnswers": {"answers": [{"value": rating}]}}
+    if colour is not None:
+        answers["colour"] = {"textAnswers": {"answers": [{"value": colour}]}}
+    return {"createTime": f"{day}T10:00:00Z", "answers": answers}
+
+
+def summarize(*pages):
+    summarizer = ResponseSummarizer(FORM)
+    for page in pages:
+        summarizer.add_page(page)
+    return summarizer.result()
+
+
+def test_scale_and_choice_answers_are_counted():
+    result = summarize([
+        response("2024-01-01", "4", "Red"),
+        response("2024-01-01", "2", "Blue"),
+        response("2024-01-02", "4", "Green")
+    ])
+
+    rating, colour = result["questions"]
+    assert [entry["count"] for entry in rating["distribution"]] == [0, 1, 0, 2, 0]
+    assert rating["mean"] == 10 / 3
+    assert rating["median"] == 4
+    assert [option["count"] for option in colour["options"]] == [1, 1]
+    assert colour["other_count"] == 1
+    assert result["responses_by_day"] == [{"date": "2024-01-01", "count": 2}, {"date": "2024-01-02", "count": 1}]
+
+
+def test_unparsable_scale_answers_are_skipped():
+    result = summarize(
+        [response("2024-01-01", "3", "Red"), response("2024-01-01", "", "Red")],
+        # A scale value that happens to be another question's answer must not break the page
+        [response("2024-01-02", "Red"), response("2024-01-02", "n/a"), response("2024-01-02", "5")]
+    )
+
+    rating = result["questions"][0]
+    assert rating["answered"] == 5
+    assert [entry["count"] for entry in rating["distribution"]] == [0, 0, 1, 0, 1]
+    assert rating["mean"] == 4.0
+    assert rating["min"] == 3
+    assert rating["max"] == 5
@@ -0,0 +1,80 @@
+"""TokenManager: refresh, the shared file cache and expiry checks."""
+
+import datetime
+
+import pytest
+
+import config
+from services import ServiceRegistry
+from token_manager import TokenManager
+
+
+def utcnow():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+@pytest.fixture
+def make_manager(tmp_path, monkeypatch):
+    """Factory of TokenManagers sharing one cache file, whose refresh hands out a one-hour token."""
+    refreshes = []
+
+    def make():
+        manager = TokenManager("client", "secret", "refresh-token", str(tmp_path / "token.json"), scopes=config.SCOPES)
+
+        def refresh(request):
+            refreshes.append(manager)
+            manager.credentials.token = f"token-{len(refreshes)}"
+            manager.credentials.expiry = utcnow() + datetime.timedelta(hours=1)
+
+        monkeypatch.setattr(manager.credentials, "refresh", refresh)
+        # Keep the background timer out of the test
+        monkeypatch.setattr(manager, "_schedule", lambda: None)
+        return manager
+
+    make.refreshes = refreshes
+    return make
+
+
+def test_workers_adopt_the_cached_token_instead_of_refreshing(make_manager):
+    first, second = make_manager(), make_manager()
+
+    assert first.get_credentials().token == "token-1"
+    assert second.get_credentials().token == "token-1"
+    assert len(make_manager.refreshes) == 1
+    assert second.stats()["cache_adoptions"] == 1
+
+
+def test_token_is_refreshed_within_the_margin_of_its_expiry(make_manager):
+    manager = make_manager()
+    manager.get_credentials()
+    manager.credentials.expiry = utcnow() + datetime.timedelta(seconds=60)
+    # The cached copy is just as stale, so it cannot be adopted either
+    manager._write_cache()
+
+    assert manager.get_credentials().token == "token-2"
+    assert len(make_manager.refreshes) == 2
+
+
+def test_expiry_compares_with_the_naive_utc_expiry_of_the_credentials(make_manager):
+    manager = make_manager()
+    manager.get_credentials()
+
+    assert manager.credentials.expiry.tzinfo is None
+    assert not manager._expires_soon()
+    assert manager.stats()["token_expiry"].endswith("Z")
+
+
+def test_credentials_request_the_configured_scopes(make_manager):
+    assert make_manager().credentials.scopes == config.SCOPES
+
+
+def test_priming_credentials_logs_instead_of_raising(monkeypatch):
+    registry = ServiceRegistry()
+
+    def fail():
+        raise RuntimeError("token endpoint unreachable")
+
+    monkeypatch.setattr(registry.token_manager, "get_credentials", fail)
+
+    registry.prime_credentials()
+    assert registry.startup_timings() == {}